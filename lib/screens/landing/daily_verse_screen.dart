@@ -1,9 +1,8 @@
 import 'dart:async';
-import 'dart:convert';
 
 import 'package:flutter/material.dart';
-import 'package:flutter/services.dart';
 
+import '../../services/breadcrumb_summary_service.dart';
 import '../../services/verse_service.dart';
 import '../../services/usage_metrics_service.dart';
 import '../../services/daily_verse_picker_service.dart';
@@ -402,27 +401,25 @@ class _DailyVerseScreenState extends State<DailyVerseScreen>
     return '';
   }
 
-  Future<void> _ensureBreadcrumbSummariesLoaded() async {
-    if (_breadcrumbSummariesLoadAttempted) return;
-    _breadcrumbSummariesLoadAttempted = true;
-    try {
-      if (widget.breadcrumbSummariesLoader != null) {
-        _breadcrumbSummaries =
-            await widget.breadcrumbSummariesLoader!(widget.textId);
-        return;
-      }
-      final raw = await rootBundle
-          .loadString('texts/${widget.textId}/breadcrumb_summaries.json');
-      final decoded = jsonDecode(raw);
-      if (decoded is Map) {
-        _breadcrumbSummaries = decoded.map<String, String>(
-            (key, value) => MapEntry(key.toString(), value?.toString() ?? ''));
-      } else {
+  /// Fetches the authored summaries for [path]'s breadcrumb chain from the
+  /// packed summary store (or, under test, the whole map from
+  /// [DailyVerseScreen.breadcrumbSummariesLoader]).
+  Future<void> _ensureBreadcrumbSummariesLoaded(String path) async {
+    final loader = widget.breadcrumbSummariesLoader;
+    if (loader != null) {
+      if (_breadcrumbSummariesLoadAttempted) return;
+      _breadcrumbSummariesLoadAttempted = true;
+      try {
+        _breadcrumbSummaries = await loader(widget.textId);
+      } catch (_) {
         _breadcrumbSummaries = const <String, String>{};
       }
-    } catch (_) {
-      _breadcrumbSummaries = const <String, String>{};
+      return;
     }
+    if (path.isEmpty) return;
+    final chain = await BreadcrumbSummaryService.instance
+        .summariesForChain(widget.textId, path);
+    _breadcrumbSummaries = {...?_breadcrumbSummaries, ...chain};
   }
 
   String _lookupSummaryForPath(String path) {
@@ -456,7 +453,7 @@ class _DailyVerseScreenState extends State<DailyVerseScreen>
   }
 
   Future<void> _refreshAuthoredBreadcrumbSummaryForPath(String path) async {
-    await _ensureBreadcrumbSummariesLoaded();
+    await _ensureBreadcrumbSummariesLoaded(path);
     if (!mounted) return;
     final authored = _lookupSummaryForPath(path);
     if (authored.isEmpty || authored == _sectionBreadcrumbSummary) return;
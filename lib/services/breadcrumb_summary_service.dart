@@ -0,0 +1,84 @@
+import 'dart:convert';
+import 'dart:typed_data';
+
+import '../utils/text_asset_loader.dart';
+
+/// Authored breadcrumb summaries, read from the packed
+/// breadcrumb_summaries.bin + breadcrumb_summaries_index.json written by
+/// tools/pack_breadcrumb_summaries.py.
+///
+/// Only the small index is decoded up front; each summary is decoded from its
+/// byte range in the blob when first asked for.
+class BreadcrumbSummaryService {
+  BreadcrumbSummaryService._();
+  static final BreadcrumbSummaryService _instance =
+      BreadcrumbSummaryService._();
+  static BreadcrumbSummaryService get instance => _instance;
+
+  final Map<String, Future<_PackedSummaries?>> _packs = {};
+
+  static String indexPathFor(String textId) =>
+      'texts/$textId/breadcrumb_summaries_index.json';
+
+  Future<_PackedSummaries?> _load(String textId) {
+    return _packs[textId] ??= _loadImpl(textId);
+  }
+
+  Future<_PackedSummaries?> _loadImpl(String textId) async {
+    try {
+      final index = json.decode(
+              await TextAssetLoader.loadString(indexPathFor(textId)))
+          as Map<String, dynamic>;
+      final blobName = index['blob'] as String;
+      final paths = (index['paths'] as List).cast<String>();
+      final offsets = (index['offsets'] as List).cast<int>();
+      final lengths = (index['lengths'] as List).cast<int>();
+      final slots = <String, int>{
+        for (var i = 0; i < paths.length; i++) paths[i]: i,
+      };
+      final blob = await TextAssetLoader.loadBytes('texts/$textId/$blobName');
+      if (blob.length != index['size']) return null;
+      return _PackedSummaries(slots, offsets, lengths, blob);
+    } catch (_) {
+      return null;
+    }
+  }
+
+  /// Summaries for [path] and each of its ancestors ("4.1.2", "4.1", "4"),
+  /// keyed by path. Paths without an authored summary are left out.
+  Future<Map<String, String>> summariesForChain(
+      String textId, String path) async {
+    final pack = await _load(textId);
+    if (pack == null || path.isEmpty) return const {};
+    final out = <String, String>{};
+    var cursor = path;
+    while (cursor.isNotEmpty) {
+      final summary = pack.summaryFor(cursor);
+      if (summary != null) out[cursor] = summary;
+      final dot = cursor.lastIndexOf('.');
+      if (dot <= 0) break;
+      cursor = cursor.substring(0, dot);
+    }
+    return out;
+  }
+}
+
+class _PackedSummaries {
+  _PackedSummaries(this._slots, this._offsets, this._lengths, this._blob);
+
+  final Map<String, int> _slots;
+  final List<int> _offsets;
+  final List<int> _lengths;
+  final Uint8List _blob;
+  final Map<String, String> _decoded = {};
+
+  String? summaryFor(String path) {
+    final cached = _decoded[path];
+    if (cached != null) return cached;
+    final slot = _slots[path];
+    if (slot == null) return null;
+    final offset = _offsets[slot];
+    return _decoded[path] = utf8.decode(
+        Uint8List.sublistView(_blob, offset, offset + _lengths[slot]));
+  }
+}
@@ -1,8 +1,8 @@
 import 'dart:math';
 import 'package:flutter/foundation.dart';
-import 'package:flutter/services.dart';
 
 import '../config/study_text_config.dart';
+import '../utils/text_asset_loader.dart';
 
 /// One commentary block: the list of verse refs it covers and the commentary text.
 class CommentaryEntry {
@@ -121,7 +121,7 @@ class CommentaryService {
     final path = _assetPathFor(textId);
     if (path == null || path.isEmpty) return;
     try {
-      final content = await rootBundle.loadString(path);
+      final content = await TextAssetLoader.loadString(path);
       final result = await compute(_parseCommentary, content);
       _cache[textId] = _CommentaryCache(
         refToRefsInBlock: result.refToRefsInBlock,
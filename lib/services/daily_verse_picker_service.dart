@@ -1,4 +1,7 @@
+import 'dart:convert';
+
 import '../config/study_destination_catalog.dart';
+import '../utils/text_asset_loader.dart';
 import 'commentary_service.dart';
 
 class DailyVersePickerService {
@@ -6,6 +9,11 @@ class DailyVersePickerService {
 
   static final DailyVersePickerService instance = DailyVersePickerService._();
 
+  /// Precomputed picks written by tools/build_daily_schedule.py.
+  static const dailySchedulePath = 'texts/daily_schedule.json';
+
+  Future<_DailySchedule?>? _scheduleFuture;
+
   String? pickDailyTextId(DateTime localDate, Set<String> selectedIds) {
     final eligible = getDailyEligibleDestinations(selectedIds)
         .map((destination) => destination.textId)
@@ -20,9 +28,29 @@ class DailyVersePickerService {
     return eligible[index];
   }
 
+  /// Today's section for [textId].
+  ///
+  /// Served from the precomputed schedule when it covers [localDate], which
+  /// avoids parsing the commentary; the returned entry then only carries
+  /// [CommentaryEntry.refsInBlock] (commentaryText is empty). Otherwise falls
+  /// back to [pickDailySectionFromCommentary].
   Future<CommentaryEntry?> pickDailySection(
     String textId,
     DateTime localDate,
+  ) async {
+    final schedule = await _loadSchedule();
+    final refs = schedule?.sectionRefs(textId, localDate);
+    if (refs != null && refs.isNotEmpty) {
+      return CommentaryEntry(refsInBlock: refs, commentaryText: '');
+    }
+    return pickDailySectionFromCommentary(textId, localDate);
+  }
+
+  /// Computes the daily section from the parsed commentary. The schedule
+  /// asset is generated from this same algorithm.
+  Future<CommentaryEntry?> pickDailySectionFromCommentary(
+    String textId,
+    DateTime localDate,
   ) async {
     final count = await CommentaryService.instance.getSectionCount(textId);
     if (count <= 0) return null;
@@ -32,6 +60,20 @@ class DailyVersePickerService {
     return CommentaryService.instance.getSectionAtIndex(textId, index);
   }
 
+  Future<_DailySchedule?> _loadSchedule() {
+    return _scheduleFuture ??= _loadScheduleImpl();
+  }
+
+  Future<_DailySchedule?> _loadScheduleImpl() async {
+    try {
+      final content = await TextAssetLoader.loadString(dailySchedulePath);
+      return _DailySchedule.fromJson(
+          json.decode(content) as Map<String, dynamic>);
+    } catch (_) {
+      return null;
+    }
+  }
+
   static String _dateKey(DateTime localDate) {
     final y = localDate.year.toString().padLeft(4, '0');
     final m = localDate.month.toString().padLeft(2, '0');
@@ -49,3 +91,52 @@ class DailyVersePickerService {
     return hash;
   }
 }
+
+/// Parsed texts/daily_schedule.json: one row of picks per local date.
+class _DailySchedule {
+  _DailySchedule({
+    required this.texts,
+    required this.start,
+    required this.picks,
+    required this.entries,
+  });
+
+  factory _DailySchedule.fromJson(Map<String, dynamic> data) {
+    final texts = (data['texts'] as List).cast<String>();
+    final start = DateTime.parse(data['start'] as String);
+    final picks = (data['picks'] as List)
+        .map((row) => (row as List).cast<int>())
+        .toList(growable: false);
+    final sections = data['sections'] as Map<String, dynamic>;
+    final entries = <String, Map<int, List<String>>>{};
+    for (final textId in texts) {
+      final raw = (sections[textId] as Map<String, dynamic>)['entries']
+          as Map<String, dynamic>;
+      entries[textId] = raw.map((index, refs) =>
+          MapEntry(int.parse(index), (refs as List).cast<String>()));
+    }
+    return _DailySchedule(
+      texts: texts,
+      start: DateTime.utc(start.year, start.month, start.day),
+      picks: picks,
+      entries: entries,
+    );
+  }
+
+  final List<String> texts;
+  final DateTime start;
+  final List<List<int>> picks;
+  final Map<String, Map<int, List<String>>> entries;
+
+  /// Refs of the scheduled section for [textId] on [localDate], or null when
+  /// the date or text is not covered.
+  List<String>? sectionRefs(String textId, DateTime localDate) {
+    final textIndex = texts.indexOf(textId);
+    if (textIndex < 0) return null;
+    final day = DateTime.utc(localDate.year, localDate.month, localDate.day)
+        .difference(start)
+        .inDays;
+    if (day < 0 || day >= picks.length) return null;
+    return entries[textId]?[picks[day][textIndex]];
+  }
+}
@@ -1,9 +1,9 @@
 import 'dart:math';
 
 import 'package:flutter/foundation.dart';
-import 'package:flutter/services.dart';
 
 import '../config/study_text_config.dart';
+import '../utils/text_asset_loader.dart';
 
 enum FileQuizDifficulty { beginner, advanced }
 
@@ -51,7 +51,7 @@ class FileQuizService {
     if (path == null || path.isEmpty) return [];
 
     try {
-      final content = await rootBundle.loadString(path);
+      final content = await TextAssetLoader.loadString(path);
       final parsed = _parseQuestions(content);
       _cache[textId] ??= {};
       _cache[textId]![difficulty] = parsed;
@@ -1,7 +1,7 @@
 import 'dart:convert';
-import 'package:flutter/services.dart';
 
 import '../config/study_text_config.dart';
+import '../utils/text_asset_loader.dart';
 
 /// Loads section_clues.json per text and provides clue lookup by verse ref.
 class SectionClueService {
@@ -20,7 +20,7 @@ class SectionClueService {
     final path = _assetPathFor(textId);
     if (path == null || path.isEmpty) return;
     try {
-      final content = await rootBundle.loadString(path);
+      final content = await TextAssetLoader.loadString(path);
       final decoded = json.decode(content) as Map<String, dynamic>;
       _cache[textId] = decoded.map((k, v) => MapEntry(k, v as String));
     } catch (_) {
@@ -1,9 +1,9 @@
 import 'dart:convert';
 
 import 'package:flutter/foundation.dart';
-import 'package:flutter/services.dart';
 
 import '../config/study_text_config.dart';
+import '../utils/text_asset_loader.dart';
 import '../utils/verse_ref_formatter.dart';
 import 'verse_service.dart';
 
@@ -20,16 +20,35 @@ class ReaderOpenParams {
   final String? initialSegmentRef;
 }
 
+typedef _NavigableSection = ({
+  String path,
+  String title,
+  int depth,
+  String firstRef
+});
+
 /// Holds parsed hierarchy data from the background isolate.
 class _ParsedHierarchy {
   _ParsedHierarchy({
     required this.map,
     required this.sectionToRefs,
     required this.sectionOwnRefs,
+    required this.segmentRefs,
+    required this.ownRefHolder,
+    required this.refHolder,
+    this.sectionTreeRefs,
+    this.verseRangeEnds,
+    this.navigableSections,
   });
   final Map<String, dynamic> map;
   final Map<String, Set<String>> sectionToRefs;
   final Map<String, Set<String>> sectionOwnRefs;
+  final Map<String, List<String>> segmentRefs;
+  final Map<String, String> ownRefHolder;
+  final Map<String, String> refHolder;
+  final Map<String, Set<String>>? sectionTreeRefs;
+  final Map<String, List<String>>? verseRangeEnds;
+  final List<_NavigableSection>? navigableSections;
 }
 
 /// Walks the sections tree and adds each node's [verses] entries to [out].
@@ -75,18 +94,29 @@ class VerseHierarchyService {
     final path = _assetPathFor(textId);
     if (path == null || path.isEmpty) return;
     try {
-      final content = await rootBundle.loadString(path);
+      final content = await TextAssetLoader.loadString(path);
       final result = await compute(_decodeAndIndex, content);
-      _cache[textId] = _HierarchyState(
+      final state = _HierarchyState(
         map: result.map,
         sectionToRefsIndex: result.sectionToRefs,
         sectionOwnRefsIndex: result.sectionOwnRefs,
+        segmentRefs: result.segmentRefs,
+        ownRefHolder: result.ownRefHolder,
+        refHolder: result.refHolder,
+        sectionTreeRefsIndex: result.sectionTreeRefs,
+        verseRangeEnds: result.verseRangeEnds,
       );
+      final navigable = result.navigableSections;
+      if (navigable != null) _cacheLeafSections(state, navigable);
+      _cache[textId] = state;
     } catch (_) {
       _cache[textId] = _HierarchyState(
         map: {},
         sectionToRefsIndex: {},
         sectionOwnRefsIndex: {},
+        segmentRefs: {},
+        ownRefHolder: {},
+        refHolder: {},
       );
     }
   }
@@ -114,16 +144,11 @@ class VerseHierarchyService {
     }
     if ((path == null || path is! List) &&
         VerseService.baseVerseRefPattern.hasMatch(ref)) {
-      final candidates = <String>[];
-      final pattern =
-          RegExp('^${RegExp.escape(ref)}[a-z]+\$', caseSensitive: false);
-      for (final key in verseToPath.keys) {
-        final k = key.toString();
-        if (pattern.hasMatch(k)) candidates.add(k);
-      }
-      if (candidates.isNotEmpty) {
-        candidates.sort((a, b) => _compareVerseRefsFull(a, b));
-        path = verseToPath[candidates.first];
+      for (final segment in s.segmentRefs[ref] ?? const <String>[]) {
+        if (verseToPath.containsKey(segment)) {
+          path = verseToPath[segment];
+          break;
+        }
       }
     }
     if ((path == null || path is! List) &&
@@ -261,16 +286,37 @@ class VerseHierarchyService {
   }
 
   /// Navigable sections sorted by first verse for reader arrow-key navigation.
-  /// Result is cached after first computation.
+  /// Read from the asset's navigableSections table when present; otherwise
+  /// computed on first use and cached.
   List<({String path, String title, int depth})>
       getLeafSectionsByVerseOrderSync(String textId) {
     final s = _get(textId);
     if (s == null) return [];
     if (s.cachedLeafSections != null) return s.cachedLeafSections!;
+    final withFirst = computeNavigableSectionsSync(textId);
+    if (withFirst.isEmpty) return [];
+    _cacheLeafSections(s, withFirst);
+    return s.cachedLeafSections!;
+  }
+
+  static void _cacheLeafSections(
+      _HierarchyState s, List<_NavigableSection> withFirst) {
+    s.cachedLeafFirstRefs = {for (final e in withFirst) e.path: e.firstRef};
+    s.cachedLeafSections = withFirst
+        .map((e) => (path: e.path, title: e.title, depth: e.depth))
+        .toList();
+  }
+
+  /// Walks the sections tree for [getLeafSectionsByVerseOrderSync]. This is
+  /// what script/rebuild_verse_indices.py precomputes as navigableSections.
+  @visibleForTesting
+  List<({String path, String title, int depth, String firstRef})>
+      computeNavigableSectionsSync(String textId) {
+    final s = _get(textId);
+    if (s == null) return [];
     final sections = s.map['sections'];
     if (sections is! List) return [];
-    final withFirst =
-        <({String path, String title, int depth, String firstRef})>[];
+    final withFirst = <_NavigableSection>[];
 
     Set<String> visit(dynamic node, int depth) {
       if (node is! Map) return {};
@@ -316,11 +362,7 @@ class VerseHierarchyService {
       visit(section, 0);
     }
     withFirst.sort((a, b) => _compareVerseRefsFull(a.firstRef, b.firstRef));
-    s.cachedLeafFirstRefs = {for (final e in withFirst) e.path: e.firstRef};
-    s.cachedLeafSections = withFirst
-        .map((e) => (path: e.path, title: e.title, depth: e.depth))
-        .toList();
-    return s.cachedLeafSections!;
+    return withFirst;
   }
 
   /// Sections with first verse, sorted by verse order. For arrow-key navigation.
@@ -440,6 +482,17 @@ class VerseHierarchyService {
       String textId, String sectionPath) {
     final s = _get(textId);
     if (s == null || sectionPath.isEmpty) return {};
+    final treeIndex = s.sectionTreeRefsIndex;
+    if (treeIndex != null) return treeIndex[sectionPath] ?? {};
+    return computeTreeVerseRefsForSectionSync(textId, sectionPath);
+  }
+
+  /// Scans the own-refs index for [getTreeVerseRefsForSectionSync].
+  @visibleForTesting
+  Set<String> computeTreeVerseRefsForSectionSync(
+      String textId, String sectionPath) {
+    final s = _get(textId);
+    if (s == null || sectionPath.isEmpty) return {};
     final ownIndex = s.sectionOwnRefsIndex;
     if (ownIndex.isEmpty) return {};
 
@@ -498,17 +551,33 @@ class VerseHierarchyService {
     return m?.group(1) ?? ref;
   }
 
-  /// Pre-computed section path -> verse range string. Call after _ensureLoaded().
+  /// Section path -> verse range string. Call after _ensureLoaded().
+  /// Formats the asset's sectionToVerseRange endpoints when present.
   Map<String, String> getSectionVerseRangeMapSync(String textId) {
     final s = _get(textId);
     if (s == null) return {};
     if (s.sectionToVerseRange != null) return s.sectionToVerseRange!;
+    final ends = s.verseRangeEnds;
+    s.sectionToVerseRange = ends != null
+        ? {
+            for (final e in ends.entries)
+              e.key: _formatVerseRange(textId, e.value),
+          }
+        : computeSectionVerseRangeMapSync(textId);
+    return s.sectionToVerseRange!;
+  }
+
+  /// Derives [getSectionVerseRangeMapSync] from the section ref indexes.
+  @visibleForTesting
+  Map<String, String> computeSectionVerseRangeMapSync(String textId) {
+    final s = _get(textId);
+    if (s == null) return {};
     final flat = getFlatSectionsSync(textId);
     final out = <String, String>{};
     for (final section in flat) {
       final path = section.path;
       final ownRefs = getOwnVerseRefsForSectionSync(textId, path);
-      final treeRefs = getTreeVerseRefsForSectionSync(textId, path);
+      final treeRefs = computeTreeVerseRefsForSectionSync(textId, path);
       final refs = (ownRefs.isNotEmpty
               ? ownRefs
               : treeRefs.isNotEmpty
@@ -519,8 +588,7 @@ class VerseHierarchyService {
       if (refs.isEmpty) continue;
       out[path] = _formatVerseRange(textId, refs);
     }
-    s.sectionToVerseRange = out;
-    return s.sectionToVerseRange!;
+    return out;
   }
 
   /// Format sorted refs as "v1.1ab" or "v1.2-1.3", "v4.2-v4.3".
@@ -589,12 +657,10 @@ class VerseHierarchyService {
     final verseToPath = s.map['verseToPath'];
     if (verseToPath == null || verseToPath is! Map) return [];
 
-    final ownSplit =
-        _collectSplitSegmentsFromIndex(s.sectionOwnRefsIndex, baseRef);
+    final segmentRefs = s.segmentRefs[baseRef] ?? const <String>[];
+    final ownSplit = _collectSplitSegments(s.ownRefHolder, segmentRefs);
     if (ownSplit.isNotEmpty) return ownSplit;
-    for (final refs in s.sectionOwnRefsIndex.values) {
-      if (refs.contains(baseRef)) return [];
-    }
+    if (s.ownRefHolder.containsKey(baseRef)) return [];
 
     final abPath = verseToPath['${baseRef}ab'];
     final cdPath = verseToPath['${baseRef}cd'];
@@ -627,27 +693,22 @@ class VerseHierarchyService {
     }
     if (segments.isNotEmpty) return segments;
 
-    return _collectSplitSegmentsFromIndex(s.sectionToRefsIndex, baseRef);
+    return _collectSplitSegments(s.refHolder, segmentRefs);
   }
 
-  List<({String ref, String sectionPath})> _collectSplitSegmentsFromIndex(
-    Map<String, Set<String>>? index,
-    String baseRef,
+  /// Pairs each of [segmentRefs] with its section in [holder] (ref -> first
+  /// section listing it); empty unless they span at least two sections.
+  List<({String ref, String sectionPath})> _collectSplitSegments(
+    Map<String, String> holder,
+    List<String> segmentRefs,
   ) {
-    if (index == null || index.isEmpty) return [];
     final byRef = <String, String>{};
-    final pattern =
-        RegExp('^${RegExp.escape(baseRef)}([a-z]+)\$', caseSensitive: false);
-    for (final entry in index.entries) {
-      final sectionPath = entry.key;
-      if (sectionPath.isEmpty) continue;
-      for (final ref in entry.value) {
-        final m = pattern.firstMatch(ref);
-        if (m == null) continue;
-        // Accept only contiguous suffix ranges we can map to line ranges.
-        if (VerseService.lineRangeForSegmentRef(ref, 4) == null) continue;
-        byRef.putIfAbsent(ref, () => sectionPath);
-      }
+    for (final ref in segmentRefs) {
+      final sectionPath = holder[ref];
+      if (sectionPath == null) continue;
+      // Accept only contiguous suffix ranges we can map to line ranges.
+      if (VerseService.lineRangeForSegmentRef(ref, 4) == null) continue;
+      byRef[ref] = sectionPath;
     }
     if (byRef.length < 2) return [];
     final distinctSections = byRef.values.toSet();
@@ -684,11 +745,28 @@ class _HierarchyState {
     required this.map,
     required this.sectionToRefsIndex,
     required this.sectionOwnRefsIndex,
+    required this.segmentRefs,
+    required this.ownRefHolder,
+    required this.refHolder,
+    this.sectionTreeRefsIndex,
+    this.verseRangeEnds,
   });
   final Map<String, dynamic> map;
   final Map<String, Set<String>> sectionToRefsIndex;
   final Map<String, Set<String>> sectionOwnRefsIndex;
 
+  /// Base ref -> its segment refs ("9.27" -> [9.27ab, 9.27cd]), sorted.
+  final Map<String, List<String>> segmentRefs;
+
+  /// Ref -> first section listing it, in [sectionOwnRefsIndex] and in
+  /// [sectionToRefsIndex] respectively.
+  final Map<String, String> ownRefHolder;
+  final Map<String, String> refHolder;
+
+  /// Asset tables (script/rebuild_verse_indices.py); null in older assets.
+  final Map<String, Set<String>>? sectionTreeRefsIndex;
+  final Map<String, List<String>>? verseRangeEnds;
+
   List<({String path, String title, int depth})>? flatSections;
   List<({String path, String title, int depth})>? cachedLeafSections;
   Map<String, String>? cachedLeafFirstRefs;
@@ -696,11 +774,58 @@ class _HierarchyState {
   Map<String, String>? sectionToVerseRange;
 }
 
-/// Result from background isolate: decoded map + pre-built reverse index.
+final RegExp _segmentRefPattern =
+    RegExp(r'^(\d+\.\d+)[a-z]+$', caseSensitive: false);
+
+Map<String, Set<String>>? _refSetsTable(dynamic table) {
+  if (table is! Map) return null;
+  return {
+    for (final e in table.entries)
+      if (e.value is List)
+        e.key.toString(): {for (final r in e.value as List) r.toString()},
+  };
+}
+
+Map<String, List<String>>? _refListsTable(dynamic table) {
+  if (table is! Map) return null;
+  return {
+    for (final e in table.entries)
+      if (e.value is List)
+        e.key.toString(): [for (final r in e.value as List) r.toString()],
+  };
+}
+
+List<_NavigableSection>? _navigableTable(dynamic table) {
+  if (table is! List) return null;
+  return [
+    for (final e in table)
+      if (e is Map)
+        (
+          path: (e['path'] ?? '').toString(),
+          title: (e['title'] ?? '').toString(),
+          depth: (e['depth'] as num?)?.toInt() ?? 0,
+          firstRef: (e['firstVerse'] ?? '').toString(),
+        ),
+  ];
+}
+
+Map<String, String> _firstHolders(Map<String, Set<String>> index) {
+  final out = <String, String>{};
+  for (final e in index.entries) {
+    if (e.key.isEmpty) continue;
+    for (final ref in e.value) {
+      out.putIfAbsent(ref, () => e.key);
+    }
+  }
+  return out;
+}
+
+/// Result from background isolate: decoded map + pre-built reverse indexes.
+/// The lookup tables written by script/rebuild_verse_indices.py are used as
+/// they are; without them the indexes are derived from the sections tree.
 _ParsedHierarchy _decodeAndIndex(String content) {
   final map = Map<String, dynamic>.from(jsonDecode(content) as Map);
   final sectionToRefs = <String, Set<String>>{};
-  final sectionOwnRefs = <String, Set<String>>{};
   final verseToPath = map['verseToPath'];
   if (verseToPath is Map) {
     for (final e in verseToPath.entries) {
@@ -717,18 +842,45 @@ _ParsedHierarchy _decodeAndIndex(String content) {
       }
     }
   }
-  final sections = map['sections'];
-  if (sections is List) {
-    for (final s in sections) {
-      _walkSectionsForRefs(s, sectionOwnRefs);
+  var sectionOwnRefs = _refSetsTable(map['sectionToOwnRefs']);
+  if (sectionOwnRefs == null) {
+    sectionOwnRefs = <String, Set<String>>{};
+    final sections = map['sections'];
+    if (sections is List) {
+      for (final s in sections) {
+        _walkSectionsForRefs(s, sectionOwnRefs);
+      }
     }
-    for (final e in sectionOwnRefs.entries) {
-      (sectionToRefs[e.key] ??= {}).addAll(e.value);
+  }
+  for (final e in sectionOwnRefs.entries) {
+    (sectionToRefs[e.key] ??= {}).addAll(e.value);
+  }
+
+  var segmentRefs = _refListsTable(map['verseToSegments']);
+  if (segmentRefs == null) {
+    final refs = <String>{
+      if (verseToPath is Map) ...verseToPath.keys.map((k) => k.toString()),
+      for (final own in sectionOwnRefs.values) ...own,
+    };
+    segmentRefs = <String, List<String>>{};
+    for (final ref in refs) {
+      final m = _segmentRefPattern.firstMatch(ref);
+      if (m != null) (segmentRefs[m.group(1)!] ??= []).add(ref);
+    }
+    for (final list in segmentRefs.values) {
+      list.sort(VerseHierarchyService._compareVerseRefsFull);
     }
   }
+
   return _ParsedHierarchy(
     map: map,
     sectionToRefs: sectionToRefs,
     sectionOwnRefs: sectionOwnRefs,
+    segmentRefs: segmentRefs,
+    ownRefHolder: _firstHolders(sectionOwnRefs),
+    refHolder: _firstHolders(sectionToRefs),
+    sectionTreeRefs: _refSetsTable(map['sectionToTreeRefs']),
+    verseRangeEnds: _refListsTable(map['sectionToVerseRange']),
+    navigableSections: _navigableTable(map['navigableSections']),
   );
 }
@@ -1,8 +1,8 @@
 import 'dart:convert';
 import 'dart:math';
-import 'package:flutter/services.dart';
 
 import '../config/study_text_config.dart';
+import '../utils/text_asset_loader.dart';
 
 /// One chapter: number, title, and verse index range into the flat verse list.
 class Chapter {
@@ -111,7 +111,7 @@ class VerseService {
     final path = _assetPathFor(textId);
     if (path == null || path.isEmpty) return;
     try {
-      final content = await rootBundle.loadString(path);
+      final content = await TextAssetLoader.loadString(path);
       final json = jsonDecode(content) as Map<String, dynamic>;
       final verses = (json['verses'] as List<dynamic>).cast<String>();
       final captions = (json['captions'] as List<dynamic>)
@@ -0,0 +1,83 @@
+import 'dart:convert';
+import 'dart:typed_data';
+
+import 'package:flutter/foundation.dart' show kIsWeb;
+import 'package:flutter/services.dart';
+import 'package:http/http.dart' as http;
+
+/// Loads study-text assets (texts/...) as strings.
+///
+/// On web, resolves the asset through text_assets_manifest.json written by
+/// tools/bundle_web_assets.py. The manifest points at content-hashed copies
+/// served as immutable, so unchanged texts come straight from the browser
+/// cache on repeat visits. Falls back to [rootBundle] when there is no
+/// manifest (local runs, tests) or the hashed fetch fails.
+class TextAssetLoader {
+  TextAssetLoader._();
+
+  static const _manifestPath = 'text_assets_manifest.json';
+
+  static Future<Map<String, String>>? _manifestFuture;
+
+  static Future<String> loadString(String path) async {
+    if (kIsWeb) {
+      final url = (await _loadManifest())[path];
+      if (url != null) {
+        final content = await _fetch(url);
+        if (content != null) return content;
+      }
+    }
+    return rootBundle.loadString(path);
+  }
+
+  /// Loads [path] as raw bytes, through the same manifest lookup as [loadString].
+  static Future<Uint8List> loadBytes(String path) async {
+    if (kIsWeb) {
+      final url = (await _loadManifest())[path];
+      if (url != null) {
+        final bytes = await _fetchBytes(url);
+        if (bytes != null) return bytes;
+      }
+    }
+    final data = await rootBundle.load(path);
+    return data.buffer.asUint8List(data.offsetInBytes, data.lengthInBytes);
+  }
+
+  static Future<Map<String, String>> _loadManifest() {
+    return _manifestFuture ??= _loadManifestImpl();
+  }
+
+  static Future<Map<String, String>> _loadManifestImpl() async {
+    try {
+      final content = await _fetch(_manifestPath);
+      if (content == null) return const {};
+      final decoded = jsonDecode(content) as Map<String, dynamic>;
+      final assets = decoded['assets'] as Map<String, dynamic>? ?? const {};
+      return assets.map(
+        (path, entry) => MapEntry(path, (entry as Map)['url'] as String),
+      );
+    } catch (_) {
+      return const {};
+    }
+  }
+
+  /// Fetches [path] relative to the site root (the bundle sits next to
+  /// index.html, while the current route may be nested, e.g. /bodhicaryavatara/read).
+  static Future<String?> _fetch(String path) async {
+    final bytes = await _fetchBytes(path);
+    return bytes == null ? null : utf8.decode(bytes);
+  }
+
+  static Future<Uint8List?> _fetchBytes(String path) async {
+    try {
+      final response = await http.get(Uri.base.resolve('/$path')).timeout(
+        const Duration(seconds: 20),
+        onTimeout: () => http.Response('', 408),
+      );
+      if (response.statusCode != 200) return null;
+      return response.bodyBytes;
+    } catch (_) {
+      return null;
+    }
+  }
+}
@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 """
 Rebuild verseToPath and sectionToFirstVerse from the 'sections' tree (source of truth).
-Reads verse_hierarchy_map.json and overwrites the two indices.
+Reads each text's verse_hierarchy_map.json and overwrites the two indices, plus
+the lookup tables VerseHierarchyService reads instead of walking the tree
+(see tools/hierarchy_lookup.py).
+
+    python3 script/rebuild_verse_indices.py                     # every text
+    python3 script/rebuild_verse_indices.py --text kingofaspirations
+    python3 script/rebuild_verse_indices.py --lookup-only       # keep the indices, refresh the tables
+    python3 script/rebuild_verse_indices.py --check             # exit 1 if any asset is stale
 """
+import argparse
 import json
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
-JSON_PATH = ROOT / "texts" / "verse_hierarchy_map.json"
+sys.path.insert(0, str(ROOT / "tools"))
+
+from hierarchy_json import write_hierarchy_json  # noqa: E402
+from hierarchy_lookup import apply_lookup_tables  # noqa: E402
+from text_assets import TEXTS_DIR, text_dirs  # noqa: E402
+
+HIERARCHY_NAME = "verse_hierarchy_map.json"
 
 
 def collect_path_chain(node, parent_chain):
@@ -107,10 +122,8 @@ def build_verse_to_path(sections):
     return verse_to_path
 
 
-def main():
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
+def rebuild(data, text_id):
+    """Recompute the indices and lookup tables of one hierarchy map dict in place."""
     sections = data["sections"]
 
     # sectionToFirstVerse: merge from each root, then fill missing paths from parent
@@ -133,13 +146,42 @@ def main():
         sorted(section_to_first_verse.items(), key=lambda x: path_key(x[0]))
     )
     data["verseToPath"] = dict(sorted(verse_to_path.items()))
+    apply_lookup_tables(data, text_id)
+    return data
 
-    with open(JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
-    print("Updated verseToPath entries:", len(data["verseToPath"]))
-    print("Updated sectionToFirstVerse entries:", len(data["sectionToFirstVerse"]))
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild verse_hierarchy_map.json indices from the sections tree.")
+    parser.add_argument("--text", action="append", help="text id (repeatable; default: every text)")
+    parser.add_argument("--lookup-only", action="store_true",
+                        help="refresh only the lookup tables; keep verseToPath and sectionToFirstVerse as they are")
+    parser.add_argument("--check", action="store_true", help="report stale assets without writing; exit 1 if any")
+    args = parser.parse_args()
+
+    dirs = [TEXTS_DIR / t for t in args.text] if args.text else text_dirs()
+    stale = 0
+    for text_dir in dirs:
+        json_path = text_dir / HIERARCHY_NAME
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        before = json.dumps(data, sort_keys=True)
+        if args.lookup_only:
+            apply_lookup_tables(data, text_dir.name)
+        else:
+            rebuild(data, text_dir.name)
+        changed = json.dumps(data, sort_keys=True) != before
+
+        if args.check:
+            if changed:
+                stale += 1
+                print(f"{text_dir.name}: {HIERARCHY_NAME} is stale; run script/rebuild_verse_indices.py")
+            continue
+        write_hierarchy_json(json_path, data)
+        print(f"{text_dir.name}: verseToPath {len(data['verseToPath'])}, "
+              f"sectionToFirstVerse {len(data['sectionToFirstVerse'])}, "
+              f"navigableSections {len(data['navigableSections'])}")
+    return 1 if stale else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -14,3 +14,23 @@ else
 fi
 export PATH="$PWD/flutter/bin:$PATH"
 flutter build web --release --dart-define=APP_ENV=prod
+# Content-hashed, minified copies of texts/ plus the manifest the app resolves them through.
+python3 tools/bundle_web_assets.py --out build/web
+# Text patches plus text_deltas_manifest.json. The live manifest records the revisions deployed so far;
+# passing it back rebuilds the patch chain from them, since each build starts from an empty texts/.
+# TEXT_DELTA_BASES (space-separated, oldest first) seeds revisions it does not record yet, e.g. app releases.
+DELTA_ARGS=()
+MANIFEST_URL="${TEXT_DELTAS_MANIFEST_URL:-${VERCEL_PROJECT_PRODUCTION_URL:+https://$VERCEL_PROJECT_PRODUCTION_URL/text_deltas_manifest.json}}"
+if [ -n "$MANIFEST_URL" ] && curl -fsSL "$MANIFEST_URL" -o build/deployed_text_deltas_manifest.json; then
+  DELTA_ARGS+=(--history build/deployed_text_deltas_manifest.json)
+else
+  echo "::warning:: No deployed text_deltas_manifest.json found; patches start from this build."
+fi
+# Vercel clones shallowly; recorded revisions need the history behind them.
+if [ "$(git rev-parse --is-shallow-repository)" = "true" ]; then
+  git fetch --quiet --unshallow || echo "::warning:: Could not fetch full git history; older text patches will be skipped."
+fi
+for rev in ${TEXT_DELTA_BASES:-}; do
+  DELTA_ARGS+=(--base "$rev")
+done
+python3 tools/build_text_deltas.py "${DELTA_ARGS[@]}" --out build/web
@@ -0,0 +1,405 @@
+-- Incremental analytics rollups.
+-- analytics_dashboard_json() used to run ~10 GROUP BY scans over all of app_usage_events on
+-- every call. Events are now folded into small daily aggregate tables by
+-- analytics_rollup_events(), which tracks a high-water mark on app_usage_events.id and only
+-- reads rows past it. The dashboard RPC is served from the aggregates, so its cost depends on
+-- days x dimensions rather than on event volume.
+--
+-- The dashboard covers the same 4-week window that prune_app_usage_events_batched() keeps raw
+-- events for, as it did when it read app_usage_events directly. The per-day session and actor
+-- sets are pruned to that window along with the raw events (analytics_prune_rollups()).
+--
+-- Driven by pg_cron every 5 minutes when available, or by tools/analytics_rollup.py.
+
+-- High-water mark per rollup stream.
+CREATE TABLE IF NOT EXISTS public.analytics_rollup_state (
+  name TEXT PRIMARY KEY,
+  last_event_id BIGINT NOT NULL DEFAULT 0,
+  last_received_at TIMESTAMPTZ,
+  events_folded BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT TIMEZONE('utc', NOW())
+);
+
+INSERT INTO public.analytics_rollup_state (name)
+VALUES ('app_usage_events')
+ON CONFLICT (name) DO NOTHING;
+
+-- Daily event counts by event type, mode, text and country.
+-- Missing mode/text_id are stored as '' so they can take part in the primary key;
+-- missing/blank country_code is stored as 'Unknown' (as the dashboard reports it).
+CREATE TABLE IF NOT EXISTS public.analytics_events_daily (
+  day_utc DATE NOT NULL,
+  event_name TEXT NOT NULL,
+  mode TEXT NOT NULL DEFAULT '',
+  text_id TEXT NOT NULL DEFAULT '',
+  country_code TEXT NOT NULL DEFAULT 'Unknown',
+  event_count BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (day_utc, event_name, mode, text_id, country_code)
+);
+
+-- Daily read-section dwell totals (same filters as analytics_read_section_dwell_daily_v1).
+CREATE TABLE IF NOT EXISTS public.analytics_section_dwell_daily (
+  day_utc DATE NOT NULL,
+  text_id TEXT NOT NULL,
+  mode TEXT NOT NULL DEFAULT '',
+  section_path TEXT NOT NULL,
+  dwell_event_count BIGINT NOT NULL DEFAULT 0,
+  total_dwell_ms BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (day_utc, text_id, mode, section_path)
+);
+
+-- Distinct counts cannot be summed across days, so sessions and actors active on each day are
+-- kept as per-day sets. Only the retention window is kept (see analytics_prune_rollups()), so
+-- these stay the size of a few weeks of sessions/users.
+CREATE TABLE IF NOT EXISTS public.analytics_sessions_daily (
+  day_utc DATE NOT NULL,
+  session_id TEXT NOT NULL,
+  is_quiz BOOLEAN NOT NULL DEFAULT FALSE,
+  PRIMARY KEY (day_utc, session_id)
+);
+
+CREATE TABLE IF NOT EXISTS public.analytics_actors_daily (
+  day_utc DATE NOT NULL,
+  actor_kind TEXT NOT NULL CHECK (actor_kind IN ('anon', 'user')),
+  actor_id TEXT NOT NULL,
+  PRIMARY KEY (day_utc, actor_kind, actor_id)
+);
+
+-- No policies: only the SECURITY DEFINER functions below (and the service role) touch these.
+ALTER TABLE public.analytics_rollup_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_events_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_section_dwell_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_sessions_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_actors_daily ENABLE ROW LEVEL SECURITY;
+
+-- Fold the next batch of events past the high-water mark into the aggregates.
+-- Only rows received at least [settle] ago are considered, so an insert whose transaction
+-- committed after a higher id was already visible is not skipped over.
+-- Returns how many events were folded and the new watermark; call until folded_count = 0.
+CREATE OR REPLACE FUNCTION public.analytics_rollup_events(
+  batch_size INTEGER DEFAULT 50000,
+  settle INTERVAL DEFAULT INTERVAL '1 minute'
+)
+RETURNS TABLE(folded_count BIGINT, last_event_id BIGINT)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_from BIGINT;
+  v_to BIGINT;
+  v_folded BIGINT := 0;
+  v_last_received TIMESTAMPTZ;
+BEGIN
+  -- Serialises concurrent runs (cron + manual worker).
+  SELECT s.last_event_id INTO v_from
+  FROM analytics_rollup_state s
+  WHERE s.name = 'app_usage_events'
+  FOR UPDATE;
+
+  IF v_from IS NULL THEN
+    INSERT INTO analytics_rollup_state (name) VALUES ('app_usage_events');
+    v_from := 0;
+  END IF;
+
+  SELECT MAX(b.id) INTO v_to
+  FROM (
+    SELECT e.id
+    FROM app_usage_events e
+    WHERE e.id > v_from
+      AND e.received_at <= TIMEZONE('utc', NOW()) - settle
+    ORDER BY e.id
+    LIMIT batch_size
+  ) b;
+
+  IF v_to IS NULL THEN
+    RETURN QUERY SELECT 0::bigint, v_from;
+    RETURN;
+  END IF;
+
+  CREATE TEMP TABLE IF NOT EXISTS analytics_rollup_batch (
+    day_utc DATE,
+    event_name TEXT,
+    mode TEXT,
+    text_id TEXT,
+    country_code TEXT,
+    session_id TEXT,
+    user_id UUID,
+    anon_id TEXT,
+    section_path TEXT,
+    duration_ms INTEGER,
+    received_at TIMESTAMPTZ
+  ) ON COMMIT DROP;
+  TRUNCATE analytics_rollup_batch;
+
+  INSERT INTO analytics_rollup_batch
+  SELECT
+    (e.occurred_at AT TIME ZONE 'utc')::date,
+    e.event_name,
+    e.mode,
+    e.text_id,
+    COALESCE(NULLIF(trim(e.country_code), ''), 'Unknown'),
+    e.session_id,
+    e.user_id,
+    e.anon_id,
+    e.section_path,
+    e.duration_ms,
+    e.received_at
+  FROM app_usage_events e
+  WHERE e.id > v_from
+    AND e.id <= v_to;
+
+  GET DIAGNOSTICS v_folded = ROW_COUNT;
+
+  INSERT INTO analytics_events_daily AS d
+    (day_utc, event_name, mode, text_id, country_code, event_count)
+  SELECT day_utc, event_name, COALESCE(mode, ''), COALESCE(text_id, ''), country_code, COUNT(*)
+  FROM analytics_rollup_batch
+  GROUP BY day_utc, event_name, COALESCE(mode, ''), COALESCE(text_id, ''), country_code
+  ON CONFLICT (day_utc, event_name, mode, text_id, country_code)
+  DO UPDATE SET event_count = d.event_count + EXCLUDED.event_count;
+
+  INSERT INTO analytics_section_dwell_daily AS d
+    (day_utc, text_id, mode, section_path, dwell_event_count, total_dwell_ms)
+  SELECT
+    day_utc,
+    text_id,
+    COALESCE(mode, ''),
+    section_path,
+    COUNT(*),
+    SUM(LEAST(duration_ms, 7200000))
+  FROM analytics_rollup_batch
+  WHERE event_name = 'read_section_dwell'
+    AND duration_ms IS NOT NULL
+    AND duration_ms >= 1000
+    AND text_id IS NOT NULL
+    AND section_path IS NOT NULL
+  GROUP BY day_utc, text_id, COALESCE(mode, ''), section_path
+  ON CONFLICT (day_utc, text_id, mode, section_path)
+  DO UPDATE SET
+    dwell_event_count = d.dwell_event_count + EXCLUDED.dwell_event_count,
+    total_dwell_ms = d.total_dwell_ms + EXCLUDED.total_dwell_ms;
+
+  INSERT INTO analytics_sessions_daily AS s (day_utc, session_id, is_quiz)
+  SELECT
+    day_utc,
+    session_id,
+    BOOL_OR(mode = 'quiz' OR event_name IN ('quiz_attempt', 'quiz_next_question_tapped', 'quiz_answer_revealed'))
+  FROM analytics_rollup_batch
+  GROUP BY day_utc, session_id
+  ON CONFLICT (day_utc, session_id) DO UPDATE SET
+    is_quiz = s.is_quiz OR EXCLUDED.is_quiz;
+
+  INSERT INTO analytics_actors_daily (day_utc, actor_kind, actor_id)
+  SELECT DISTINCT
+    day_utc,
+    CASE WHEN user_id IS NOT NULL THEN 'user' ELSE 'anon' END,
+    COALESCE(user_id::text, anon_id)
+  FROM analytics_rollup_batch
+  WHERE user_id IS NOT NULL OR anon_id IS NOT NULL
+  ON CONFLICT (day_utc, actor_kind, actor_id) DO NOTHING;
+
+  SELECT MAX(b.received_at) INTO v_last_received FROM analytics_rollup_batch b;
+
+  UPDATE analytics_rollup_state s
+  SET last_event_id = v_to,
+      last_received_at = GREATEST(s.last_received_at, v_last_received),
+      events_folded = s.events_folded + v_folded,
+      updated_at = TIMEZONE('utc', NOW())
+  WHERE s.name = 'app_usage_events';
+
+  TRUNCATE analytics_rollup_batch;
+
+  RETURN QUERY SELECT v_folded, v_to;
+END;
+$$;
+
+-- Drop per-day session and actor sets older than the retention window. Called by
+-- prune_app_usage_events_finish() with the run's cutoff, so they track the raw events.
+-- The daily count tables are kept: they grow by days x dimensions only.
+CREATE OR REPLACE FUNCTION public.analytics_prune_rollups(
+  retain_interval INTERVAL DEFAULT INTERVAL '4 weeks'
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_before DATE := (TIMEZONE('utc', NOW()) - retain_interval)::date;
+  v_sessions BIGINT;
+  v_actors BIGINT;
+BEGIN
+  DELETE FROM analytics_sessions_daily WHERE day_utc < v_before;
+  GET DIAGNOSTICS v_sessions = ROW_COUNT;
+  DELETE FROM analytics_actors_daily WHERE day_utc < v_before;
+  GET DIAGNOSTICS v_actors = ROW_COUNT;
+  RETURN v_sessions + v_actors;
+END;
+$$;
+
+-- Dashboard RPC, now served from the rollup tables. Same JSON shape as before.
+-- Everything except the 30-day time series covers the 4-week retention window (days on or
+-- after v_since), as the raw-event dashboard did, so each call reads a bounded number of rows.
+CREATE OR REPLACE FUNCTION public.analytics_dashboard_json()
+RETURNS jsonb
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  result jsonb;
+  v_since DATE := (TIMEZONE('utc', NOW()) - INTERVAL '4 weeks')::date;
+BEGIN
+  SELECT jsonb_build_object(
+    'events_by_mode', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT mode, SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since AND mode <> ''
+        GROUP BY mode
+        ORDER BY count DESC
+      ) t
+    ), '[]'::jsonb),
+    'events_by_mode_and_text', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT mode, text_id, SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since AND mode <> '' AND text_id <> ''
+        GROUP BY mode, text_id
+        ORDER BY mode, count DESC
+      ) t
+    ), '[]'::jsonb),
+    'events_by_type', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT event_name, NULLIF(mode, '') AS mode, SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since
+        GROUP BY event_name, mode
+        ORDER BY count DESC
+        LIMIT 20
+      ) t
+    ), '[]'::jsonb),
+    'events_by_text', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT text_id, SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since AND text_id <> ''
+        GROUP BY text_id
+        ORDER BY count DESC
+      ) t
+    ), '[]'::jsonb),
+    'events_over_time', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT to_char(day_utc, 'YYYY-MM-DD') AS day,
+               SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= CURRENT_DATE - 30
+        GROUP BY day_utc
+        ORDER BY day
+      ) t
+    ), '[]'::jsonb),
+    'events_over_time_by_text', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT to_char(day_utc, 'YYYY-MM-DD') AS day,
+               text_id,
+               SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= CURRENT_DATE - 30
+          AND text_id <> ''
+        GROUP BY day_utc, text_id
+        ORDER BY day, text_id
+      ) t
+    ), '[]'::jsonb),
+    'events_by_country', COALESCE((
+      SELECT jsonb_agg(row_to_json(t)::jsonb)
+      FROM (
+        SELECT country_code, SUM(event_count)::int AS count
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since
+        GROUP BY country_code
+        ORDER BY count DESC
+        LIMIT 31
+      ) t
+    ), '[]'::jsonb),
+    'quiz_summary', jsonb_build_object(
+      'quiz_attempts', (
+        SELECT COALESCE(SUM(event_count), 0)::int
+        FROM analytics_events_daily
+        WHERE day_utc >= v_since AND event_name = 'quiz_attempt'
+      ),
+      'quiz_sessions', (
+        SELECT COUNT(DISTINCT session_id)::int
+        FROM analytics_sessions_daily
+        WHERE day_utc >= v_since AND is_quiz
+      )
+    ),
+    'totals', jsonb_build_object(
+      'total_events', (
+        SELECT COALESCE(SUM(event_count), 0)::int FROM analytics_events_daily WHERE day_utc >= v_since
+      ),
+      'unique_sessions', (
+        SELECT COUNT(DISTINCT session_id)::int FROM analytics_sessions_daily WHERE day_utc >= v_since
+      ),
+      'unique_anon_users', (
+        SELECT COUNT(DISTINCT actor_id)::int
+        FROM analytics_actors_daily
+        WHERE day_utc >= v_since AND actor_kind = 'anon'
+      ),
+      'unique_authenticated_users', (
+        SELECT COUNT(DISTINCT actor_id)::int
+        FROM analytics_actors_daily
+        WHERE day_utc >= v_since AND actor_kind = 'user'
+      )
+    ),
+    'rollup', (
+      SELECT jsonb_build_object(
+        'last_event_id', s.last_event_id,
+        'last_received_at', s.last_received_at,
+        'updated_at', s.updated_at
+      )
+      FROM analytics_rollup_state s
+      WHERE s.name = 'app_usage_events'
+    )
+  ) INTO result;
+  RETURN COALESCE(result, '{}'::jsonb);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.analytics_dashboard_json() TO anon, authenticated;
+-- The fold moves a watermark; only pg_cron, tools/analytics_rollup.py and the service role run it.
+REVOKE EXECUTE ON FUNCTION public.analytics_rollup_events(INTEGER, INTERVAL) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.analytics_prune_rollups(INTERVAL) FROM PUBLIC, anon, authenticated;
+
+-- Backfill from whatever raw events are currently retained.
+SELECT * FROM public.analytics_rollup_events(NULL, INTERVAL '0 seconds');
+
+-- Fold new events every 5 minutes via pg_cron when available.
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    BEGIN
+      IF NOT EXISTS (
+        SELECT 1
+        FROM cron.job
+        WHERE jobname = 'analytics_rollup_events'
+      ) THEN
+        PERFORM cron.schedule(
+          'analytics_rollup_events',
+          '*/5 * * * *',
+          $job$SELECT public.analytics_rollup_events();$job$
+        );
+      END IF;
+    EXCEPTION
+      WHEN undefined_table THEN
+        RAISE NOTICE 'pg_cron job table not available; run tools/analytics_rollup.py on a schedule instead.';
+    END;
+  END IF;
+END;
+$$;
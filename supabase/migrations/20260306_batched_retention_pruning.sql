@@ -0,0 +1,465 @@
+-- Batched, partition-aware retention pruning for app_usage_events.
+-- prune_app_usage_events(INTERVAL) deletes everything past retention in one statement, which
+-- under load means one long transaction, a burst of dead tuples and WAL, and stalled inserts.
+-- Pruning is now a run made of small steps, each its own transaction:
+--   prune_app_usage_events_start()   opens a run in app_usage_event_retention_runs, drops whole
+--                                    daily partitions past the cutoff (when partitioned) and
+--                                    fixes the id range that still needs scanning
+--   prune_app_usage_events_step()    deletes one bounded id range older than the cutoff
+--   prune_app_usage_events_finish()  closes the run
+-- CALL prune_app_usage_events_batched() drives them with COMMITs and pauses (used by pg_cron);
+-- tools/prune_usage_events.py drives them from outside and can convert the table to daily
+-- range partitions via app_usage_events_convert_to_partitioned().
+
+ALTER TABLE public.app_usage_event_retention_runs
+  ADD COLUMN IF NOT EXISTS method TEXT NOT NULL DEFAULT 'single_delete',
+  ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'completed',
+  ADD COLUMN IF NOT EXISTS cutoff TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS batches INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS dropped_partitions INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS scan_position BIGINT,
+  ADD COLUMN IF NOT EXISTS scan_to_id BIGINT,
+  ADD COLUMN IF NOT EXISTS finished_at TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS error TEXT;
+
+CREATE OR REPLACE FUNCTION public.app_usage_events_is_partitioned()
+RETURNS BOOLEAN
+LANGUAGE sql
+STABLE
+SET search_path = public, pg_temp
+AS $$
+  SELECT COALESCE(
+    (SELECT c.relkind = 'p' FROM pg_class c WHERE c.oid = 'public.app_usage_events'::regclass),
+    FALSE
+  );
+$$;
+
+-- Daily partitions are named app_usage_events_pYYYYMMDD and cover [day, day + 1) in UTC.
+CREATE OR REPLACE FUNCTION public.app_usage_events_create_partition(p_day DATE)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_name TEXT := 'app_usage_events_p' || to_char(p_day, 'YYYYMMDD');
+BEGIN
+  IF to_regclass('public.' || v_name) IS NOT NULL THEN
+    RETURN FALSE;
+  END IF;
+  EXECUTE format(
+    'CREATE TABLE public.%I PARTITION OF public.app_usage_events FOR VALUES FROM (%L) TO (%L)',
+    v_name,
+    p_day::timestamp AT TIME ZONE 'utc',
+    (p_day + 1)::timestamp AT TIME ZONE 'utc'
+  );
+  -- Partitions are reached through the parent; no direct API access.
+  EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', v_name);
+  RETURN TRUE;
+END;
+$$;
+
+-- Keep partitions ready for today .. today + days_ahead. No-op on an unpartitioned table.
+CREATE OR REPLACE FUNCTION public.app_usage_events_ensure_partitions(days_ahead INTEGER DEFAULT 7)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_day DATE;
+  v_created INTEGER := 0;
+BEGIN
+  IF NOT app_usage_events_is_partitioned() THEN
+    RETURN 0;
+  END IF;
+  FOR v_day IN
+    SELECT d::date
+    FROM generate_series(
+      (TIMEZONE('utc', NOW()))::date,
+      (TIMEZONE('utc', NOW()))::date + days_ahead,
+      INTERVAL '1 day'
+    ) d
+  LOOP
+    BEGIN
+      IF app_usage_events_create_partition(v_day) THEN
+        v_created := v_created + 1;
+      END IF;
+    EXCEPTION
+      WHEN check_violation THEN
+        RAISE NOTICE 'Rows for % are in app_usage_events_default; partition not created.', v_day;
+    END;
+  END LOOP;
+  RETURN v_created;
+END;
+$$;
+
+-- One-off conversion of app_usage_events to daily range partitions on occurred_at.
+-- Runs in the caller's transaction and takes an ACCESS EXCLUSIVE lock while it copies rows,
+-- so run it in a quiet window. Dependent views are recreated from their saved definitions;
+-- id stays an identity column and continues from the old table's highest id.
+CREATE OR REPLACE FUNCTION public.app_usage_events_convert_to_partitioned(days_ahead INTEGER DEFAULT 7)
+RETURNS TABLE(partitions_created INTEGER, rows_copied BIGINT)
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_views JSONB;
+  v_view JSONB;
+  v_max_id BIGINT;
+  v_first_day DATE;
+  v_day DATE;
+  v_created INTEGER := 0;
+  v_copied BIGINT := 0;
+BEGIN
+  IF app_usage_events_is_partitioned() THEN
+    RETURN QUERY SELECT 0, 0::bigint;
+    RETURN;
+  END IF;
+
+  LOCK TABLE public.app_usage_events IN ACCESS EXCLUSIVE MODE;
+
+  -- Views bind to the table itself, not its name: save and drop them, recreate at the end.
+  SELECT COALESCE(jsonb_agg(jsonb_build_object(
+           'name', v.relname,
+           'options', array_to_string(v.reloptions, ', '),
+           'definition', pg_get_viewdef(v.oid, true)
+         )), '[]'::jsonb)
+  INTO v_views
+  FROM (
+    SELECT DISTINCT c.oid, c.relname, c.reloptions
+    FROM pg_depend d
+    JOIN pg_rewrite r ON r.oid = d.objid
+    JOIN pg_class c ON c.oid = r.ev_class
+    WHERE d.classid = 'pg_rewrite'::regclass
+      AND d.refobjid = 'public.app_usage_events'::regclass
+      AND c.oid <> d.refobjid
+      AND c.relkind = 'v'
+  ) v;
+
+  FOR v_view IN SELECT * FROM jsonb_array_elements(v_views) LOOP
+    EXECUTE format('DROP VIEW public.%I', v_view->>'name');
+  END LOOP;
+
+  SELECT MAX(id), (MIN(occurred_at) AT TIME ZONE 'utc')::date
+  INTO v_max_id, v_first_day
+  FROM public.app_usage_events;
+
+  ALTER TABLE public.app_usage_events RENAME TO app_usage_events_unpartitioned;
+  ALTER INDEX public.app_usage_events_pkey RENAME TO app_usage_events_unpartitioned_pkey;
+  -- Dropping the old identity frees its sequence name for the new table's identity.
+  ALTER TABLE public.app_usage_events_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS;
+
+  CREATE TABLE public.app_usage_events (
+    id BIGINT GENERATED ALWAYS AS IDENTITY (SEQUENCE NAME public.app_usage_events_id_seq),
+    occurred_at TIMESTAMPTZ NOT NULL DEFAULT TIMEZONE('utc', NOW()),
+    received_at TIMESTAMPTZ NOT NULL DEFAULT TIMEZONE('utc', NOW()),
+    event_name TEXT NOT NULL CHECK (char_length(trim(event_name)) > 0),
+    session_id TEXT NOT NULL CHECK (char_length(trim(session_id)) > 0),
+    user_id UUID REFERENCES auth.users(id) ON DELETE SET NULL,
+    anon_id TEXT,
+    text_id TEXT,
+    mode TEXT,
+    section_path TEXT,
+    section_title TEXT,
+    chapter_number INTEGER,
+    verse_ref TEXT,
+    duration_ms INTEGER CHECK (duration_ms IS NULL OR duration_ms >= 0),
+    properties JSONB NOT NULL DEFAULT '{}'::jsonb,
+    country_code TEXT,
+    CONSTRAINT app_usage_events_actor_check CHECK (
+      user_id IS NOT NULL OR (anon_id IS NOT NULL AND char_length(trim(anon_id)) > 0)
+    ),
+    CONSTRAINT app_usage_events_pkey PRIMARY KEY (id, occurred_at)
+  ) PARTITION BY RANGE (occurred_at);
+
+  -- Catches rows outside every daily partition (e.g. far-future client clocks).
+  CREATE TABLE public.app_usage_events_default PARTITION OF public.app_usage_events DEFAULT;
+  ALTER TABLE public.app_usage_events_default ENABLE ROW LEVEL SECURITY;
+
+  FOR v_day IN
+    SELECT d::date
+    FROM generate_series(
+      COALESCE(v_first_day, (TIMEZONE('utc', NOW()))::date),
+      (TIMEZONE('utc', NOW()))::date + days_ahead,
+      INTERVAL '1 day'
+    ) d
+  LOOP
+    IF app_usage_events_create_partition(v_day) THEN
+      v_created := v_created + 1;
+    END IF;
+  END LOOP;
+
+  INSERT INTO public.app_usage_events (
+    id, occurred_at, received_at, event_name, session_id, user_id, anon_id, text_id, mode,
+    section_path, section_title, chapter_number, verse_ref, duration_ms, properties, country_code
+  )
+  OVERRIDING SYSTEM VALUE
+  SELECT
+    id, occurred_at, received_at, event_name, session_id, user_id, anon_id, text_id, mode,
+    section_path, section_title, chapter_number, verse_ref, duration_ms, properties, country_code
+  FROM public.app_usage_events_unpartitioned;
+  GET DIAGNOSTICS v_copied = ROW_COUNT;
+  PERFORM setval('public.app_usage_events_id_seq', COALESCE(v_max_id, 1), v_max_id IS NOT NULL);
+
+  DROP TABLE public.app_usage_events_unpartitioned;
+
+  CREATE INDEX idx_app_usage_events_occurred_at
+    ON public.app_usage_events (occurred_at DESC);
+  CREATE INDEX idx_app_usage_events_event_name_occurred_at
+    ON public.app_usage_events (event_name, occurred_at DESC);
+  CREATE INDEX idx_app_usage_events_text_mode_occurred_at
+    ON public.app_usage_events (text_id, mode, occurred_at DESC);
+  CREATE INDEX idx_app_usage_events_section_path_occurred_at
+    ON public.app_usage_events (section_path, occurred_at DESC);
+  CREATE INDEX idx_app_usage_events_user_occurred_at
+    ON public.app_usage_events (user_id, occurred_at DESC);
+  CREATE INDEX idx_app_usage_events_surface_dwell_occurred_at
+    ON public.app_usage_events (occurred_at DESC, text_id, mode)
+    WHERE event_name = 'surface_dwell' AND duration_ms IS NOT NULL;
+  CREATE INDEX idx_app_usage_events_read_section_dwell_path_occurred_at
+    ON public.app_usage_events (section_path, occurred_at DESC)
+    WHERE event_name = 'read_section_dwell' AND duration_ms IS NOT NULL;
+  CREATE INDEX idx_app_usage_events_country_code
+    ON public.app_usage_events (country_code)
+    WHERE country_code IS NOT NULL;
+
+  ALTER TABLE public.app_usage_events ENABLE ROW LEVEL SECURITY;
+  CREATE POLICY "Insert usage metrics events"
+    ON public.app_usage_events
+    FOR INSERT
+    TO anon, authenticated
+    WITH CHECK (
+      (auth.uid() IS NOT NULL AND user_id = auth.uid())
+      OR
+      (auth.uid() IS NULL AND user_id IS NULL)
+    );
+
+  -- id stays GENERATED ALWAYS, so clients cannot pick ids (which would push the rollup and
+  -- export watermarks past real events); identity inserts need no sequence privileges.
+  GRANT INSERT ON public.app_usage_events TO anon, authenticated;
+
+  FOR v_view IN SELECT * FROM jsonb_array_elements(v_views) LOOP
+    IF COALESCE(v_view->>'options', '') <> '' THEN
+      EXECUTE format('CREATE VIEW public.%I WITH (%s) AS %s',
+        v_view->>'name', v_view->>'options', v_view->>'definition');
+    ELSE
+      EXECUTE format('CREATE VIEW public.%I AS %s', v_view->>'name', v_view->>'definition');
+    END IF;
+  END LOOP;
+
+  RETURN QUERY SELECT v_created, v_copied;
+END;
+$$;
+
+-- Open a pruning run. On a partitioned table, whole daily partitions that end at or before the
+-- cutoff are dropped here (cheap metadata operations, no dead tuples). Whatever is still older
+-- than the cutoff (the partial boundary day, the default partition, or every row on an
+-- unpartitioned table) is left for prune_app_usage_events_step() over a fixed id range.
+CREATE OR REPLACE FUNCTION public.prune_app_usage_events_start(
+  retain_interval INTERVAL DEFAULT INTERVAL '4 weeks',
+  drop_partitions BOOLEAN DEFAULT TRUE
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_run_id BIGINT;
+  v_cutoff TIMESTAMPTZ := TIMEZONE('utc', NOW()) - retain_interval;
+  v_partitioned BOOLEAN := app_usage_events_is_partitioned();
+  v_part RECORD;
+  v_rows BIGINT;
+  v_dropped INTEGER := 0;
+  v_deleted BIGINT := 0;
+BEGIN
+  INSERT INTO app_usage_event_retention_runs (retain_interval, deleted_count, method, status, cutoff)
+  VALUES (
+    retain_interval,
+    0,
+    CASE WHEN v_partitioned AND drop_partitions THEN 'partition_drop' ELSE 'batched_delete' END,
+    'running',
+    v_cutoff
+  )
+  RETURNING id INTO v_run_id;
+
+  IF v_partitioned AND drop_partitions THEN
+    FOR v_part IN
+      SELECT c.relname, to_date(substring(c.relname FROM '_p(\d{8})$'), 'YYYYMMDD') AS day
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+      WHERE i.inhparent = 'public.app_usage_events'::regclass
+        AND c.relname ~ '^app_usage_events_p\d{8}$'
+      ORDER BY c.relname
+    LOOP
+      EXIT WHEN ((v_part.day + 1)::timestamp AT TIME ZONE 'utc') > v_cutoff;
+      EXECUTE format('SELECT COUNT(*) FROM public.%I', v_part.relname) INTO v_rows;
+      EXECUTE format('DROP TABLE public.%I', v_part.relname);
+      v_dropped := v_dropped + 1;
+      v_deleted := v_deleted + v_rows;
+    END LOOP;
+  END IF;
+
+  UPDATE app_usage_event_retention_runs r
+  SET deleted_count = v_deleted,
+      dropped_partitions = v_dropped,
+      scan_position = (SELECT MIN(e.id) - 1 FROM app_usage_events e),
+      scan_to_id = (SELECT MAX(e.id) FROM app_usage_events e WHERE e.occurred_at < v_cutoff)
+  WHERE r.id = v_run_id;
+
+  RETURN v_run_id;
+END;
+$$;
+
+-- Delete rows older than the run's cutoff in the next id range (scan_position, scan_position +
+-- batch_size]. Returns rows deleted and whether the run has covered its whole id range.
+CREATE OR REPLACE FUNCTION public.prune_app_usage_events_step(
+  run_id BIGINT,
+  batch_size INTEGER DEFAULT 5000
+)
+RETURNS TABLE(deleted_count BIGINT, done BOOLEAN)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_pos BIGINT;
+  v_to BIGINT;
+  v_cutoff TIMESTAMPTZ;
+  v_hi BIGINT;
+  v_deleted BIGINT := 0;
+BEGIN
+  SELECT r.scan_position, r.scan_to_id, r.cutoff
+  INTO v_pos, v_to, v_cutoff
+  FROM app_usage_event_retention_runs r
+  WHERE r.id = run_id AND r.status = 'running'
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'retention run % is not running', run_id;
+  END IF;
+
+  IF v_to IS NULL OR v_pos IS NULL OR v_pos >= v_to THEN
+    RETURN QUERY SELECT 0::bigint, TRUE;
+    RETURN;
+  END IF;
+
+  v_hi := LEAST(v_pos + batch_size, v_to);
+
+  DELETE FROM app_usage_events e
+  WHERE e.id > v_pos
+    AND e.id <= v_hi
+    AND e.occurred_at < v_cutoff;
+  GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+  UPDATE app_usage_event_retention_runs r
+  SET scan_position = v_hi,
+      deleted_count = r.deleted_count + v_deleted,
+      batches = r.batches + 1
+  WHERE r.id = run_id;
+
+  RETURN QUERY SELECT v_deleted, v_hi >= v_to;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.prune_app_usage_events_finish(
+  run_id BIGINT,
+  final_status TEXT DEFAULT 'completed',
+  error_message TEXT DEFAULT NULL
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_deleted BIGINT;
+  v_retain INTERVAL;
+BEGIN
+  UPDATE app_usage_event_retention_runs r
+  SET status = final_status,
+      error = error_message,
+      finished_at = TIMEZONE('utc', NOW())
+  WHERE r.id = run_id
+  RETURNING r.deleted_count, r.retain_interval INTO v_deleted, v_retain;
+  -- The dashboard's per-day session/actor sets follow the raw events out of the window.
+  IF final_status = 'completed' THEN
+    PERFORM analytics_prune_rollups(v_retain);
+  END IF;
+  RETURN v_deleted;
+END;
+$$;
+
+-- Whole run with a COMMIT after every batch, for pg_cron (CALL must be top level, so this is
+-- not callable over the REST API and cannot be SECURITY DEFINER).
+CREATE OR REPLACE PROCEDURE public.prune_app_usage_events_batched(
+  retain_interval INTERVAL DEFAULT INTERVAL '4 weeks',
+  batch_size INTEGER DEFAULT 5000,
+  pause_seconds DOUBLE PRECISION DEFAULT 0.2
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_run_id BIGINT;
+  v_done BOOLEAN := FALSE;
+  v_deleted BIGINT;
+BEGIN
+  v_run_id := public.prune_app_usage_events_start(retain_interval);
+  COMMIT;
+  WHILE NOT v_done LOOP
+    SELECT s.deleted_count, s.done INTO v_deleted, v_done
+    FROM public.prune_app_usage_events_step(v_run_id, batch_size) s;
+    COMMIT;
+    IF NOT v_done AND pause_seconds > 0 THEN
+      PERFORM pg_sleep(pause_seconds);
+    END IF;
+  END LOOP;
+  PERFORM public.prune_app_usage_events_finish(v_run_id);
+  COMMIT;
+END;
+$$;
+
+-- Maintenance entry points are for the service role / cron only.
+REVOKE EXECUTE ON FUNCTION public.app_usage_events_create_partition(DATE) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.app_usage_events_ensure_partitions(INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.app_usage_events_convert_to_partitioned(INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.prune_app_usage_events_start(INTERVAL, BOOLEAN) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.prune_app_usage_events_step(BIGINT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.prune_app_usage_events_finish(BIGINT, TEXT, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON PROCEDURE public.prune_app_usage_events_batched(INTERVAL, INTEGER, DOUBLE PRECISION) FROM PUBLIC, anon, authenticated;
+
+-- Swap the daily cron job to the batched procedure, and keep future partitions ready
+-- (a no-op until the table is converted).
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    BEGIN
+      PERFORM cron.unschedule('prune_app_usage_events_daily');
+    EXCEPTION
+      WHEN undefined_object THEN
+        NULL; -- job did not exist
+    END;
+
+    BEGIN
+      PERFORM cron.schedule(
+        'prune_app_usage_events_daily',
+        '15 3 * * *',
+        $job$CALL public.prune_app_usage_events_batched(INTERVAL '4 weeks');$job$
+      );
+      IF NOT EXISTS (
+        SELECT 1
+        FROM cron.job
+        WHERE jobname = 'app_usage_events_ensure_partitions'
+      ) THEN
+        PERFORM cron.schedule(
+          'app_usage_events_ensure_partitions',
+          '5 3 * * *',
+          $job$SELECT public.app_usage_events_ensure_partitions(7);$job$
+        );
+      END IF;
+    EXCEPTION
+      WHEN undefined_table THEN
+        RAISE NOTICE 'pg_cron job table not available; run tools/prune_usage_events.py on a schedule instead.';
+    END;
+  END IF;
+END;
+$$;
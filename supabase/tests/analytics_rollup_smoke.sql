@@ -0,0 +1,100 @@
+-- Smoke-check script for the incremental analytics rollups.
+-- Run in SQL editor (or psql against a local database) after migrations are applied.
+-- This script is transaction-wrapped and rolls back test rows.
+
+BEGIN;
+
+-- Flush anything already pending so the checks below only see the smoke rows.
+SELECT * FROM public.analytics_rollup_events(NULL, INTERVAL '0 seconds');
+
+CREATE TEMP TABLE smoke_before ON COMMIT DROP AS
+SELECT public.analytics_dashboard_json() AS dashboard;
+
+INSERT INTO public.app_usage_events (
+  event_name,
+  session_id,
+  user_id,
+  anon_id,
+  text_id,
+  mode,
+  section_path,
+  section_title,
+  duration_ms,
+  country_code,
+  occurred_at,
+  received_at,
+  properties
+)
+VALUES
+  ('surface_dwell', 'rollup_smoke_sess_1', NULL, 'rollup_smoke_actor_1', 'bodhicaryavatara', 'read',
+   NULL, NULL, 120000, 'GB',
+   TIMEZONE('utc', NOW()) - INTERVAL '10 minutes', TIMEZONE('utc', NOW()) - INTERVAL '10 minutes', '{}'::jsonb),
+  ('read_section_dwell', 'rollup_smoke_sess_1', NULL, 'rollup_smoke_actor_1', 'bodhicaryavatara', 'read',
+   '4.6.2.1.1.3', 'Smoke Section A', 90000, 'GB',
+   TIMEZONE('utc', NOW()) - INTERVAL '9 minutes', TIMEZONE('utc', NOW()) - INTERVAL '9 minutes', '{}'::jsonb),
+  ('quiz_attempt', 'rollup_smoke_sess_2', NULL, 'rollup_smoke_actor_2', 'bodhicaryavatara', 'quiz',
+   NULL, NULL, NULL, '',
+   TIMEZONE('utc', NOW()) - INTERVAL '8 minutes', TIMEZONE('utc', NOW()) - INTERVAL '8 minutes', '{}'::jsonb);
+
+-- Check #1: first run folds the three smoke rows; second run folds nothing.
+SELECT * FROM public.analytics_rollup_events(NULL, INTERVAL '0 seconds');
+SELECT * FROM public.analytics_rollup_events(NULL, INTERVAL '0 seconds');
+
+-- Check #2: dashboard totals moved by exactly the smoke rows
+-- (expect 3 events, 2 sessions, 2 anon users, 1 quiz attempt, 1 quiz session).
+SELECT
+  (a.dashboard #>> '{totals,total_events}')::int - (b.dashboard #>> '{totals,total_events}')::int
+    AS total_events_delta,
+  (a.dashboard #>> '{totals,unique_sessions}')::int - (b.dashboard #>> '{totals,unique_sessions}')::int
+    AS unique_sessions_delta,
+  (a.dashboard #>> '{totals,unique_anon_users}')::int - (b.dashboard #>> '{totals,unique_anon_users}')::int
+    AS unique_anon_users_delta,
+  (a.dashboard #>> '{quiz_summary,quiz_attempts}')::int - (b.dashboard #>> '{quiz_summary,quiz_attempts}')::int
+    AS quiz_attempts_delta,
+  (a.dashboard #>> '{quiz_summary,quiz_sessions}')::int - (b.dashboard #>> '{quiz_summary,quiz_sessions}')::int
+    AS quiz_sessions_delta
+FROM (SELECT public.analytics_dashboard_json() AS dashboard) a
+CROSS JOIN smoke_before b;
+
+-- Check #3: blank country is rolled up as Unknown, GB kept as-is.
+SELECT country_code, SUM(event_count) AS event_count
+FROM public.analytics_events_daily
+WHERE day_utc = (TIMEZONE('utc', NOW()) - INTERVAL '10 minutes')::date
+  AND text_id = 'bodhicaryavatara'
+  AND country_code IN ('GB', 'Unknown')
+GROUP BY country_code
+ORDER BY country_code;
+
+-- Check #4: section dwell rollup matches the read-section daily view for the smoke section.
+SELECT
+  r.total_dwell_ms / 1000.0 AS rollup_dwell_seconds,
+  v.total_dwell_seconds AS view_dwell_seconds
+FROM public.analytics_section_dwell_daily r
+JOIN public.analytics_read_section_dwell_daily_v1 v
+  ON v.day_utc = r.day_utc
+ AND v.text_id = r.text_id
+ AND v.mode = r.mode
+ AND v.section_path = r.section_path
+WHERE r.text_id = 'bodhicaryavatara'
+  AND r.section_path = '4.6.2.1.1.3'
+  AND r.day_utc = (TIMEZONE('utc', NOW()) - INTERVAL '9 minutes')::date;
+
+-- Check #5: sessions and actors are kept per day (expect 2 session rows, 2 actor rows).
+SELECT
+  (SELECT COUNT(*) FROM public.analytics_sessions_daily WHERE session_id LIKE 'rollup_smoke_sess_%') AS session_days,
+  (SELECT COUNT(*) FROM public.analytics_actors_daily WHERE actor_id LIKE 'rollup_smoke_actor_%') AS actor_days;
+
+-- Check #6: pruning with a window ending tomorrow drops today's sets but not the count tables
+-- (expect session_days = 0, events_daily_rows > 0).
+SELECT public.analytics_prune_rollups(INTERVAL '-1 day') > 0 AS pruned;
+SELECT
+  (SELECT COUNT(*) FROM public.analytics_sessions_daily WHERE session_id LIKE 'rollup_smoke_sess_%') AS session_days,
+  (SELECT COUNT(*) FROM public.analytics_events_daily WHERE text_id = 'bodhicaryavatara') AS events_daily_rows;
+
+-- Check #7: watermark advanced to the newest smoke row.
+SELECT
+  s.last_event_id = (SELECT MAX(id) FROM public.app_usage_events) AS watermark_at_head
+FROM public.analytics_rollup_state s
+WHERE s.name = 'app_usage_events';
+
+ROLLBACK;
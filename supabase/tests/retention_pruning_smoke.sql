@@ -0,0 +1,64 @@
+-- Smoke-check script for batched / partition-aware retention pruning.
+-- Run with psql against a local database after migrations are applied.
+-- This script is transaction-wrapped (DDL included) and rolls everything back.
+
+BEGIN;
+
+INSERT INTO public.app_usage_events (event_name, session_id, anon_id, text_id, mode, occurred_at, properties)
+SELECT
+  'surface_dwell',
+  'prune_smoke_sess_' || g,
+  'prune_smoke_actor',
+  'bodhicaryavatara',
+  'read',
+  TIMEZONE('utc', NOW()) - (g || ' days')::interval,
+  '{}'::jsonb
+FROM generate_series(1, 40) g;
+
+-- Check #1: batched delete on the unpartitioned table removes the 12 smoke rows older than
+-- 4 weeks (days 29..40) in several bounded steps and records the run.
+SELECT public.prune_app_usage_events_start(INTERVAL '4 weeks') AS run_id \gset
+SELECT * FROM public.prune_app_usage_events_step(:run_id, 5);
+SELECT * FROM public.prune_app_usage_events_step(:run_id, 1000000);
+SELECT public.prune_app_usage_events_finish(:run_id) AS deleted_count;
+
+SELECT method, status, batches, deleted_count >= 12 AS removed_smoke_rows
+FROM public.app_usage_event_retention_runs
+WHERE id = :run_id;
+
+SELECT COUNT(*) AS smoke_rows_left_expect_28
+FROM public.app_usage_events
+WHERE session_id LIKE 'prune_smoke_sess_%';
+
+-- Check #2: convert to daily partitions; rows, ids and dependent views survive.
+SELECT MAX(id) AS max_id_before FROM public.app_usage_events \gset
+SELECT * FROM public.app_usage_events_convert_to_partitioned(7);
+SELECT public.app_usage_events_is_partitioned() AS is_partitioned;
+
+SELECT COUNT(*) AS smoke_rows_after_convert_expect_28
+FROM public.app_usage_events
+WHERE session_id LIKE 'prune_smoke_sess_%';
+
+INSERT INTO public.app_usage_events (event_name, session_id, anon_id, properties)
+VALUES ('text_opened', 'prune_smoke_sess_new', 'prune_smoke_actor', '{}'::jsonb)
+RETURNING id > :max_id_before AS id_continues_sequence;
+
+SELECT COUNT(*) AS dwell_view_rows
+FROM public.analytics_text_dwell_daily_v1
+WHERE text_id = 'bodhicaryavatara';
+
+-- Check #3: with a 1-week retention the old daily partitions are dropped whole.
+SELECT public.prune_app_usage_events_start(INTERVAL '7 days') AS part_run_id \gset
+SELECT * FROM public.prune_app_usage_events_step(:part_run_id, 1000000);
+SELECT public.prune_app_usage_events_finish(:part_run_id);
+
+SELECT method, status, dropped_partitions > 0 AS dropped_partitions, deleted_count
+FROM public.app_usage_event_retention_runs
+WHERE id = :part_run_id;
+
+SELECT COUNT(*) AS smoke_rows_older_than_week_expect_0
+FROM public.app_usage_events
+WHERE session_id LIKE 'prune_smoke_sess_%'
+  AND occurred_at < TIMEZONE('utc', NOW()) - INTERVAL '7 days';
+
+ROLLBACK;
@@ -0,0 +1,43 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:dechen_study/services/breadcrumb_summary_service.dart';
+
+void main() {
+  setUpAll(() {
+    TestWidgetsFlutterBinding.ensureInitialized();
+  });
+
+  final service = BreadcrumbSummaryService.instance;
+
+  group('BreadcrumbSummaryService', () {
+    test('summariesForChain returns the path and its ancestors', () async {
+      final chain =
+          await service.summariesForChain('bodhicaryavatara', '4.1.2');
+      expect(chain.keys, containsAll(<String>['4.1.2', '4.1', '4']));
+      expect(chain['4.1.2'], contains('Concern for the training'));
+    });
+
+    test('packed summaries match breadcrumb_summaries.json', () async {
+      final source = json.decode(
+        File('texts/bodhicaryavatara/breadcrumb_summaries.json')
+            .readAsStringSync(),
+      ) as Map<String, dynamic>;
+      for (final path in ['1', '1.1', '3.2.2.1.2', '4.1.2']) {
+        final chain =
+            await service.summariesForChain('bodhicaryavatara', path);
+        expect(chain[path], (source[path] as String).trim(),
+            reason: 'Re-run tools/pack_breadcrumb_summaries.py');
+      }
+    });
+
+    test('summariesForChain is empty for unknown or empty paths', () async {
+      expect(await service.summariesForChain('bodhicaryavatara', ''), isEmpty);
+      expect(await service.summariesForChain('notatext', '1.1'), isEmpty);
+      expect(await service.summariesForChain('bodhicaryavatara', '99.99'),
+          isEmpty);
+    });
+  });
+}
@@ -0,0 +1,62 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:dechen_study/services/commentary_service.dart';
+import 'package:dechen_study/services/daily_verse_picker_service.dart';
+import 'package:flutter_test/flutter_test.dart';
+
+/// Cross-checks texts/daily_schedule.json (tools/build_daily_schedule.py)
+/// against the Dart picking algorithm it precomputes.
+void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  final service = DailyVersePickerService.instance;
+  final schedule = json.decode(
+    File(DailyVersePickerService.dailySchedulePath).readAsStringSync(),
+  ) as Map<String, dynamic>;
+  final texts = (schedule['texts'] as List).cast<String>();
+  final picks = (schedule['picks'] as List).cast<List>();
+  final start = DateTime.parse(schedule['start'] as String);
+
+  DateTime dayAt(int offset) =>
+      DateTime(start.year, start.month, start.day + offset);
+
+  test('schedule section counts match the parsed commentary', () async {
+    final sections = schedule['sections'] as Map<String, dynamic>;
+    for (final textId in texts) {
+      final count = await CommentaryService.instance.getSectionCount(textId);
+      expect(
+        (sections[textId] as Map<String, dynamic>)['section_count'],
+        count,
+        reason: 'Regenerate with tools/build_daily_schedule.py',
+      );
+    }
+  });
+
+  test('every row has one section pick per text', () {
+    for (final row in picks) {
+      expect(row.length, texts.length);
+    }
+  });
+
+  test('scheduled sections match the commentary-derived pick', () async {
+    for (var day = 0; day < 30; day++) {
+      for (final textId in texts) {
+        final scheduled = await service.pickDailySection(textId, dayAt(day));
+        final computed =
+            await service.pickDailySectionFromCommentary(textId, dayAt(day));
+        expect(scheduled?.refsInBlock, computed?.refsInBlock,
+            reason: '${dayAt(day)} $textId');
+      }
+    }
+  });
+
+  test('dates outside the schedule fall back to the commentary', () async {
+    final before = dayAt(-1);
+    final picked = await service.pickDailySection('bodhicaryavatara', before);
+    final computed = await service.pickDailySectionFromCommentary(
+        'bodhicaryavatara', before);
+    expect(picked?.refsInBlock, computed?.refsInBlock);
+    expect(picked?.commentaryText, computed?.commentaryText);
+  });
+}
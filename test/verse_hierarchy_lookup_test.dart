@@ -0,0 +1,126 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:dechen_study/config/study_text_config.dart';
+import 'package:dechen_study/services/verse_hierarchy_service.dart';
+import 'package:flutter_test/flutter_test.dart';
+
+/// Cross-checks the lookup tables script/rebuild_verse_indices.py writes into
+/// each verse_hierarchy_map.json against what VerseHierarchyService would
+/// compute from the sections tree without them.
+void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  final service = VerseHierarchyService.instance;
+  final texts = studyTextRegistry.where((c) => c.hierarchyPath.isNotEmpty);
+  const reason = 'Regenerate with script/rebuild_verse_indices.py';
+
+  setUpAll(() async {
+    for (final text in texts) {
+      await service.preload(text.textId);
+    }
+  });
+
+  for (final text in texts) {
+    final textId = text.textId;
+    final map = json.decode(File(text.hierarchyPath).readAsStringSync())
+        as Map<String, dynamic>;
+
+    group(textId, () {
+      test('asset carries every lookup table', () {
+        for (final key in [
+          'verseToSegments',
+          'sectionToOwnRefs',
+          'sectionToTreeRefs',
+          'sectionToVerseRange',
+          'navigableSections',
+        ]) {
+          expect(map.containsKey(key), isTrue, reason: '$key missing. $reason');
+        }
+      });
+
+      test('verseToSegments lists every segment ref of a base ref', () {
+        final pattern = RegExp(r'^(\d+\.\d+)[a-z]+$', caseSensitive: false);
+        final expected = <String, Set<String>>{};
+        for (final ref in (map['verseToPath'] as Map).keys) {
+          final m = pattern.firstMatch(ref as String);
+          if (m != null) (expected[m.group(1)!] ??= {}).add(ref);
+        }
+        final table = (map['verseToSegments'] as Map).map(
+            (k, v) => MapEntry(k as String, (v as List).cast<String>()));
+        expect(table.map((k, v) => MapEntry(k, v.toSet())), expected,
+            reason: reason);
+        for (final refs in table.values) {
+          final sorted = [...refs]..sort((a, b) {
+              final c = VerseHierarchyService.compareVerseRefs(a, b);
+              return c != 0 ? c : a.compareTo(b);
+            });
+          expect(refs, sorted);
+        }
+      });
+
+      test('sectionToOwnRefs matches the sections tree', () {
+        final expected = <String, Set<String>>{};
+        void visit(dynamic node) {
+          if (node is! Map) return;
+          final path = (node['path'] ?? '').toString();
+          for (final v in (node['verses'] as List?) ?? const []) {
+            if (path.isNotEmpty) (expected[path] ??= {}).add(v.toString());
+          }
+          for (final c in (node['children'] as List?) ?? const []) {
+            visit(c);
+          }
+        }
+
+        for (final s in map['sections'] as List) {
+          visit(s);
+        }
+        final table = (map['sectionToOwnRefs'] as Map).map(
+            (k, v) => MapEntry(k as String, (v as List).cast<String>().toSet()));
+        expect(table, expected, reason: reason);
+      });
+
+      test('tree refs match the own-refs scan', () {
+        for (final section in service.getFlatSectionsSync(textId)) {
+          expect(
+            service.getTreeVerseRefsForSectionSync(textId, section.path),
+            service.computeTreeVerseRefsForSectionSync(textId, section.path),
+            reason: '${section.path}. $reason',
+          );
+        }
+      });
+
+      test('verse ranges match the computed ranges', () {
+        expect(
+          service.getSectionVerseRangeMapSync(textId),
+          service.computeSectionVerseRangeMapSync(textId),
+          reason: reason,
+        );
+      });
+
+      test('navigable sections match the tree walk', () {
+        final computed = service.computeNavigableSectionsSync(textId);
+        final leaves = service.getLeafSectionsByVerseOrderSync(textId);
+        expect(
+          {for (final e in leaves) e.path: (e.title, e.depth)},
+          {for (final e in computed) e.path: (e.title, e.depth)},
+          reason: reason,
+        );
+        for (final e in computed) {
+          expect(service.getFirstVerseForSectionSync(textId, e.path),
+              e.firstRef,
+              reason: '${e.path}. $reason');
+        }
+        for (var i = 1; i < leaves.length; i++) {
+          final prev = service.getFirstVerseForSectionSync(
+              textId, leaves[i - 1].path)!;
+          final cur =
+              service.getFirstVerseForSectionSync(textId, leaves[i].path)!;
+          expect(VerseHierarchyService.compareVerseRefs(prev, cur),
+              lessThanOrEqualTo(0),
+              reason: '${leaves[i - 1].path} -> ${leaves[i].path}');
+        }
+      });
+    });
+  }
+}
@@ -4,15 +4,34 @@ Script to add Chapter 10 to verse_commentary_mapping.txt
 """
 
 import re
+import sys
+from pathlib import Path
+
+from line_index import LineIndex
+from verse_alignment import CHAPTER_RE, ChapterAligner
+
+ROOT = Path(__file__).resolve().parent.parent
+TEXT_DIR = ROOT / "texts" / "bodhicaryavatara"
+BCV_ROOT = TEXT_DIR / "bcv-root"
+COMMENTARY = TEXT_DIR / "commentary.txt"
+MAPPING = TEXT_DIR / "verse_commentary_mapping.txt"
 
 def main():
-    # Read root verses from bcv-root
-    with open('/Users/aosulliv/projects2/dechen_study/texts/bcv-root', 'r', encoding='utf-8') as f:
-        root_lines = [l.rstrip() for l in f.readlines()[4299:4588]]
+    # Read root verses from bcv-root (chapter 10 starts after the last [9.x] ref)
+    with LineIndex(BCV_ROOT) as idx:
+        last_9 = idx.search_last(rb"\[9\.\d+\]")
+        if last_9 is None:
+            sys.exit(f"No [9.x] verse ref in {BCV_ROOT}; cannot tell where chapter 10 starts")
+        start = last_9 + 1
+        root_lines = [l.rstrip() for l in idx.lines(start, len(idx))]
     
-    # Read commentary
-    with open('/Users/aosulliv/projects2/dechen_study/texts/commentary.txt', 'r', encoding='utf-8') as f:
-        commentary_lines = [l.rstrip() for l in f.readlines()[8494:8968]]
+    # Read commentary (from the first 10.x verse line to the end)
+    with LineIndex(COMMENTARY) as idx:
+        span = idx.chapter_span(10)
+        if span is None:
+            sys.exit(f"No 10.x verse line in {COMMENTARY}")
+        start, stop = span
+        commentary_lines = [l.rstrip() for l in idx.lines(start, stop)]
     
     # Parse root verses - verse numbers are at the END of each verse
     root_verses = {}
@@ -30,17 +49,16 @@ def main():
             if current_verse_text:
                 root_verses[verse_num] = current_verse_text.copy()
             current_verse_text = []
-        elif line.strip() and not line.startswith('Chapter'):
+        elif line.strip() and not CHAPTER_RE.match(line.strip()):
             current_verse_text.append(line)
     
-    # Build normalized verse text sets for comparison
-    verse_text_sets = {}
-    for verse_num, lines in root_verses.items():
-        verse_text_sets[verse_num] = [l.strip().lower() for l in lines if l.strip()]
+    # Lines of the commentary that quote a root verse, aligned once per verse anchor
+    decisions = ChapterAligner(root_verses).align(commentary_lines)
+    quoted_root_lines = {d.line for d in decisions if d.is_root}
     
     # Parse commentary and build output
     output_lines = []
-    output_lines.append("Chapter 10: Dedication")
+    output_lines.append(">>> Chapter 10: Dedication")
     output_lines.append("")
     
     i = 0
@@ -62,8 +80,6 @@ def main():
             # Collect commentary, skipping verse text
             i += 1
             commentary_text = []
-            verse_lines_skipped = 0
-            verse_text_to_skip = verse_text_sets.get(verse_num, [])
             
             while i < len(commentary_lines):
                 next_line = commentary_lines[i]
@@ -81,13 +97,10 @@ def main():
                     i += 1
                     continue
                 
-                # Skip verse text lines that match root verse (they appear right after verse number)
-                if verse_lines_skipped < len(verse_text_to_skip):
-                    line_lower = next_line.strip().lower()
-                    if line_lower in verse_text_to_skip:
-                        verse_lines_skipped += 1
-                        i += 1
-                        continue
+                # Skip the quoted root verse (it is re-added above with >>>)
+                if i in quoted_root_lines:
+                    i += 1
+                    continue
                 
                 if next_line.strip():
                     commentary_text.append(next_line)
@@ -106,39 +119,33 @@ def main():
         i += 1
     
     # Read existing file and remove old Chapter 10
-    with open('/Users/aosulliv/projects2/dechen_study/texts/verse_commentary_mapping.txt', 'r', encoding='utf-8') as f:
+    with open(MAPPING, 'r', encoding='utf-8') as f:
         existing_content = f.read()
     
-    # Find and remove old Chapter 10
+    # Find and remove old Chapter 10 (headings are written ">>> Chapter N: ...")
     lines = existing_content.split('\n')
     new_lines = []
     skip = False
     
-    for i, line in enumerate(lines):
-        if line.strip() == "Chapter 10: Dedication":
-            skip = True
-            continue
-        if skip:
-            # Check if we've hit a new chapter
-            if line.strip().startswith("Chapter ") and "Chapter 10" not in line:
-                skip = False
-                new_lines.append(line)
-            elif not skip:
-                new_lines.append(line)
-        else:
+    for line in lines:
+        chapter_match = CHAPTER_RE.match(line.strip())
+        if chapter_match:
+            skip = int(chapter_match.group(1)) == 10
+        if not skip:
             new_lines.append(line)
     
     # Add new Chapter 10
     new_lines.extend(output_lines)
     
     # Write back
-    with open('/Users/aosulliv/projects2/dechen_study/texts/verse_commentary_mapping.txt', 'w', encoding='utf-8') as f:
+    with open(MAPPING, 'w', encoding='utf-8') as f:
         f.write('\n'.join(new_lines))
         if not new_lines[-1]:  # Add final newline if not present
             f.write('\n')
     
     print(f"Updated Chapter 10 in verse_commentary_mapping.txt")
-    print(f"Processed {len([l for l in output_lines if re.match(r'^\d+\.\d+$', l)])} verses")
+    verse_count = len([l for l in output_lines if re.match(r'^\d+\.\d+$', l)])
+    print(f"Processed {verse_count} verses")
 
 if __name__ == '__main__':
     main()
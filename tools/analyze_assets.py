@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Map the texts/ assets bundled in pubspec.yaml to the Dart code that loads
+them, measure how much they repeat each other, and propose a smaller set.
+
+Loaders are found statically in lib/: a file that calls TextAssetLoader or
+rootBundle loads an asset when it holds a matching string literal
+('texts/$textId/breadcrumb_summaries_index.json' matches every text), or
+reads a StudyTextConfig field (.hierarchyPath, .quizBeginnerPath, ...) that
+lib/config/study_text_config.dart sets to the asset's path. A literal whose
+file name is itself interpolated ('texts/$textId/$blobName') resolves to the
+sibling assets named by a JSON asset the same file loads.
+
+Redundancy is measured on normalized lines (JSON string values split into
+lines, verse-ref tags dropped, case and whitespace folded). A line counts as
+shared when another bundled asset has it too; shared lines are split into
+verse text (a line of some *_parsed.json), section titles (a title in some
+verse_hierarchy_map.json) and other. Inside a JSON asset, strings repeated
+verbatim (breadcrumb titles in verseToPath, for one) are counted as well.
+
+Each asset is sized raw, minified (as tools/bundle_web_assets.py ships it),
+gzip and brotli (pip install brotli), with an estimated first-load transfer
+and decode time on a reference device profile. The minimized set keeps
+every asset some loader reads (plus --keep); the rest only feed the tools.
+
+    python3 tools/analyze_assets.py
+    python3 tools/analyze_assets.py --profile low-end-android --json > asset_report.json
+    python3 tools/analyze_assets.py --apply
+"""
+import argparse
+import json
+import re
+import sys
+import unicodedata
+
+from bundle_web_assets import gzip_bytes, minify
+from text_assets import PUBSPEC, ROOT, pubspec_text_assets
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip sizes are reported.
+    brotli = None
+
+LIB_DIR = ROOT / "lib"
+CONFIG_DART = LIB_DIR / "config" / "study_text_config.dart"
+
+LOADER_CALL_RE = re.compile(r"\b(?:TextAssetLoader|rootBundle)\.load\w*\(")
+DART_STRING_RE = re.compile(r"""'((?:[^'\\\n]|\\.)*)'|"((?:[^"\\\n]|\\.)*)\"""")
+INTERPOLATION_RE = re.compile(r"\$\{[^}]*\}|\$\w+")
+CONFIG_FIELD_RE = re.compile(r"\b(\w+Path):\s*'(texts/[^']+)'")
+CLASS_RE = re.compile(r"^class\s+(\w+)", re.MULTILINE)
+REF_TAG_RE = re.compile(r"^\s*\[[^\]]*\]\s*")
+# Section paths and verse refs ("2.3.2.2.3.1", "1.119abc") repeat everywhere
+# by design; they are keys, not content.
+KEY_LIKE_RE = re.compile(r"^[0-9a-d.,\- ]+$")
+MIN_LINE = 12
+
+# Rough throughputs for a Flutter release build, in MB/s of minified asset
+# bytes (json: jsonDecode; text: UTF-8 decode and line split; binary: kept as
+# bytes), plus gzip inflate and the network. Reference points for comparing
+# assets with each other, not measurements of any one device.
+PROFILES = {
+    "midrange-android": {"json": 25.0, "text": 120.0, "binary": 800.0, "inflate": 90.0, "network_mbps": 10.0},
+    "low-end-android": {"json": 8.0, "text": 40.0, "binary": 300.0, "inflate": 30.0, "network_mbps": 1.6},
+    "desktop-web": {"json": 80.0, "text": 400.0, "binary": 2000.0, "inflate": 300.0, "network_mbps": 50.0},
+}
+DEFAULT_PROFILE = "midrange-android"
+
+
+def dart_strings(source):
+    for m in DART_STRING_RE.finditer(source):
+        yield m.group(1) if m.group(1) is not None else m.group(2)
+
+
+def literal_pattern(literal):
+    """Regex for the asset paths a Dart string literal can produce; None if it names no texts/ path."""
+    if not literal.startswith("texts/"):
+        return None
+    parts, last = [], 0
+    for m in INTERPOLATION_RE.finditer(literal):
+        parts.append(re.escape(literal[last:m.start()]))
+        parts.append("[^/]+")
+        last = m.end()
+    parts.append(re.escape(literal[last:]))
+    return "".join(parts)
+
+
+def config_fields():
+    """StudyTextConfig field name -> asset paths it is set to."""
+    fields = {}
+    for m in CONFIG_FIELD_RE.finditer(CONFIG_DART.read_text(encoding="utf-8")):
+        fields.setdefault(m.group(1), set()).add(m.group(2))
+    return fields
+
+
+def find_loaders(assets):
+    """asset path -> {lib-relative loader file: how it reaches the asset}."""
+    fields = config_fields()
+    loaders = {a: {} for a in assets}
+    indirect = []
+    for dart in sorted(LIB_DIR.rglob("*.dart")):
+        source = dart.read_text(encoding="utf-8")
+        call = LOADER_CALL_RE.search(source)
+        if not call:
+            continue
+        rel = dart.relative_to(ROOT).as_posix()
+        classes = CLASS_RE.findall(source, 0, call.start())
+        label = f"{rel} ({classes[-1]})" if classes else rel
+        for literal in dart_strings(source):
+            pattern = literal_pattern(literal)
+            if pattern is None:
+                continue
+            if pattern.endswith("/[^/]+"):
+                indirect.append((label, re.compile(pattern[: -len("/[^/]+")] + "$")))
+                continue
+            regex = re.compile(pattern + "$")
+            for asset in assets:
+                if regex.match(asset):
+                    loaders[asset].setdefault(label, f"'{literal}'")
+        for field, paths in fields.items():
+            if re.search(r"\.\s*" + field + r"\b", source):
+                for asset in paths & set(assets):
+                    loaders[asset].setdefault(label, f"StudyTextConfig.{field}")
+
+    # 'texts/$textId/$blobName': the name comes from a JSON asset the same file loads.
+    for label, dir_regex in indirect:
+        for asset, by in loaders.items():
+            if label not in by or not asset.endswith(".json"):
+                continue
+            parent = asset.rpartition("/")[0]
+            if not dir_regex.match(parent):
+                continue
+            data = json.loads((ROOT / asset).read_text(encoding="utf-8"))
+            names = [v for v in data.values() if isinstance(v, str)] if isinstance(data, dict) else []
+            for name in names:
+                sibling = f"{parent}/{name}"
+                if sibling in loaders:
+                    loaders[sibling].setdefault(label, f"named by {asset.rpartition('/')[2]}")
+    return loaders
+
+
+def norm_line(line):
+    line = unicodedata.normalize("NFKC", REF_TAG_RE.sub("", line))
+    line = line.replace("’", "'").replace("‘", "'").replace("“", '"').replace("”", '"')
+    return " ".join(line.split()).casefold()
+
+
+def json_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            yield k
+            yield from json_strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from json_strings(v)
+
+
+class Asset:
+    """One bundled file: sizes plus the normalized lines it carries."""
+
+    def __init__(self, path):
+        self.path = path
+        self.raw = (ROOT / path).read_bytes()
+        self.minified = minify(path, self.raw)
+        self.gzip = len(gzip_bytes(self.minified))
+        self.brotli = len(brotli.compress(self.minified, quality=11)) if brotli is not None else None
+        self.kind = "json" if path.endswith(".json") else "binary" if path.endswith(".bin") else "text"
+        self.data = json.loads(self.raw.decode("utf-8")) if self.kind == "json" else None
+
+        if self.data is not None:
+            strings = list(json_strings(self.data))
+            text_lines = [line for s in strings for line in s.splitlines()]
+        else:
+            strings = []
+            text_lines = self.raw.decode("utf-8", errors="replace").splitlines()
+        self.lines = {}
+        for line in text_lines:
+            n = norm_line(line)
+            if len(n) >= MIN_LINE and not KEY_LIKE_RE.match(n):
+                self.lines[n] = self.lines.get(n, 0) + 1
+        self.line_bytes = sum(len(n.encode("utf-8")) * c for n, c in self.lines.items())
+
+        seen, repeated = {}, 0
+        for s in strings:
+            if len(s) >= MIN_LINE and not KEY_LIKE_RE.match(s):
+                seen[s] = seen.get(s, 0) + 1
+        for s, count in seen.items():
+            if count > 1:
+                repeated += len(s.encode("utf-8")) * (count - 1)
+        self.repeated_strings = repeated
+
+    def estimate_ms(self, profile):
+        """(transfer ms, decode ms) for a first load: compressed bytes over the network, then inflate + decode."""
+        wire = self.brotli if self.brotli is not None else self.gzip
+        transfer = wire * 8 / (profile["network_mbps"] * 1e6) * 1e3
+        inflate = len(self.minified) / (profile["inflate"] * 1e6) * 1e3
+        decode = len(self.minified) / (profile[self.kind] * 1e6) * 1e3
+        return transfer, inflate + decode
+
+
+def classify_lines(assets):
+    verse, titles = set(), set()
+    for a in assets.values():
+        name = a.path.rpartition("/")[2]
+        if name.endswith("_parsed.json") and isinstance(a.data, dict):
+            for v in a.data.get("verses") or []:
+                verse.update(norm_line(line) for line in str(v).splitlines())
+        elif name == "verse_hierarchy_map.json" and isinstance(a.data, dict):
+            stack = list(a.data.get("sections") or [])
+            while stack:
+                node = stack.pop()
+                if isinstance(node, dict):
+                    titles.add(norm_line(str(node.get("title") or "")))
+                    stack.extend(node.get("children") or [])
+    return verse, titles
+
+
+def redundancy(assets):
+    """Per-asset shared-line bytes by category, and the pairwise shared bytes."""
+    verse, titles = classify_lines(assets)
+    holders = {}
+    for a in assets.values():
+        for line in a.lines:
+            holders.setdefault(line, []).append(a.path)
+
+    shared = {p: {"verse": 0, "title": 0, "other": 0} for p in assets}
+    pairs = {}
+    for line, paths in holders.items():
+        if len(paths) < 2:
+            continue
+        size = len(line.encode("utf-8"))
+        category = "verse" if line in verse else "title" if line in titles else "other"
+        for p in paths:
+            shared[p][category] += size * assets[p].lines[line]
+        for i, a in enumerate(paths):
+            for b in paths[i + 1:]:
+                pairs[(a, b)] = pairs.get((a, b), 0) + size
+    return shared, pairs
+
+
+def coverage(assets, pairs, a, b):
+    """Share of [a]'s distinct line bytes that [b] also carries."""
+    total = sum(len(n.encode("utf-8")) for n in assets[a].lines)
+    both = pairs.get((a, b)) or pairs.get((b, a)) or 0
+    return both / total if total else 0.0
+
+
+def analyze(profile_name, keep):
+    profile = PROFILES[profile_name]
+    paths = [p for p in pubspec_text_assets() if (ROOT / p).exists()]
+    missing = [p for p in pubspec_text_assets() if not (ROOT / p).exists()]
+    assets = {p: Asset(p) for p in paths}
+    loaders = find_loaders(paths)
+    shared, pairs = redundancy(assets)
+
+    rows = []
+    for p, a in assets.items():
+        transfer, decode = a.estimate_ms(profile)
+        partner = max(
+            (q for q in assets if q != p), key=lambda q: coverage(assets, pairs, p, q), default=None
+        )
+        rows.append({
+            "asset": p,
+            "loaded_by": loaders[p],
+            "raw": len(a.raw),
+            "minified": len(a.minified),
+            "gzip": a.gzip,
+            **({"br": a.brotli} if a.brotli is not None else {}),
+            "transfer_ms": round(transfer, 1),
+            "decode_ms": round(decode, 1),
+            "shared_bytes": shared[p],
+            "repeated_string_bytes": a.repeated_strings,
+            "most_covered_by": (
+                {"asset": partner, "share": round(coverage(assets, pairs, p, partner), 3)}
+                if partner and coverage(assets, pairs, p, partner) > 0 else None
+            ),
+        })
+
+    keep = set(keep)
+    dropped = [r["asset"] for r in rows if not r["loaded_by"] and r["asset"] not in keep]
+    minimized = [r["asset"] for r in rows if r["asset"] not in dropped]
+    consolidate = [
+        {"asset": r["asset"], "covered_by": r["most_covered_by"]["asset"], "share": r["most_covered_by"]["share"]}
+        for r in rows
+        if r["asset"] in minimized and r["most_covered_by"] and r["most_covered_by"]["share"] >= 0.5
+        and r["most_covered_by"]["asset"] in minimized
+    ]
+
+    def totals(selected):
+        chosen = [r for r in rows if r["asset"] in selected]
+        out = {k: sum(r[k] for r in chosen) for k in ("raw", "minified", "gzip", "transfer_ms", "decode_ms")}
+        if brotli is not None:
+            out["br"] = sum(r["br"] for r in chosen)
+        out["transfer_ms"] = round(out["transfer_ms"], 1)
+        out["decode_ms"] = round(out["decode_ms"], 1)
+        return out
+
+    return {
+        "profile": {"name": profile_name, **profile},
+        "assets": rows,
+        "missing": missing,
+        "dropped": dropped,
+        "minimized": minimized,
+        "consolidation_candidates": consolidate,
+        "totals": {"bundled": totals(set(paths)), "minimized": totals(set(minimized))},
+    }
+
+
+def kib(n):
+    return f"{n / 1024:,.1f}K"
+
+
+def print_report(report):
+    prof = report["profile"]
+    print(f"profile {prof['name']}: json {prof['json']} MB/s, text {prof['text']} MB/s, "
+          f"inflate {prof['inflate']} MB/s, network {prof['network_mbps']} Mbit/s")
+    has_br = any("br" in r for r in report["assets"])
+    header = f"{'asset':<56} {'raw':>9} {'min':>9} {'gzip':>8}" + (f" {'br':>8}" if has_br else "") \
+        + f" {'xfer ms':>8} {'dec ms':>7} {'shared':>8} {'repeat':>8}"
+    print(header)
+    for r in report["assets"]:
+        shared = sum(r["shared_bytes"].values())
+        print(f"{r['asset']:<56} {kib(r['raw']):>9} {kib(r['minified']):>9} {kib(r['gzip']):>8}"
+              + (f" {kib(r['br']):>8}" if has_br else "")
+              + f" {r['transfer_ms']:>8.1f} {r['decode_ms']:>7.1f} {kib(shared):>8} {kib(r['repeated_string_bytes']):>8}")
+
+    print("\nloaders:")
+    for r in report["assets"]:
+        if r["loaded_by"]:
+            via = "; ".join(f"{f} via {how}" for f, how in r["loaded_by"].items())
+            print(f"  {r['asset']}: {via}")
+        else:
+            print(f"  {r['asset']}: no loader in lib/")
+
+    print("\nredundancy (shared with other bundled assets; verse / title / other):")
+    for r in sorted(report["assets"], key=lambda r: -sum(r["shared_bytes"].values())):
+        s = r["shared_bytes"]
+        if not sum(s.values()):
+            continue
+        cover = r["most_covered_by"]
+        note = f"  {cover['share']:.0%} of its lines are in {cover['asset']}" if cover else ""
+        print(f"  {r['asset']}: {kib(s['verse'])} / {kib(s['title'])} / {kib(s['other'])}{note}")
+
+    for p in report["missing"]:
+        print(f"\nwarning: {p} is listed in pubspec.yaml but does not exist")
+    if report["consolidation_candidates"]:
+        print("\nloaded assets mostly repeated by another loaded asset:")
+        for c in report["consolidation_candidates"]:
+            print(f"  {c['asset']}: {c['share']:.0%} covered by {c['covered_by']}")
+
+    print("\nminimized set drops:" if report["dropped"] else "\nminimized set: every bundled asset has a loader")
+    for p in report["dropped"]:
+        print(f"  - {p}")
+    b, m = report["totals"]["bundled"], report["totals"]["minimized"]
+    for label, t in (("bundled", b), ("minimized", m)):
+        print(f"{label:>10}: raw {kib(t['raw'])}, minified {kib(t['minified'])}, gzip {kib(t['gzip'])}"
+              + (f", br {kib(t['br'])}" if "br" in t else "")
+              + f", transfer {t['transfer_ms']:.0f} ms, decode {t['decode_ms']:.0f} ms")
+
+
+def apply_minimized(dropped):
+    """Remove the [dropped] entries from pubspec.yaml's flutter.assets list."""
+    drop = set(dropped)
+    lines = PUBSPEC.read_text(encoding="utf-8").splitlines(keepends=True)
+    kept = [line for line in lines if line.strip().removeprefix("- ").strip() not in drop]
+    PUBSPEC.write_text("".join(kept), encoding="utf-8")
+    return len(lines) - len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze bundled texts/ assets: loaders, redundancy, size, decode cost.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help=f"reference device profile (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--keep", action="append", default=[], metavar="ASSET",
+                        help="keep ASSET in the minimized set even without a loader (repeatable)")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="print the full report as JSON")
+    output.add_argument("--apply", action="store_true", help="remove the dropped assets from pubspec.yaml")
+    args = parser.parse_args()
+
+    report = analyze(args.profile, args.keep)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    print_report(report)
+    if args.apply and report["dropped"]:
+        removed = apply_minimized(report["dropped"])
+        print(f"\nremoved {removed} entries from {PUBSPEC.relative_to(ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
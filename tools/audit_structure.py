@@ -0,0 +1,745 @@
+#!/usr/bin/env python3
+"""Single-parse structure audit for every text under texts/.
+
+Each text's verse_hierarchy_map.json, verse_commentary_mapping.txt and (when
+present) overviews_pages_eos.txt are read once into a TextModel. Derived
+indexes (document order, heading assignments, leaves, ...) are computed lazily
+and shared, and every check runs against them as a registered rule:
+
+  consecutive_sections   sections whose verses are interrupted, in document
+                         order, by verses of another section
+                         (was tools/validate_consecutive.py)
+  verse_number_gaps      section verse lists with gaps in verse numbers
+                         (was tools/check_consecutive_verses.dart)
+  empty_leaves           classification of leaf sections with no verses
+                         (was tools/audit_empty_leaves.js)
+  line_sections          verse lines whose JSON section disagrees with the
+                         closest mapping heading
+                         (was tools/compare_line_section_mappings.js)
+  overview_titles        overview vs mapping heading title mismatches
+                         (was tools/audit_section_mismatches.dart)
+
+Writes texts/<text>/structure_audit.json and structure_audit.md.
+
+Usage:
+  python3 tools/audit_structure.py
+  python3 tools/audit_structure.py --text bodhicaryavatara --rule empty_leaves
+"""
+import argparse
+import json
+import re
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+
+from text_assets import TEXTS_DIR, extract_verse_refs, iter_nodes, path_sort_key, text_dirs, verse_sort_key
+
+REPORT_JSON = "structure_audit.json"
+REPORT_MD = "structure_audit.md"
+
+SECTION_HEADING_RE = re.compile(r"^\d+(?:\.\d+)*\.\s+.+")
+NUMBER_PREFIX_RE = re.compile(r"^\d+(?:\.\d+)*\.\s*")
+OVERVIEW_LINE_RE = re.compile(r"^(\d+(?:\.\d+)*)\.?\s*(.*)$")
+
+
+def is_section_heading(line):
+    return bool(SECTION_HEADING_RE.match(line.strip()))
+
+
+def extract_heading(line):
+    """Heading text, before the colon if there is one."""
+    t = line.strip()
+    colon = t.find(":")
+    return t[:colon].strip() if colon > 0 else t
+
+
+def strip_number_prefix(s):
+    return NUMBER_PREFIX_RE.sub("", s, count=1).strip()
+
+
+def leading_number(s):
+    m = re.match(r"^(\d+)(?:\.|$)", s.strip())
+    return m.group(1) if m else None
+
+
+def normalize(s):
+    """Lowercase, collapse whitespace, drop trailing punctuation."""
+    s = re.sub(r"\s+", " ", s.lower().strip())
+    return re.sub(r"[:.,;]+$", "", s).strip()
+
+
+def normalize_leaf_title(s):
+    """normalize() that also folds curly quotes and drops [bracketed] refs."""
+    s = s.lower().replace("‘", "'").replace("’", "'")
+    s = re.sub(r"\[[^\]]*\]", "", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return re.sub(r"[:.,;]+$", "", s).strip()
+
+
+def normalize_line_title(s):
+    """Loose title key for line-level comparison: no articles, no punctuation."""
+    s = NUMBER_PREFIX_RE.sub("", str(s or ""), count=1)
+    s = re.sub(r"\[[^\]]+\]", " ", s).lower()
+    s = s.replace("‘", "'").replace("’", "'")
+    s = re.sub(r"\b(?:the|that|this|these|those)\b", " ", s)
+    s = re.sub(r"[^a-z0-9'\s]", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+LINE_LETTERS = "abcd"
+
+
+def _suffix_span(start_suffix, end_suffix):
+    start = start_suffix[0] if start_suffix else "a"
+    end = end_suffix[-1] if end_suffix else "d"
+    i, j = LINE_LETTERS.find(start), LINE_LETTERS.find(end)
+    if i < 0 or j < 0 or i > j:
+        return ""
+    return LINE_LETTERS[i:j + 1]
+
+
+LINE_REF_TAG_RE = re.compile(r"\[(\d+)\.(\d+)([a-d]*)(?:-(\d+)\.(\d+)([a-d]*))?\]", re.IGNORECASE)
+LINE_REF_BARE_RE = re.compile(r"^(\d+)\.(\d+)([a-d]*)(?:-(\d+)\.(\d+)([a-d]*))?$", re.IGNORECASE)
+
+
+def extract_line_refs(line):
+    """Refs on a mapping line, expanding same-verse suffix ranges (9.101ab-9.101cd)."""
+    refs = []
+    seen = set()
+
+    def add(ref):
+        if ref not in seen:
+            seen.add(ref)
+            refs.append(ref)
+
+    def expand(m):
+        c1, v1, s1 = int(m.group(1)), int(m.group(2)), m.group(3) or ""
+        if m.group(4) is None:
+            add(f"{c1}.{v1}{s1}")
+            return
+        c2, v2, s2 = int(m.group(4)), int(m.group(5)), m.group(6) or ""
+        if c1 == c2 and v1 == v2 and (s1 or s2):
+            for letter in _suffix_span(s1, s2):
+                add(f"{c1}.{v1}{letter}")
+            return
+        for c in range(c1, c2 + 1):
+            vs = v1 if c == c1 else 1
+            ve = v2 if c == c2 else 999
+            for v in range(vs, ve + 1):
+                add(f"{c}.{v}")
+
+    for m in LINE_REF_TAG_RE.finditer(line):
+        expand(m)
+    m = LINE_REF_BARE_RE.match(line.strip())
+    if m:
+        expand(m)
+    return refs
+
+
+def expand_ref_to_lines(ref):
+    """'9.101' -> 9.101a..d; '9.101ab' -> 9.101a, 9.101b."""
+    m = re.match(r"^(\d+)\.(\d+)([a-d]*)$", ref, re.IGNORECASE)
+    if not m:
+        return []
+    base = f"{int(m.group(1))}.{int(m.group(2))}"
+    suffix = (m.group(3) or "").lower()
+    letters = [c for c in LINE_LETTERS if c in suffix] if suffix else list(LINE_LETTERS)
+    return [base + letter for letter in letters]
+
+
+def line_sort_key(line_id):
+    m = re.match(r"^(\d+)\.(\d+)([a-d])$", line_id, re.IGNORECASE)
+    if not m:
+        return (float("inf"), float("inf"), float("inf"))
+    return (int(m.group(1)), int(m.group(2)), LINE_LETTERS.index(m.group(3).lower()) + 1)
+
+
+class TextModel:
+    """One text's structure sources, parsed once; indexes are built on first use."""
+
+    def __init__(self, text_dir):
+        self.text_dir = Path(text_dir)
+        self.text_id = self.text_dir.name
+        self.hierarchy = json.loads((self.text_dir / "verse_hierarchy_map.json").read_text(encoding="utf-8"))
+        mapping_path = self.text_dir / "verse_commentary_mapping.txt"
+        mapping = mapping_path.read_text(encoding="utf-8") if mapping_path.exists() else ""
+        self.mapping_lines = re.split(r"\r?\n", mapping)
+        overview_path = self.text_dir / "overviews_pages_eos.txt"
+        self.overview_text = overview_path.read_text(encoding="utf-8") if overview_path.exists() else None
+
+    @property
+    def sections(self):
+        return self.hierarchy.get("sections") or []
+
+    @property
+    def verse_to_path(self):
+        return self.hierarchy.get("verseToPath") or {}
+
+    @cached_property
+    def nodes(self):
+        """Pre-order list of (node, chain)."""
+        return list(iter_nodes(self.sections))
+
+    @cached_property
+    def path_to_node(self):
+        return {n.get("path", ""): n for n, _ in self.nodes if n.get("path")}
+
+    @cached_property
+    def leaves(self):
+        return [(n, chain) for n, chain in self.nodes if not n.get("children")]
+
+    @cached_property
+    def verse_to_section(self):
+        """ref -> deepest section path from verseToPath."""
+        out = {}
+        for ref, crumbs in self.verse_to_path.items():
+            if crumbs and isinstance(crumbs, list):
+                last = crumbs[-1] or {}
+                out[ref] = str(last.get("section") or last.get("path") or "")
+        return out
+
+    @cached_property
+    def section_verses(self):
+        """section path -> refs assigned to it in verseToPath."""
+        out = {}
+        for ref, path in self.verse_to_section.items():
+            out.setdefault(path, []).append(ref)
+        return out
+
+    @cached_property
+    def heading_flags(self):
+        return [is_section_heading(line) for line in self.mapping_lines]
+
+    @cached_property
+    def tag_refs(self):
+        """Per mapping line: refs from [..] tags only."""
+        return [extract_verse_refs(line) for line in self.mapping_lines]
+
+    @cached_property
+    def tag_and_bare_refs(self):
+        """Per mapping line: refs from [..] tags and bare ref lines."""
+        return [extract_verse_refs(line, bare=True) for line in self.mapping_lines]
+
+    @cached_property
+    def doc_order(self):
+        refs = set()
+        for line_refs in self.tag_refs:
+            refs.update(line_refs)
+        return sorted(refs, key=verse_sort_key)
+
+    @cached_property
+    def verse_to_doc_index(self):
+        return {v: i for i, v in enumerate(self.doc_order)}
+
+    def _heading_context(self, i):
+        """Headings in the 25 lines above line i, nearest first."""
+        lines, flags = self.mapping_lines, self.heading_flags
+        return [extract_heading(lines[j]) for j in range(i - 1, max(-1, i - 26), -1) if flags[j]]
+
+    @cached_property
+    def leaf_heading_assignments(self):
+        """ref -> (heading, context). A tag between two headings belongs to the next one."""
+        lines, flags = self.mapping_lines, self.heading_flags
+        out = {}
+        current = None
+        prev_non_empty = None
+        for i, line in enumerate(lines):
+            if flags[i]:
+                current = extract_heading(line)
+            refs = self.tag_and_bare_refs[i]
+            if refs:
+                if flags[i]:
+                    target = extract_heading(line)
+                else:
+                    next_is_heading = i + 1 < len(lines) and flags[i + 1]
+                    prev_is_heading = prev_non_empty is not None and flags[prev_non_empty]
+                    target = extract_heading(lines[i + 1]) if next_is_heading and prev_is_heading else current
+                if target:
+                    context = self._heading_context(i)
+                    for ref in refs:
+                        out[ref] = (target, context)
+            if line.strip():
+                prev_non_empty = i
+        return out
+
+    @cached_property
+    def overview_heading_assignments(self):
+        """ref -> heading. A tag directly above a heading belongs to it, else to the previous heading."""
+        lines, flags = self.mapping_lines, self.heading_flags
+        out = {}
+        previous = None
+        for i, line in enumerate(lines):
+            refs = self.tag_and_bare_refs[i]
+            if refs:
+                if flags[i]:
+                    target = extract_heading(line)
+                elif i + 1 < len(lines) and flags[i + 1]:
+                    target = extract_heading(lines[i + 1])
+                else:
+                    target = previous
+                if target is not None:
+                    for ref in refs:
+                        out[ref] = target
+            if flags[i]:
+                previous = extract_heading(line)
+        return out
+
+    @cached_property
+    def overview_sections(self):
+        """Flat overview outline: dicts of path, title, titleNorm, depth, num (4 spaces per level)."""
+        if self.overview_text is None:
+            return []
+        out = []
+        stack = [{"path": "", "depth": -1}]
+        for line in self.overview_text.split("\n"):
+            if not line.strip():
+                continue
+            depth = (len(line) - len(line.lstrip())) // 4
+            m = OVERVIEW_LINE_RE.match(line.strip())
+            if not m:
+                continue
+            title = m.group(2).strip()
+            if not title:
+                continue
+            while len(stack) > 1 and stack[-1]["depth"] >= depth:
+                stack.pop()
+            parent_path = stack[-1]["path"]
+            path = m.group(1) if not parent_path else f"{parent_path}.{m.group(1)}"
+            node = {
+                "path": path,
+                "title": title,
+                "titleNorm": normalize(title),
+                "depth": depth,
+                "num": leading_number(m.group(1)),
+            }
+            out.append(node)
+            stack.append(node)
+        return out
+
+
+RULES = {}
+
+
+def rule(name, title):
+    """Register a check. The function takes a TextModel and returns {"counts": {...}, "findings": [...]}.
+
+    Each finding has "id", "message" and optional "details" (label -> text) for the Markdown report.
+    """
+    def register(fn):
+        RULES[name] = (title, fn)
+        return fn
+    return register
+
+
+@rule("consecutive_sections", "Non-consecutive sections (document order)")
+def check_consecutive_sections(model):
+    doc_order, doc_index = model.doc_order, model.verse_to_doc_index
+    verse_to_section = model.verse_to_section
+    findings = []
+    for node, _ in model.nodes:
+        path = node.get("path", "")
+        verses = model.section_verses.get(path, [])
+        if len(verses) < 2:
+            continue
+        sorted_v = sorted(verses, key=verse_sort_key)
+        idxs = [doc_index.get(v) for v in sorted_v]
+        if None in idxs:
+            continue
+        for i in range(len(idxs) - 1):
+            for j in range(idxs[i] + 1, idxs[i + 1]):
+                other = doc_order[j]
+                other_sec = verse_to_section.get(other)
+                if other_sec and other_sec != path:
+                    findings.append({
+                        "id": path,
+                        "message": f"has {sorted_v[i]} then {sorted_v[i + 1]}, but {other} (in {other_sec}) between",
+                    })
+    return {"counts": {"violations": len(findings)}, "findings": findings}
+
+
+@rule("verse_number_gaps", "Sections with verse-number gaps")
+def check_verse_number_gaps(model):
+    findings = []
+    for node, _ in model.nodes:
+        verses = [v for v in node.get("verses") or [] if isinstance(v, str)]
+        if len(verses) <= 1:
+            continue
+        by_chapter = {}
+        for ref in verses:
+            m = re.match(r"^(\d+)\.(\d+)", ref)
+            ch, v = (int(m.group(1)), int(m.group(2))) if m else (0, 0)
+            by_chapter.setdefault(ch, set()).add(v)
+        gap = any(
+            b - a > 1
+            for nums in by_chapter.values()
+            for a, b in zip(sorted(nums), sorted(nums)[1:])
+        )
+        if gap:
+            findings.append({
+                "id": node.get("path", ""),
+                "message": node.get("title", ""),
+                "details": {"Verses": ", ".join(verses)},
+            })
+    return {"counts": {"non_consecutive": len(findings)}, "findings": findings}
+
+
+def _heading_could_target_leaf(heading_norm, leaf_norm):
+    if not heading_norm or not leaf_norm:
+        return False
+    return (
+        heading_norm == leaf_norm
+        or heading_norm.startswith(leaf_norm + ",")
+        or heading_norm.startswith(leaf_norm + " i.e")
+    )
+
+
+@rule("empty_leaves", "Empty leaf sections")
+def check_empty_leaves(model):
+    assignments = model.leaf_heading_assignments
+    ref_current_path = model.verse_to_section
+
+    refs_by_heading_norm = {}
+    for ref, (heading, _) in assignments.items():
+        refs_by_heading_norm.setdefault(normalize_leaf_title(strip_number_prefix(heading)), []).append((ref, heading))
+
+    total_leaves = 0
+    findings = []
+    for leaf, chain in model.leaves:
+        path, title = str(leaf.get("path") or ""), str(leaf.get("title") or "")
+        if not path or not title:
+            continue
+        total_leaves += 1
+        if leaf.get("verses"):
+            continue
+        leaf_norm = normalize_leaf_title(strip_number_prefix(title))
+        candidates = [
+            row
+            for heading_norm, rows in refs_by_heading_norm.items()
+            if _heading_could_target_leaf(heading_norm, leaf_norm)
+            for row in rows
+        ]
+        finding = {"id": path, "message": title, "details": {}}
+
+        if not candidates:
+            finding["classification"] = "expected_empty"
+            finding["details"]["Reason"] = "No direct mapping heading found for this leaf title"
+            findings.append(finding)
+            continue
+
+        direct = [ref for ref, _ in candidates if ref_current_path.get(ref) == path]
+        if direct:
+            finding["classification"] = "index_inconsistency"
+            finding["details"]["Reason"] = "verseToPath points here but leaf verses array is empty"
+            finding["details"]["Sample refs"] = ", ".join(direct[:5])
+            findings.append(finding)
+            continue
+
+        ancestor_norms = [
+            n for n in (normalize_leaf_title(strip_number_prefix(str(c.get("title") or ""))) for c in chain[:-1]) if n
+        ]
+        conflicts = []
+        for ref, _ in candidates:
+            _, context = assignments[ref]
+            context_norms = {normalize_leaf_title(strip_number_prefix(h)) for h in context}
+            if any(a in context_norms for a in ancestor_norms):
+                current = ref_current_path.get(ref)
+                conflicts.append(f"{ref} -> {current}" if current else ref)
+        if conflicts:
+            finding["classification"] = "suspicious_misassigned"
+            finding["details"]["Reason"] = (
+                "Mapping refs for this heading exist with matching ancestor context, but are assigned to other leaves"
+            )
+            finding["details"]["Sample refs"] = ", ".join(conflicts[:8])
+        else:
+            finding["classification"] = "ambiguous_empty"
+            finding["details"]["Reason"] = "Matching heading exists but context did not reliably match this leaf"
+            sample = []
+            for ref, _ in candidates[:5]:
+                current = ref_current_path.get(ref)
+                sample.append(f"{ref} -> {current}" if current else ref)
+            finding["details"]["Sample refs"] = ", ".join(sample)
+        findings.append(finding)
+
+    findings.sort(key=lambda f: path_sort_key(f["id"]))
+    counts = {"total_leaves": total_leaves, "empty_leaves": len(findings)}
+    for key in ("suspicious_misassigned", "ambiguous_empty", "expected_empty", "index_inconsistency"):
+        counts[key] = sum(1 for f in findings if f["classification"] == key)
+    return {"counts": counts, "findings": findings}
+
+
+@rule("line_sections", "Line-level section mismatches")
+def check_line_sections(model):
+    if not any(model.heading_flags):
+        return {"counts": {"skipped": 1}, "findings": [],
+                "note": "verse_commentary_mapping.txt has no numbered section headings to compare against."}
+    # verseToPath, expanded to verse lines; more specific refs (fewer lines) win.
+    rows = []
+    for ref, crumbs in model.verse_to_path.items():
+        if not crumbs or not isinstance(crumbs, list):
+            continue
+        last = crumbs[-1] or {}
+        lines = expand_ref_to_lines(ref)
+        if lines:
+            rows.append((len(lines), ref, lines, str(last.get("section") or last.get("path") or ""),
+                         str(last.get("title") or "")))
+    rows.sort(key=lambda r: (r[0], [int(x) if x.isdigit() else x for x in re.split(r"(\d+)", r[1])]))
+    json_lines = {}
+    for _, ref, lines, section_path, section_title in rows:
+        for line_id in lines:
+            json_lines.setdefault(line_id, (section_path, section_title, ref))
+
+    # Closest heading above each verse reference in the mapping.
+    commentary_lines = {}
+    current = None
+    for i, line in enumerate(model.mapping_lines):
+        if model.heading_flags[i]:
+            current = extract_heading(line)
+        if not current:
+            continue
+        for ref in extract_line_refs(line):
+            for line_id in expand_ref_to_lines(ref):
+                counts = commentary_lines.setdefault(line_id, {})
+                counts[current] = counts.get(current, 0) + 1
+
+    grouped = {}
+    mismatched_lines = 0
+    for line_id in sorted(set(json_lines) | set(commentary_lines), key=line_sort_key):
+        json_row = json_lines.get(line_id)
+        heading_counts = commentary_lines.get(line_id, {})
+        headings = [h for h, _ in sorted(heading_counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+        if json_row is None and headings:
+            kind = "missing_in_json"
+        elif json_row is not None and not headings:
+            kind = "missing_in_commentary"
+        elif json_row is not None and headings:
+            json_norm = normalize_line_title(json_row[1])
+            if any(normalize_line_title(h) == json_norm for h in headings):
+                continue
+            kind = "section_mismatch"
+        else:
+            continue
+        mismatched_lines += 1
+        verse, letter = line_id[:-1], line_id[-1]
+        sig = (verse, kind, json_row, " || ".join(sorted(normalize_line_title(h) for h in headings)))
+        entry = grouped.setdefault(sig, {"verse": verse, "kind": kind, "json": json_row,
+                                         "headings": headings, "letters": []})
+        entry["letters"].append(letter)
+
+    findings = []
+    for entry in grouped.values():
+        letters = "".join(c for c in LINE_LETTERS if c in entry["letters"])
+        ref = entry["verse"] + ("" if letters == LINE_LETTERS else letters)
+        json_row = entry["json"]
+        findings.append({
+            "id": ref,
+            "message": entry["kind"],
+            "details": {
+                "JSON": f"{json_row[0]} | {json_row[1]}" if json_row else "(missing in JSON)",
+                "Commentary": " || ".join(entry["headings"][:3]) if entry["headings"] else "(missing in commentary)",
+            },
+        })
+    findings.sort(key=lambda f: (verse_sort_key(f["id"].rstrip(LINE_LETTERS))[:2], f["id"]))
+    return {
+        "counts": {
+            "json_lines": len(json_lines),
+            "commentary_lines": len(commentary_lines),
+            "mismatched_lines": mismatched_lines,
+            "compact_mismatches": len(findings),
+        },
+        "findings": findings,
+    }
+
+
+class _Title:
+    """A title with its normalized forms precomputed, so pairwise checks stay cheap."""
+
+    __slots__ = ("text", "norm", "words")
+
+    def __init__(self, text):
+        self.text = text
+        self.norm = normalize(text)
+        self.words = {w for w in self.norm.split() if len(w) >= 2}
+
+    def overlap(self, other):
+        """Jaccard overlap of the words (2+ chars) of two titles."""
+        if not self.words or not other.words:
+            return 0.0
+        inter = len(self.words & other.words)
+        return inter / (len(self.words) + len(other.words) - inter)
+
+    def contains_either(self, other):
+        return self.norm in other.norm or other.norm in self.norm
+
+
+@rule("overview_titles", "Overview vs mapping title mismatches")
+def check_overview_titles(model):
+    overview = model.overview_sections
+    if not overview:
+        return {"counts": {"skipped": 1}, "findings": [], "note": "No overviews_pages_eos.txt for this text."}
+    verse_to_path = model.verse_to_path
+    overview_norms = {s["titleNorm"] for s in overview}
+    ov_titles = [_Title(ov["title"]) for ov in overview]
+    findings = []
+
+    # Unique mapping headings (first-seen order) with their refs and precomputed title forms.
+    refs_by_heading = {}
+    for ref, heading in model.overview_heading_assignments.items():
+        refs_by_heading.setdefault(heading, []).append(ref)
+    heading_info = {
+        h: (leading_number(h), _Title(strip_number_prefix(h))) for h in refs_by_heading
+    }
+
+    # Mapping refs that never made it into verseToPath, grouped by heading.
+    unmapped = {}
+    for heading, refs in refs_by_heading.items():
+        for ref in refs:
+            if ref not in verse_to_path:
+                unmapped.setdefault(heading, []).append(ref)
+    for heading in sorted(unmapped, key=lambda h: min(verse_sort_key(r) for r in unmapped[h])):
+        refs = sorted(unmapped[heading], key=verse_sort_key)
+        num, title = heading_info[heading]
+        suggestions = []
+        for ov, ov_title in zip(overview, ov_titles):
+            if ov["titleNorm"] == title.norm:
+                reason = "exact"
+            elif num is not None and ov["num"] == num and (
+                ov_title.contains_either(title) or ov_title.overlap(title) > 0.3
+            ):
+                reason = "same number + overlap"
+            elif ov_title.contains_either(title):
+                reason = "substring"
+            else:
+                continue
+            suggestions.append(f'{ov["path"]}: "{ov["title"]}" ({reason})')
+            if len(suggestions) == 3:
+                break
+        details = {"Verses": ", ".join(refs)}
+        if suggestions:
+            details["Possible overview match(es)"] = "; ".join(suggestions)
+        findings.append({"id": heading, "message": "unmapped_verses", "details": details})
+
+    # Overview sections without verses that have a similar, differently titled mapping heading.
+    for ov, ov_title in zip(overview, ov_titles):
+        node = model.path_to_node.get(ov["path"])
+        if node is None or node.get("verses"):
+            continue
+        candidates = []
+        for heading, (num, title) in heading_info.items():
+            if num != ov["num"] or title.norm == ov["titleNorm"]:
+                continue
+            if ov_title.contains_either(title) or ov_title.overlap(title) > 0.2:
+                candidates.extend(f'"{heading}" (verse {ref})' for ref in refs_by_heading[heading])
+                if len(candidates) >= 3:
+                    break
+        if candidates:
+            findings.append({
+                "id": ov["path"],
+                "message": "empty_section_similar_heading",
+                "details": {"Overview": ov["title"], "Mapping has similar but different": "; ".join(candidates[:3])},
+            })
+
+    # Overview title is a prefix of a fuller mapping heading (e.g. "Requesting" vs "Requesting the wheel...").
+    for ov in overview:
+        ov_norm = ov["titleNorm"]
+        if len(ov_norm) < 5:
+            continue
+        node = model.path_to_node.get(ov["path"])
+        has_verses = bool(node and node.get("verses"))
+        for heading, (_, title) in heading_info.items():
+            if not (title.norm.startswith(ov_norm) and len(title.norm) > len(ov_norm) + 5):
+                continue
+            refs = refs_by_heading[heading]
+            ref = next((r for r in refs if not (has_verses and r in verse_to_path)), None)
+            if ref is None:
+                continue
+            findings.append({
+                "id": ov["path"],
+                "message": "overview_prefix_of_mapping",
+                "details": {"Overview": ov["title"], "Mapping (fuller)": f'"{heading}" (verse {ref})'},
+            })
+
+    # Mapping headings with no exact overview title.
+    for heading in sorted(refs_by_heading):
+        if heading_info[heading][1].norm in overview_norms:
+            continue
+        refs = sorted(refs_by_heading[heading])
+        findings.append({
+            "id": heading,
+            "message": "no_exact_overview_match",
+            "details": {
+                "Verses": ", ".join(refs[:10]) + ("..." if len(refs) > 10 else ""),
+                "In JSON": "yes" if any(r in verse_to_path for r in refs) else "NO",
+            },
+        })
+
+    counts = {}
+    for f in findings:
+        counts[f["message"]] = counts.get(f["message"], 0) + 1
+    return {"counts": counts, "findings": findings}
+
+
+def run_audit(model, rule_names):
+    results = {}
+    for name in rule_names:
+        title, fn = RULES[name]
+        result = fn(model)
+        result["title"] = title
+        results[name] = result
+    return results
+
+
+def render_markdown(text_id, generated_at, results):
+    lines = [f"# Structure Audit: {text_id}", "", f"Generated: {generated_at}", "", "## Summary", ""]
+    for name, result in results.items():
+        counts = ", ".join(f"{k}: {v}" for k, v in result["counts"].items())
+        lines.append(f"- {result['title']}: {counts or 'no findings'}")
+    lines.append("")
+    for name, result in results.items():
+        findings = result["findings"]
+        lines.append(f"## {result['title']} ({len(findings)})")
+        lines.append("")
+        if result.get("note"):
+            lines.append(result["note"])
+            lines.append("")
+            continue
+        if not findings:
+            lines.append("None.")
+            lines.append("")
+            continue
+        for f in findings:
+            suffix = f" ({f['classification']})" if f.get("classification") else ""
+            lines.append(f"- {f['id']} | {f['message']}{suffix}")
+            for key, value in (f.get("details") or {}).items():
+                lines.append(f"  - {key}: {value}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit hierarchy/mapping structure for all texts.")
+    parser.add_argument("--text", action="append", help="Text id under texts/ (repeatable; default: all).")
+    parser.add_argument("--rule", action="append", choices=sorted(RULES), help="Rule to run (repeatable; default: all).")
+    parser.add_argument("--no-write", action="store_true", help="Print the summary only; do not write reports.")
+    args = parser.parse_args()
+
+    dirs = [TEXTS_DIR / t for t in args.text] if args.text else text_dirs()
+    rule_names = args.rule or list(RULES)
+    generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    for text_dir in dirs:
+        model = TextModel(text_dir)
+        results = run_audit(model, rule_names)
+        print(f"{model.text_id}:")
+        for name, result in results.items():
+            print(f"  {name}: {json.dumps(result['counts'])}")
+        if args.no_write:
+            continue
+        report = {"text_id": model.text_id, "generated_at_utc": generated_at, "rules": results}
+        (text_dir / REPORT_JSON).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        (text_dir / REPORT_MD).write_text(render_markdown(model.text_id, generated_at, results), encoding="utf-8")
+        print(f"  Wrote {text_dir / REPORT_JSON}")
+        print(f"  Wrote {text_dir / REPORT_MD}")
+
+
+if __name__ == "__main__":
+    main()
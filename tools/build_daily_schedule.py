@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Precompute the daily-section schedule (texts/daily_schedule.json).
+
+DailyVersePickerService picks today's section of a text with
+    positiveHash("YYYY-MM-DD|<textId>") % sectionCount
+where sectionCount comes from parsing the whole commentary mapping. This
+reproduces it (same FNV-style hash, same section parsing as
+CommentaryService) for the next N days, so the daily screen and the daily
+notification can resolve a pick without loading any commentary. Today's text
+(pickDailyTextId) is one hash of a short string and is not precomputed.
+
+Layout (compact JSON):
+    texts       text ids with daily support, sorted
+    start, days first local date and number of days covered
+    picks       one row per day: [section index per text...]
+    sections    per text: section_count, commentary_sha256 and, for each
+                section index used by picks, its refs
+
+    python3 tools/build_daily_schedule.py --days 400
+    python3 tools/build_daily_schedule.py --check     # exit 1 if the committed asset is stale
+                                                      # or ends within --min-lead-days (CI runs this)
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import date, timedelta
+
+from text_assets import TEXTS_DIR, parsed_json_path
+
+OUT_PATH = TEXTS_DIR / "daily_schedule.json"
+MIN_LEAD_DAYS = 60
+
+SECTION_HEADER_RE = re.compile(r"^\[\d+\.")
+REF_EXTRACT_RE = re.compile(r"(?:\[|-)(\d+\.\d+[a-z]*)")
+REF_PARTS_RE = re.compile(r"^(\d+)\.(\d+)([a-z]*)$", re.IGNORECASE)
+SUFFIX_RANK = {"": 0, "a": 1, "ab": 1, "bcd": 2, "cd": 2}
+
+
+def positive_hash(text):
+    """DailyVersePickerService._positiveHash (Dart VM int semantics) over UTF-16 code units."""
+    h = 2166136261
+    data = text.encode("utf-16-le")
+    for i in range(0, len(data), 2):
+        h ^= data[i] | (data[i + 1] << 8)
+        h = (h * 16777619) & 0x7FFFFFFF
+    return h
+
+
+def _ref_sort_key(ref):
+    m = REF_PARTS_RE.match(ref)
+    if not m:
+        return (float("inf"), 0, 0, ref)
+    suffix = m.group(3).lower()
+    return (int(m.group(1)), int(m.group(2)), SUFFIX_RANK.get(suffix, 3), suffix)
+
+
+def commentary_sections(path):
+    """refsInBlock of every section, in file order, parsed exactly like CommentaryService."""
+    sections = []
+    for line in path.read_text(encoding="utf-8").split("\n"):
+        if not SECTION_HEADER_RE.match(line):
+            continue
+        refs = REF_EXTRACT_RE.findall(line)
+        if not refs:
+            continue
+        sections.append(sorted(dict.fromkeys(refs), key=_ref_sort_key))
+    return sections
+
+
+def daily_text_ids():
+    """Texts with core study support (parsed JSON, hierarchy and commentary), i.e. daily-eligible."""
+    return sorted(
+        p.name for p in TEXTS_DIR.iterdir()
+        if p.is_dir()
+        and (p / "verse_hierarchy_map.json").exists()
+        and (p / "verse_commentary_mapping.txt").exists()
+        and parsed_json_path(p) is not None
+    )
+
+
+def date_key(d):
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+def build_schedule(start, days):
+    texts = daily_text_ids()
+
+    parsed = {}
+    for text_id in texts:
+        mapping = TEXTS_DIR / text_id / "verse_commentary_mapping.txt"
+        parsed[text_id] = {
+            "sections": commentary_sections(mapping),
+            "sha256": hashlib.sha256(mapping.read_bytes()).hexdigest(),
+        }
+
+    picks = []
+    used = {t: set() for t in texts}
+    for offset in range(days):
+        key = date_key(start + timedelta(days=offset))
+        row = []
+        for text_id in texts:
+            count = len(parsed[text_id]["sections"])
+            index = positive_hash(f"{key}|{text_id}") % count if count else -1
+            row.append(index)
+            if index >= 0:
+                used[text_id].add(index)
+        picks.append(row)
+
+    sections = {}
+    for text_id in texts:
+        info = parsed[text_id]
+        sections[text_id] = {
+            "section_count": len(info["sections"]),
+            "commentary_sha256": info["sha256"],
+            "entries": {str(i): info["sections"][i] for i in sorted(used[text_id])},
+        }
+
+    return {
+        "version": 2,
+        "texts": texts,
+        "start": date_key(start),
+        "days": days,
+        "picks": picks,
+        "sections": sections,
+    }
+
+
+def encode(schedule):
+    return json.dumps(schedule, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute daily text/section picks into texts/daily_schedule.json.")
+    parser.add_argument("--start", type=date.fromisoformat, help="first local date (default: today)")
+    parser.add_argument("--days", type=int, default=400, help="days to cover (default 400)")
+    parser.add_argument("--out", default=str(OUT_PATH))
+    parser.add_argument("--check", action="store_true",
+                        help="verify the existing asset's picks against the current commentary; no write")
+    parser.add_argument("--min-lead-days", type=int, default=MIN_LEAD_DAYS,
+                        help=f"with --check, also fail when the schedule ends sooner than this (default {MIN_LEAD_DAYS})")
+    args = parser.parse_args()
+
+    if args.check:
+        existing = json.loads(OUT_PATH.read_text(encoding="utf-8"))
+        rebuilt = build_schedule(date.fromisoformat(existing["start"]), existing["days"])
+        if rebuilt != existing:
+            print(f"{OUT_PATH.relative_to(TEXTS_DIR.parent)} is stale; re-run tools/build_daily_schedule.py")
+            return 1
+        end = date.fromisoformat(existing["start"]) + timedelta(days=existing["days"] - 1)
+        left = (end - date.today()).days
+        if left < args.min_lead_days:
+            print(f"{OUT_PATH.relative_to(TEXTS_DIR.parent)} ends {date_key(end)}, {left} day(s) from today "
+                  f"(minimum {args.min_lead_days}); re-run tools/build_daily_schedule.py --days 400")
+            return 1
+        print(f"Schedule is current (covers {existing['start']} .. {date_key(end)}, {left} days left)")
+        return 0
+
+    schedule = build_schedule(args.start or date.today(), args.days)
+    data = encode(schedule)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(data)
+    used = sum(len(s["entries"]) for s in schedule["sections"].values())
+    print(f"Wrote {args.out}: {args.days} days from {schedule['start']}, {len(schedule['texts'])} texts, "
+          f"{used} sections, {len(data.encode('utf-8'))} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Invert texts/<text>/section_emotion_mappings.json into emotion_index.json.
+
+The mapping is a section tree with an emotion tag per node, so "sections for
+Anger / Frustration / Irritation" means walking every node. The index is keyed
+by category instead:
+
+    {"version": 1,
+     "categories": {
+       "Anger / Frustration / Irritation": {
+         "paths": ["4.2.1", ...],          # hierarchy order
+         "first_refs": ["4.12", ...],      # aligned with paths
+         "weights": [0.8, ...]             # only when the mapping carries weights
+       }, ...}}
+
+A node's emotion may be a category string, a list of categories, or a
+{category: weight} object. Every path is validated against the text's
+verse_hierarchy_map.json and every emotion against the mapping's "categories"
+list. Paths the hierarchy no longer has are reported and left out of the
+index (an error with --strict); unknown emotions and duplicate paths are
+always errors, and a text with errors is not written (exit 1).
+
+The index is not listed in pubspec.yaml yet: add it there together with the
+Dart service that reads it, so the app does not ship an asset nothing loads.
+
+    python3 tools/build_emotion_index.py            # all texts with a mapping
+    python3 tools/build_emotion_index.py --check    # validate only
+"""
+import argparse
+import json
+import sys
+
+from text_assets import TEXTS_DIR, iter_nodes, path_sort_key, verse_sort_key
+
+MAPPING_NAME = "section_emotion_mappings.json"
+INDEX_NAME = "emotion_index.json"
+
+
+def node_emotions(node):
+    """[(category, weight or None)] for one mapping node."""
+    emotion = node.get("emotion")
+    if emotion is None:
+        emotion = node.get("emotions")
+    if emotion is None:
+        return []
+    if isinstance(emotion, str):
+        return [(emotion, None)]
+    if isinstance(emotion, dict):
+        return [(k, float(v)) for k, v in emotion.items()]
+    out = []
+    for item in emotion:
+        if isinstance(item, str):
+            out.append((item, None))
+        elif isinstance(item, dict) and "name" in item:
+            out.append((item["name"], None if item.get("weight") is None else float(item["weight"])))
+    return out
+
+
+def hierarchy_first_refs(hierarchy):
+    """path -> first verse ref: sectionToFirstVerse where present, else the subtree's lowest verse."""
+    first = {}
+    for node, chain in iter_nodes(hierarchy.get("sections") or []):
+        verses = node.get("verses") or []
+        if not verses:
+            continue
+        lowest = min(verses, key=verse_sort_key)
+        for ancestor in chain:
+            path = ancestor.get("path")
+            if path and (path not in first or verse_sort_key(lowest) < verse_sort_key(first[path])):
+                first[path] = lowest
+    first.update(hierarchy.get("sectionToFirstVerse") or {})
+    return first
+
+
+def build_index(text_dir, strict=False):
+    """Returns (index, errors, warnings) for one text."""
+    mapping = json.loads((text_dir / MAPPING_NAME).read_text(encoding="utf-8"))
+    hierarchy = json.loads((text_dir / "verse_hierarchy_map.json").read_text(encoding="utf-8"))
+    titles = {n.get("path"): n.get("title") for n, _ in iter_nodes(hierarchy.get("sections") or [])}
+    first_refs = hierarchy_first_refs(hierarchy)
+    categories = list(mapping.get("categories") or [])
+    known = set(categories)
+    errors, warnings = [], []
+
+    tagged = {c: [] for c in categories}
+    # emotion_distribution describes the mapping, so it counts tags on skipped paths too.
+    mapping_counts = {}
+    weighted = False
+    seen = set()
+    for node, _chain in iter_nodes(mapping.get("sections") or []):
+        path = node.get("path")
+        if not path:
+            errors.append(f"node without path: {node.get('title')!r}")
+            continue
+        if path in seen:
+            errors.append(f"{path}: appears more than once")
+        seen.add(path)
+        for category, _weight in node_emotions(node):
+            mapping_counts[category] = mapping_counts.get(category, 0) + 1
+        if path not in titles:
+            (errors if strict else warnings).append(f"{path}: not in verse_hierarchy_map.json; skipped")
+            continue
+        if node.get("title") and titles[path] and node["title"] != titles[path]:
+            warnings.append(f"{path}: title {node['title']!r} differs from hierarchy {titles[path]!r}")
+        for category, weight in node_emotions(node):
+            if category not in known:
+                errors.append(f"{path}: unknown emotion {category!r}")
+                continue
+            weighted = weighted or weight is not None
+            tagged[category].append((path, weight))
+
+    distribution = mapping.get("emotion_distribution") or {}
+    for category, count in distribution.items():
+        if category in tagged and mapping_counts.get(category, 0) != count:
+            warnings.append(
+                f"emotion_distribution[{category!r}] = {count}, mapping tags {mapping_counts.get(category, 0)} sections"
+            )
+
+    out = {}
+    for category in categories:
+        entries = sorted(tagged[category], key=lambda e: path_sort_key(e[0]))
+        bucket = {
+            "paths": [p for p, _ in entries],
+            "first_refs": [first_refs.get(p) for p, _ in entries],
+        }
+        if weighted:
+            bucket["weights"] = [1.0 if w is None else w for _, w in entries]
+        out[category] = bucket
+    return {"version": 1, "categories": out}, errors, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-text emotion -> sections lookup assets.")
+    parser.add_argument("--text", action="append", help="limit to this text directory name (repeatable)")
+    parser.add_argument("--check", action="store_true", help="validate only; do not write")
+    parser.add_argument("--strict", action="store_true", help="treat paths missing from the hierarchy as errors")
+    args = parser.parse_args()
+
+    failed = False
+    for mapping_path in sorted(TEXTS_DIR.glob(f"*/{MAPPING_NAME}")):
+        text_dir = mapping_path.parent
+        if args.text and text_dir.name not in args.text:
+            continue
+        index, errors, warnings = build_index(text_dir, args.strict)
+        for w in warnings:
+            print(f"{text_dir.name}: warning: {w}")
+        for e in errors:
+            print(f"{text_dir.name}: error: {e}")
+        if errors:
+            failed = True
+            continue
+        tagged = sum(len(b["paths"]) for b in index["categories"].values())
+        if args.check:
+            print(f"{text_dir.name}: OK ({len(index['categories'])} categories, {tagged} tags)")
+            continue
+        out_path = text_dir / INDEX_NAME
+        out_path.write_text(
+            json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8"
+        )
+        print(f"{text_dir.name}: wrote {out_path.name} ({len(index['categories'])} categories, "
+              f"{tagged} tags, {out_path.stat().st_size} bytes)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
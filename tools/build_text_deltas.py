@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Version each text's bundled asset set and write patches between versions, so
+a content fix ships as a few kilobytes instead of a full re-download.
+
+A text's version is a digest of its assets' (path, sha256) pairs, taken over
+the bytes the web bundle serves (JSON minified as in bundle_web_assets.py).
+The assets of "common" are the texts/ files outside a text directory
+(texts/daily_schedule.json). Versions come from git: the revisions a
+previously deployed manifest records (--history), each --base REV, oldest
+first, then the working tree (or --target REV). For every pair of
+consecutive versions that differ, one patch per text is written to
+<out>/texts/<text>/patches/<from>-<to>.json:
+
+    {"from": <version>, "to": <version>, "assets": {
+        "<asset path>": {"from_sha256": ..., "sha256": ..., "bytes": <new size>,
+                         "lines": [["=", n] | ["-", n] | ["+", [line, ...]], ...]}   # .txt: line delta
+                       | {..., "copy": [[offset, length] | "literal text" | {"b64": ...}, ...]}  # others: byte delta
+                       | {..., "full": "text" | {"b64": ...}}   # when a delta would not be smaller
+                       | {"from_sha256": ..., "removed": true}}}
+
+Every delta is applied back to its base and compared with the target's
+sha256 before anything is written (exit 1 on a mismatch, with nothing
+written). The manifest <out>/text_deltas_manifest.json lists the revisions
+it was built from, and per text the current version, its asset hashes, the
+version history and the patch leaving each old version:
+
+    {"version": 1,
+     "revisions": [{"rev": "v1.4.0", "commit": <sha or null>}, ...],
+     "texts": {"bodhicaryavatara": {
+        "version": "3f2a...", "full_bytes": <gzip bytes of every asset>,
+        "assets": {"<asset path>": {"sha256": ..., "bytes": ...}},
+        "history": [{"version": ..., "rev": "v1.4.0", "commit": ...}, ...],
+        "patches": {"<from version>": {"to": ..., "url": ..., "bytes": ..., "gzip": ..., "sha256": ...}}}}}
+
+Each deploy clears <out>/texts, so the patches of earlier versions only
+survive by being rebuilt. Passing the live manifest back in with --history
+makes its recorded commits the bases of the next build (the latest
+--history-limit of them), so the chain grows by one version per deploy that
+changes a text. A recorded commit missing from the checkout is skipped with
+a warning; its clients fall back to the full download.
+
+A client holding version V follows patches[V] until it reaches "version",
+checking each asset's sha256 after every step. It downloads the full set
+instead (text_assets_manifest.json) when V has no patch, a check fails, or
+the chain's gzip bytes add up to more than full_bytes.
+
+Run it after tools/bundle_web_assets.py, which clears <out>/texts:
+
+    python3 tools/build_text_deltas.py --base v1.4.0 --base HEAD
+    python3 tools/build_text_deltas.py --history deployed/text_deltas_manifest.json
+    python3 tools/build_text_deltas.py --base HEAD~5 --check    # build and verify, write nothing
+"""
+import argparse
+import base64
+import difflib
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from bundle_web_assets import DEFAULT_OUT, gzip_bytes, minify
+from text_assets import PUBSPEC, PUBSPEC_ASSET_RE, ROOT, pubspec_text_assets, read_at_revision
+
+MANIFEST_NAME = "text_deltas_manifest.json"
+COMMON = "common"
+VERSION_LEN = 16
+HISTORY_LIMIT = 20
+BLOCK = 32
+CHUNK = 4096
+WORKTREE = "-"
+
+
+def text_of(asset_path):
+    """texts/<text>/... -> <text>; texts/<file> -> "common"."""
+    parts = asset_path.split("/")
+    return parts[1] if len(parts) > 2 else COMMON
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class Snapshot:
+    """The bundled bytes of every text asset at one revision, grouped by text."""
+
+    def __init__(self, rev, label=None):
+        self.rev = rev
+        self.label = label or (rev if rev != WORKTREE else "working tree")
+        self.commit = _commit_of(rev)
+        if rev == WORKTREE:
+            paths = pubspec_text_assets()
+            read = lambda p: (ROOT / p).read_bytes() if (ROOT / p).exists() else None  # noqa: E731
+        else:
+            pubspec = read_at_revision(rev, PUBSPEC)
+            paths = [m.group(1) for m in map(PUBSPEC_ASSET_RE.match, pubspec.splitlines()) if m]
+            read = lambda p: _bytes_at(rev, p)  # noqa: E731
+        self.texts = {}
+        for path in paths:
+            raw = read(path)
+            if raw is None:
+                continue
+            self.texts.setdefault(text_of(path), {})[path] = minify(path, raw)
+
+    def version(self, text):
+        """Digest of the text's (path, sha256) pairs; None when the text has no assets."""
+        assets = self.texts.get(text)
+        if not assets:
+            return None
+        listing = "".join(f"{p}\0{sha256(assets[p])}\n" for p in sorted(assets))
+        return sha256(listing.encode("utf-8"))[:VERSION_LEN]
+
+    def versions(self):
+        return {text: self.version(text) for text in self.texts}
+
+
+def _commit_of(rev):
+    """Commit SHA of [rev]. The working tree counts as HEAD when no texts/ file or pubspec.yaml differs from it."""
+    if rev == WORKTREE:
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--", "texts", PUBSPEC.name], cwd=ROOT, capture_output=True, text=True
+        )
+        if status.returncode != 0 or status.stdout.strip():
+            return None
+        rev = "HEAD"
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "-q", f"{rev}^{{commit}}"], cwd=ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() or None
+
+
+def history_commits(manifest_path, limit):
+    """The last [limit] (commit, rev) pairs a previous text_deltas_manifest.json was built from, oldest first."""
+    manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+    commits = {}
+    for entry in manifest.get("revisions") or []:
+        if entry.get("commit"):
+            commits.setdefault(entry["commit"], entry.get("rev"))
+    pairs = list(commits.items())
+    return pairs[-limit:] if limit > 0 else pairs
+
+
+def _bytes_at(rev, path):
+    rel = Path(path).as_posix()
+    result = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=ROOT, capture_output=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _literal(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(data).decode("ascii")}
+
+
+def _unliteral(value):
+    return base64.b64decode(value["b64"]) if isinstance(value, dict) else value.encode("utf-8")
+
+
+def line_delta(old, new):
+    """Line ops turning [old] into [new] (both UTF-8 text)."""
+    a = old.decode("utf-8").splitlines(keepends=True)
+    b = new.decode("utf-8").splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i2 - i1])
+            continue
+        if i2 > i1:
+            ops.append(["-", i2 - i1])
+        if j2 > j1:
+            ops.append(["+", b[j1:j2]])
+    return ops
+
+
+def apply_lines(old, ops):
+    a = old.decode("utf-8").splitlines(keepends=True)
+    out, i = [], 0
+    for op, arg in ops:
+        if op == "=":
+            out.extend(a[i:i + arg])
+            i += arg
+        elif op == "-":
+            i += arg
+        else:
+            out.extend(arg)
+    return "".join(out).encode("utf-8")
+
+
+def byte_delta(old, new):
+    """Copy/literal ops turning [old] into [new]: [offset, length] copies from old, anything else is inserted."""
+    index = {}
+    for i in range(0, len(old) - BLOCK + 1, BLOCK):
+        index.setdefault(old[i:i + BLOCK], i)
+    ops, literal_from, i = [], 0, 0
+    while i <= len(new) - BLOCK:
+        j = index.get(new[i:i + BLOCK])
+        if j is None:
+            i += 1
+            continue
+        start_new, start_old = i, j
+        while start_new > literal_from and start_old > 0 and new[start_new - 1] == old[start_old - 1]:
+            start_new -= 1
+            start_old -= 1
+        end_new, end_old = i + BLOCK, j + BLOCK
+        while new[end_new:end_new + CHUNK] == old[end_old:end_old + CHUNK] and end_new + CHUNK <= len(new):
+            end_new += CHUNK
+            end_old += CHUNK
+        while end_new < len(new) and end_old < len(old) and new[end_new] == old[end_old]:
+            end_new += 1
+            end_old += 1
+        if literal_from < start_new:
+            ops.append(_literal(new[literal_from:start_new]))
+        ops.append([start_old, end_new - start_new])
+        literal_from = i = end_new
+    if literal_from < len(new):
+        ops.append(_literal(new[literal_from:]))
+    return ops
+
+
+def apply_copies(old, ops):
+    out = bytearray()
+    for op in ops:
+        if isinstance(op, list):
+            offset, length = op
+            out += old[offset:offset + length]
+        else:
+            out += _unliteral(op)
+    return bytes(out)
+
+
+def apply_entry(old, entry):
+    """Bytes of one asset after applying its patch entry to [old] (None for a removal)."""
+    if entry.get("removed"):
+        return None
+    if "full" in entry:
+        return _unliteral(entry["full"])
+    if "lines" in entry:
+        return apply_lines(old, entry["lines"])
+    return apply_copies(old, entry["copy"])
+
+
+def asset_entry(path, old, new):
+    """Smallest patch entry for one changed asset, verified by applying it to [old]."""
+    entry = {"from_sha256": sha256(old) if old is not None else None, "sha256": sha256(new), "bytes": len(new)}
+    candidates = [{"full": _literal(new)}]
+    if old is not None:
+        if path.endswith(".txt"):
+            candidates.append({"lines": line_delta(old, new)})
+        else:
+            candidates.append({"copy": byte_delta(old, new)})
+    best = min(candidates, key=lambda c: len(json.dumps(c, ensure_ascii=False, separators=(",", ":"))))
+    entry.update(best)
+    rebuilt = apply_entry(old, entry)
+    if rebuilt is None or sha256(rebuilt) != entry["sha256"]:
+        raise ValueError(f"{path}: patch does not reproduce the target (round trip failed)")
+    return entry
+
+
+def build_patch(text, old_snap, new_snap):
+    old_assets = old_snap.texts.get(text, {})
+    new_assets = new_snap.texts.get(text, {})
+    assets = {}
+    for path in sorted(old_assets.keys() | new_assets.keys()):
+        old, new = old_assets.get(path), new_assets.get(path)
+        if old == new:
+            continue
+        if new is None:
+            assets[path] = {"from_sha256": sha256(old), "removed": True}
+        else:
+            assets[path] = asset_entry(path, old, new)
+    return {"from": old_snap.version(text), "to": new_snap.version(text), "assets": assets}
+
+
+def verify_patch(patch, old_snap, new_snap, text):
+    """Replays [patch] on the old snapshot's assets and checks every result against the new snapshot."""
+    files = dict(old_snap.texts.get(text, {}))
+    for path, entry in patch["assets"].items():
+        old = files.get(path)
+        if entry.get("from_sha256") != (sha256(old) if old is not None else None):
+            return f"{path}: base does not match from_sha256"
+        rebuilt = apply_entry(old, entry)
+        if rebuilt is None:
+            files.pop(path, None)
+        else:
+            files[path] = rebuilt
+    if files != new_snap.texts.get(text, {}):
+        return "patched asset set differs from the target"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write versioned text asset patches and text_deltas_manifest.json.")
+    parser.add_argument("--base", action="append", default=[], metavar="REV",
+                        help="git revision of a shipped version, oldest first (repeatable; default: HEAD)")
+    parser.add_argument("--history", type=Path, metavar="MANIFEST",
+                        help="previously deployed text_deltas_manifest.json; its revisions become bases first")
+    parser.add_argument("--history-limit", type=int, default=HISTORY_LIMIT, metavar="N",
+                        help=f"bases taken from --history, newest kept (default: {HISTORY_LIMIT}; 0: all)")
+    parser.add_argument("--target", default=WORKTREE, metavar="REV", help="newest version (default: working tree)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="web build directory (default: build/web)")
+    parser.add_argument("--check", action="store_true", help="build and verify every patch; write nothing")
+    args = parser.parse_args()
+
+    recorded = []
+    if args.history is not None:
+        try:
+            recorded = history_commits(args.history, args.history_limit)
+        except (OSError, ValueError) as e:
+            sys.exit(f"cannot read --history {args.history}: {e}")
+    snapshots = []
+    for commit, rev in recorded:
+        if _commit_of(commit) is None:
+            print(f"warning: recorded revision {rev} ({commit[:12]}) is not in this checkout; skipping it",
+                  file=sys.stderr)
+            continue
+        snapshots.append(Snapshot(commit, rev))
+    known = {snap.commit for snap in snapshots}
+    bases = [rev for rev in args.base if _commit_of(rev) not in known] or ([] if snapshots else ["HEAD"])
+    try:
+        snapshots += [Snapshot(rev) for rev in bases + [args.target]]
+    except subprocess.CalledProcessError as e:
+        sys.exit(f"cannot read pubspec.yaml at a --base revision: {e.stderr.strip()}")
+    latest = snapshots[-1]
+    out_dir = args.out.resolve()
+
+    # Only revisions that changed some text are recorded, so --history-limit counts versions, not deploys.
+    shipped = []
+    for snap in snapshots:
+        if not shipped or snap.versions() != shipped[-1].versions():
+            shipped.append(snap)
+    manifest = {"version": 1, "revisions": [{"rev": s.label, "commit": s.commit} for s in shipped], "texts": {}}
+
+    failures = 0
+    pending = {}
+    for text in sorted(latest.texts):
+        assets = latest.texts[text]
+        entry = {
+            "version": latest.version(text),
+            "full_bytes": sum(len(gzip_bytes(data)) for data in assets.values()),
+            "assets": {p: {"sha256": sha256(assets[p]), "bytes": len(assets[p])} for p in sorted(assets)},
+            "history": [],
+            "patches": {},
+        }
+        for snap in snapshots:
+            version = snap.version(text)
+            if version and (not entry["history"] or entry["history"][-1]["version"] != version):
+                entry["history"].append({"version": version, "rev": snap.label, "commit": snap.commit})
+
+        previous = None
+        for snap in snapshots:
+            if snap.version(text) is None:
+                continue
+            if previous is not None and previous.version(text) != snap.version(text):
+                try:
+                    patch = build_patch(text, previous, snap)
+                    problem = verify_patch(patch, previous, snap, text)
+                except ValueError as e:
+                    problem = str(e)
+                if problem:
+                    failures += 1
+                    print(f"{text} {previous.version(text)} -> {snap.version(text)}: {problem}", file=sys.stderr)
+                else:
+                    data = json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                    gz = gzip_bytes(data)
+                    rel = f"texts/{text}/patches/{patch['from']}-{patch['to']}.json"
+                    entry["patches"][patch["from"]] = {
+                        "to": patch["to"], "url": rel, "bytes": len(data), "gzip": len(gz), "sha256": sha256(data),
+                    }
+                    print(f"{text}: {patch['from']} -> {patch['to']}  {len(patch['assets'])} asset(s), "
+                          f"{len(data):,} bytes ({len(gz):,} gzip) vs {entry['full_bytes']:,} gzip full")
+                    # A version seen twice keeps its latest patch, which leads on toward the current one.
+                    pending[(text, patch["from"])] = (rel, data)
+            previous = snap
+        manifest["texts"][text] = entry
+
+    if failures:
+        print(f"{failures} patch(es) failed round-trip verification; nothing written", file=sys.stderr)
+        return 1
+    if args.check:
+        print("all patches reproduce their target versions")
+        return 0
+    for rel, data in pending.values():
+        target = out_dir / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+    print(f"Wrote {len(pending)} patch(es) and {out_dir / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
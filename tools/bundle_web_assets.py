@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Bundle the texts/ assets for the web build with content-hashed file names.
+
+For every texts/ asset listed in pubspec.yaml:
+  - JSON is minified (the tools write it with indent=2),
+  - the file is written as <name>.<hash>.<ext> under <out>/texts/<text_id>/.
+
+No .gz/.br siblings are written: Vercel compresses responses itself from the
+request's Accept-Encoding. The manifest's "gzip" size is only an estimate of
+the transfer.
+
+A manifest (<out>/text_assets_manifest.json) maps each logical asset path to
+its hashed URL. Hashed files never change, so vercel.json serves them as
+immutable; only the small manifest is revalidated on each visit.
+
+Usage:
+  python3 tools/bundle_web_assets.py                 # writes into build/web
+  python3 tools/bundle_web_assets.py --out some/dir
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+from text_assets import ROOT, pubspec_text_assets
+
+DEFAULT_OUT = ROOT / "build" / "web"
+BUNDLE_DIR = "texts"
+MANIFEST_NAME = "text_assets_manifest.json"
+HASH_LEN = 12
+
+
+def minify(asset_path, raw):
+    """Drop insignificant whitespace from JSON; other assets pass through unchanged."""
+    if not asset_path.endswith(".json"):
+        return raw
+    data = json.loads(raw.decode("utf-8"))
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def hashed_name(name, digest):
+    """verse_hierarchy_map.json -> verse_hierarchy_map.<digest>.json; bcv-root -> bcv-root.<digest>."""
+    stem, dot, ext = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest}"
+    return f"{stem}.{digest}.{ext}"
+
+
+def gzip_bytes(data):
+    # mtime=0 keeps the output byte-identical across builds.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def bundle(out_dir):
+    bundle_root = out_dir / BUNDLE_DIR
+    if bundle_root.exists():
+        shutil.rmtree(bundle_root)
+
+    manifest = {"version": 1, "assets": {}}
+    total_raw = total_min = total_gz = 0
+
+    for asset_path in pubspec_text_assets():
+        src = ROOT / asset_path
+        if not src.exists():
+            print(f"Skipping missing asset: {asset_path}")
+            continue
+        raw = src.read_bytes()
+        data = minify(asset_path, raw)
+        digest = hashlib.sha256(data).hexdigest()
+
+        rel_dir = Path(asset_path).parent.relative_to("texts")
+        target_dir = bundle_root / rel_dir
+        target_dir.mkdir(parents=True, exist_ok=True)
+        name = hashed_name(src.name, digest[:HASH_LEN])
+        (target_dir / name).write_bytes(data)
+
+        gz = gzip_bytes(data)
+        manifest["assets"][asset_path] = {
+            "url": f"{BUNDLE_DIR}/{rel_dir.as_posix()}/{name}",
+            "sha256": digest,
+            "bytes": len(data),
+            "gzip": len(gz),
+        }
+
+        total_raw += len(raw)
+        total_min += len(data)
+        total_gz += len(gz)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+
+    print(f"Bundled {len(manifest['assets'])} text assets into {bundle_root}")
+    print(f"  source:   {total_raw:>10,} bytes")
+    print(f"  minified: {total_min:>10,} bytes")
+    print(f"  gzip:     {total_gz:>10,} bytes")
+    print(f"Wrote {out_dir / MANIFEST_NAME}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle texts/ assets for the web build.")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=DEFAULT_OUT,
+        help="Web build directory to write into (default: build/web).",
+    )
+    args = parser.parse_args()
+    bundle(args.out.resolve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Cross-asset referential integrity for every text under texts/.
+
+Each text's files are read once. The verse refs of <id>_parsed.json and the
+section paths of verse_hierarchy_map.json become two key sets, and every file
+that points into them is then walked once, with a set lookup per reference:
+
+    verse_hierarchy_map.json      section verses, verseToPath keys and
+                                  breadcrumbs, sectionToFirstVerse keys and values
+    section_clues.json            keys are verse refs
+    clue_pools.json               chapter start/end verses
+    breadcrumb_summaries.json     keys are section paths
+    section_emotion_mappings.json section paths in its tree
+    emotion_index.json            category paths and first_refs
+
+A reference is dangling when its target does not exist. Dangling references
+make the exit status 1. A key is orphaned when nothing points at it: a parsed
+verse no section holds, a verse with no clue, a section with no summary or
+emotion. An emotion tag on a section that overviews_pages_eos.txt has but the
+sections tree does not yet (merge_outline.py will insert it) is listed with
+the orphans rather than as dangling. Orphans are listed but only fail the run
+with --strict. A segment ref (4.27cd) counts as real when its base verse
+(4.27) is.
+
+    python3 tools/check_integrity.py
+    python3 tools/check_integrity.py --text lampofthepath --limit 0
+    python3 tools/check_integrity.py --json > integrity.json
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from functools import cached_property
+
+from merge_outline import OUTLINE_NAME, parse_outline
+from text_assets import TEXTS_DIR, iter_nodes, parsed_json_path, path_sort_key, text_dirs, verse_sort_key
+
+BASE_REF_RE = re.compile(r"^(\d+\.\d+)[a-z]*$", re.IGNORECASE)
+
+
+class TextIndex:
+    """One text's assets, each parsed once, with the key sets references resolve against."""
+
+    def __init__(self, text_dir):
+        self.text_dir = text_dir
+        self.text_id = text_dir.name
+        self.hierarchy = self._load("verse_hierarchy_map.json") or {}
+        parsed = parsed_json_path(text_dir)
+        self.parsed_name = parsed.name if parsed else None
+        self.refs = set(self._load(parsed.name).get("refs") or []) if parsed else set()
+        self.paths = {}
+        for node, _ in iter_nodes(self.hierarchy.get("sections") or []):
+            path = str(node.get("path") or "")
+            if path:
+                self.paths[path] = node
+
+    @cached_property
+    def outline_paths(self):
+        """Section paths of overviews_pages_eos.txt, empty when the text has no outline."""
+        path = self.text_dir / OUTLINE_NAME
+        if not path.exists():
+            return set()
+        entries, _duplicates = parse_outline(path.read_text(encoding="utf-8"))
+        return {e.path for e in entries}
+
+    def _load(self, name):
+        path = self.text_dir / name
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+    def is_ref(self, ref):
+        if ref in self.refs:
+            return True
+        m = BASE_REF_RE.match(ref)
+        return bool(m) and m.group(1) in self.refs
+
+
+CHECKS = []
+
+
+def check(fn):
+    """Register a check. It takes a TextIndex and returns (dangling, orphaned) lists of dicts, or None to skip."""
+    CHECKS.append(fn)
+    return fn
+
+
+def _dangling(source, key, detail):
+    return {"source": source, "key": key, "detail": detail}
+
+
+@check
+def check_hierarchy(index):
+    name = "verse_hierarchy_map.json"
+    if not index.hierarchy:
+        return None
+    dangling = []
+    if index.refs:
+        for path, node in index.paths.items():
+            for ref in node.get("verses") or []:
+                if not index.is_ref(str(ref)):
+                    dangling.append(_dangling(name, path, f"section verse {ref} is not in {index.parsed_name}"))
+    held = set()
+    for ref, chain in (index.hierarchy.get("verseToPath") or {}).items():
+        held.add(BASE_REF_RE.sub(r"\1", ref))
+        if index.refs and not index.is_ref(ref):
+            dangling.append(_dangling(name, ref, f"verseToPath key is not in {index.parsed_name}"))
+        for crumb in chain if isinstance(chain, list) else ():
+            section = str((crumb or {}).get("section") or (crumb or {}).get("path") or "")
+            if section and section not in index.paths:
+                dangling.append(_dangling(name, ref, f"verseToPath breadcrumb {section} is not a section"))
+    for path, ref in (index.hierarchy.get("sectionToFirstVerse") or {}).items():
+        if path not in index.paths:
+            dangling.append(_dangling(name, path, "sectionToFirstVerse key is not a section"))
+        if index.refs and not index.is_ref(str(ref)):
+            dangling.append(_dangling(name, path, f"sectionToFirstVerse value {ref} is not in {index.parsed_name}"))
+    orphaned = [
+        {"source": name, "key": ref, "detail": "verse not in verseToPath"}
+        for ref in index.refs - held
+    ]
+    return dangling, orphaned
+
+
+@check
+def check_section_clues(index):
+    name = "section_clues.json"
+    clues = index._load(name)
+    if clues is None or not index.refs:
+        return None
+    dangling = [
+        _dangling(name, ref, f"clue key is not in {index.parsed_name}")
+        for ref in clues if not index.is_ref(ref)
+    ]
+    covered = {BASE_REF_RE.sub(r"\1", ref) for ref in clues}
+    orphaned = [{"source": name, "key": ref, "detail": "verse has no clue"} for ref in index.refs - covered]
+    return dangling, orphaned
+
+
+@check
+def check_clue_pools(index):
+    name = "clue_pools.json"
+    pools = index._load(name)
+    if pools is None or not index.refs:
+        return None
+    dangling = []
+    for chapter, ranges in (pools.get("chapters") or {}).items():
+        for i, entry in enumerate(ranges):
+            for end in ("start", "end"):
+                ref = f"{chapter}.{entry.get(end)}"
+                if not index.is_ref(ref):
+                    dangling.append(_dangling(name, f"{chapter}[{i}]", f"{end} verse {ref} is not in {index.parsed_name}"))
+    return dangling, []
+
+
+@check
+def check_breadcrumb_summaries(index):
+    name = "breadcrumb_summaries.json"
+    summaries = index._load(name)
+    if summaries is None:
+        return None
+    dangling = [_dangling(name, path, "summary key is not a section") for path in summaries if path not in index.paths]
+    orphaned = [
+        {"source": name, "key": path, "detail": "section has no summary"}
+        for path in index.paths.keys() - summaries.keys()
+    ]
+    return dangling, orphaned
+
+
+@check
+def check_section_emotions(index):
+    name = "section_emotion_mappings.json"
+    mappings = index._load(name)
+    if mappings is None:
+        return None
+    dangling, pending, mapped = [], [], set()
+    for node, _ in iter_nodes(mappings.get("sections") or []):
+        path = str(node.get("path") or "")
+        mapped.add(path)
+        if path in index.paths:
+            continue
+        if path in index.outline_paths:
+            pending.append({"source": name, "key": path, "detail": f"only in {OUTLINE_NAME} so far"})
+        else:
+            dangling.append(_dangling(name, path, "mapped section is not a section"))
+    orphaned = pending + [
+        {"source": name, "key": path, "detail": "section has no emotion"}
+        for path in index.paths.keys() - mapped
+    ]
+    return dangling, orphaned
+
+
+@check
+def check_emotion_index(index):
+    name = "emotion_index.json"
+    emotions = index._load(name)
+    if emotions is None:
+        return None
+    dangling = []
+    for category, entry in (emotions.get("categories") or {}).items():
+        for path in entry.get("paths") or []:
+            if path not in index.paths:
+                dangling.append(_dangling(name, path, f"{category}: path is not a section"))
+        if index.refs:
+            for ref in entry.get("first_refs") or []:
+                if not index.is_ref(ref):
+                    dangling.append(_dangling(name, ref, f"{category}: first ref is not in {index.parsed_name}"))
+    return dangling, []
+
+
+def _sort_key(item):
+    key = item["key"]
+    return (item["source"], verse_sort_key(key) if BASE_REF_RE.match(key) else path_sort_key(key), key)
+
+
+def run_checks(index):
+    """{"dangling": [...], "orphaned": {source: [...]}} for one text."""
+    dangling, orphaned = [], {}
+    for fn in CHECKS:
+        result = fn(index)
+        if result is None:
+            continue
+        found, orphans = result
+        dangling.extend(found)
+        if orphans:
+            orphaned[orphans[0]["source"]] = sorted(orphans, key=_sort_key)
+    return {"dangling": sorted(dangling, key=_sort_key), "orphaned": orphaned}
+
+
+def print_report(text_id, result, limit):
+    dangling, orphaned = result["dangling"], result["orphaned"]
+    orphan_summary = ", ".join(f"{len(v)} in {k}" for k, v in orphaned.items())
+    print(f"{text_id}: {len(dangling)} dangling, orphaned: {orphan_summary or 'none'}")
+    shown = dangling if limit == 0 else dangling[:limit]
+    for item in shown:
+        print(f"  {item['source']}: {item['key']}: {item['detail']}")
+    if len(shown) < len(dangling):
+        print(f"  ... {len(dangling) - len(shown)} more (--limit 0, or --json for all)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cross-asset references for every text.")
+    parser.add_argument("--text", action="append", help="text id under texts/ (repeatable; default: all)")
+    parser.add_argument("--strict", action="store_true", help="also fail on orphaned keys")
+    parser.add_argument("--limit", type=int, default=20, help="dangling references listed per text (0: all)")
+    parser.add_argument("--json", action="store_true", help="print every finding as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    dirs = [TEXTS_DIR / t for t in args.text] if args.text else text_dirs()
+    results = {d.name: run_checks(TextIndex(d)) for d in dirs}
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for text_id, result in results.items():
+            print_report(text_id, result, args.limit)
+        print(f"checked {len(results)} text(s) in {elapsed:.2f}s")
+
+    failed = any(r["dangling"] or (args.strict and r["orphaned"]) for r in results.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Semantic diff of two revisions of a text's verse_hierarchy_map.json.
+
+Each side is flattened in one pass into path -> (title, verses) and
+verse -> holding paths, so the comparison is a handful of dict/set
+operations, linear in the size of the tree. Reported:
+
+    sections    added, removed, renamed (same path, new title) and
+                renumbered (the same title and verses under another path,
+                including two sections that swapped places)
+    verses      moved between sections, newly placed, no longer placed
+    indexes     sectionToFirstVerse entries added/removed/changed, and the
+                number of verseToPath breadcrumbs that changed
+
+A side is a git revision (HEAD, HEAD~3, a branch), a path to a JSON file, or
+"-" for the working tree. The exit status is 1 when the sides differ.
+
+    python3 tools/diff_hierarchy.py                      # HEAD vs working tree
+    python3 tools/diff_hierarchy.py --text kingofaspirations HEAD~2 HEAD
+    python3 tools/diff_hierarchy.py HEAD~1 - --json > hierarchy_diff.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from text_assets import TEXTS_DIR, iter_nodes, path_sort_key, read_at_revision, verse_sort_key
+
+HIERARCHY_NAME = "verse_hierarchy_map.json"
+WORKTREE = "-"
+
+
+def load_side(spec, hierarchy_path):
+    """(label, parsed JSON) for a revision, file path or "-" (working tree)."""
+    if spec == WORKTREE:
+        return "working tree", json.loads(hierarchy_path.read_text(encoding="utf-8"))
+    candidate = Path(spec)
+    if candidate.suffix == ".json" and candidate.exists():
+        return str(candidate), json.loads(candidate.read_text(encoding="utf-8"))
+    try:
+        return spec, json.loads(read_at_revision(spec, hierarchy_path))
+    except subprocess.CalledProcessError as e:
+        sys.exit(f"cannot read {hierarchy_path.name} at {spec}: {e.stderr.strip()}")
+
+
+class Flat:
+    """One side of the diff: the sections tree flattened by path."""
+
+    def __init__(self, data):
+        self.titles = {}
+        self.verses = {}
+        self.holders = {}
+        for node, _ in iter_nodes(data.get("sections") or []):
+            path = node.get("path") or ""
+            self.titles[path] = node.get("title") or ""
+            refs = tuple(node.get("verses") or [])
+            self.verses[path] = refs
+            for ref in refs:
+                self.holders.setdefault(ref, []).append(path)
+        self.first_verse = data.get("sectionToFirstVerse") or {}
+        self.verse_to_path = data.get("verseToPath") or {}
+
+
+def diff(old, new):
+    """Machine-readable differences between two Flat sides."""
+    old_paths, new_paths = old.titles.keys(), new.titles.keys()
+    added = new_paths - old_paths
+    removed = old_paths - new_paths
+
+    retitled = {p for p in old_paths & new_paths if old.titles[p] != new.titles[p]}
+
+    # A renumbered section keeps its title and verses but changes path; the
+    # path it left may be gone or now hold another section (a swap).
+    by_content = {}
+    for path in removed | retitled:
+        by_content.setdefault((old.titles[path], old.verses[path]), []).append(path)
+    renumbered = []
+    for path in sorted(added | retitled, key=path_sort_key):
+        candidates = [c for c in by_content.get((new.titles[path], new.verses[path]), []) if c != path]
+        if candidates:
+            was = min(candidates, key=path_sort_key)
+            by_content[(new.titles[path], new.verses[path])].remove(was)
+            renumbered.append({"from": was, "to": path, "title": new.titles[path]})
+    renumber = {r["from"]: r["to"] for r in renumbered}
+    moved_to = set(renumber.values())
+
+    renamed = [
+        {"path": p, "from": old.titles[p], "to": new.titles[p]}
+        for p in retitled if not (p in renumber and p in moved_to)
+    ]
+
+    verse_moves, placed, unplaced = [], [], []
+    for ref in old.holders.keys() | new.holders.keys():
+        before, after = old.holders.get(ref, []), new.holders.get(ref, [])
+        if before == after:
+            continue
+        if not before:
+            placed.append({"verse": ref, "to": after})
+        elif not after:
+            unplaced.append({"verse": ref, "from": before})
+        elif [renumber.get(p, p) for p in before] != after:
+            verse_moves.append({"verse": ref, "from": before, "to": after})
+
+    first_changed = []
+    for path in old.first_verse.keys() | new.first_verse.keys():
+        a, b = old.first_verse.get(path), new.first_verse.get(path)
+        if a != b:
+            first_changed.append({"path": path, "from": a, "to": b})
+
+    crumbs_changed = sum(
+        1 for ref in old.verse_to_path.keys() | new.verse_to_path.keys()
+        if old.verse_to_path.get(ref) != new.verse_to_path.get(ref)
+    )
+
+    def by_path(key):
+        return lambda item: path_sort_key(item[key])
+
+    def by_verse(item):
+        return verse_sort_key(item["verse"]), item["verse"]
+
+    return {
+        "added": [{"path": p, "title": new.titles[p], "verses": list(new.verses[p])}
+                  for p in sorted(added - moved_to, key=path_sort_key)],
+        "removed": [{"path": p, "title": old.titles[p], "verses": list(old.verses[p])}
+                    for p in sorted(removed - renumber.keys(), key=path_sort_key)],
+        "renamed": sorted(renamed, key=by_path("path")),
+        "renumbered": renumbered,
+        "verses_moved": sorted(verse_moves, key=by_verse),
+        "verses_placed": sorted(placed, key=by_verse),
+        "verses_unplaced": sorted(unplaced, key=by_verse),
+        "first_verse_changed": sorted(first_changed, key=by_path("path")),
+        "verse_to_path_changed": crumbs_changed,
+    }
+
+
+def is_empty(result):
+    return not any(result[k] for k in result)
+
+
+def print_summary(result, old_label, new_label, limit):
+    counts = {k: (v if isinstance(v, int) else len(v)) for k, v in result.items()}
+    summary = ", ".join(f"{n} {k.replace('_', ' ')}" for k, n in counts.items() if n)
+    print(f"{old_label} -> {new_label}: {summary or 'no differences'}")
+
+    def show(key, fmt):
+        items = result[key]
+        if not items:
+            return
+        print(f"\n{key.replace('_', ' ')} ({len(items)}):")
+        for item in items[:limit]:
+            print("  " + fmt(item))
+        if len(items) > limit:
+            print(f"  ... {len(items) - limit} more (--limit, or --json for all)")
+
+    show("added", lambda x: f"+ {x['path']}  {x['title']}" + (f"  [{' '.join(x['verses'])}]" if x["verses"] else ""))
+    show("removed", lambda x: f"- {x['path']}  {x['title']}" + (f"  [{' '.join(x['verses'])}]" if x["verses"] else ""))
+    show("renamed", lambda x: f"~ {x['path']}  {x['from']!r} -> {x['to']!r}")
+    show("renumbered", lambda x: f"> {x['from']} -> {x['to']}  {x['title']}")
+    show("verses_moved", lambda x: f"{x['verse']}: {', '.join(x['from'])} -> {', '.join(x['to'])}")
+    show("verses_placed", lambda x: f"{x['verse']}: -> {', '.join(x['to'])}")
+    show("verses_unplaced", lambda x: f"{x['verse']}: {', '.join(x['from'])} ->")
+    show("first_verse_changed", lambda x: f"{x['path']}: {x['from']} -> {x['to']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic diff of two verse_hierarchy_map.json revisions.")
+    parser.add_argument("old", nargs="?", default="HEAD", help="git revision, JSON file or - (default: HEAD)")
+    parser.add_argument("new", nargs="?", default=WORKTREE, help="git revision, JSON file or - (default: working tree)")
+    parser.add_argument("--text", default="bodhicaryavatara", help="text id (default: bodhicaryavatara)")
+    parser.add_argument("--json", action="store_true", help="print the full diff as JSON")
+    parser.add_argument("--limit", type=int, default=25, help="items listed per category in the summary (default 25)")
+    args = parser.parse_args()
+
+    hierarchy_path = TEXTS_DIR / args.text / HIERARCHY_NAME
+    old_label, old_data = load_side(args.old, hierarchy_path)
+    new_label, new_data = load_side(args.new, hierarchy_path)
+    result = diff(Flat(old_data), Flat(new_data))
+
+    if args.json:
+        print(json.dumps({"text": args.text, "old": old_label, "new": new_label, **result},
+                         ensure_ascii=False, indent=2))
+    else:
+        print_summary(result, old_label, new_label, args.limit)
+    return 0 if is_empty(result) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,14 @@ When a section has non-consecutive verses, reassign outliers to the preceding ve
 """
 import json
 import re
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parent.parent
-MAPPING_PATH = ROOT / "texts" / "verse_commentary_mapping.txt"
-JSON_PATH = ROOT / "texts" / "verse_hierarchy_map.json"
+from hierarchy_json import write_hierarchy_json
+from hierarchy_lookup import apply_lookup_tables
+from text_assets import TEXTS_DIR
+
+TEXT_ID = "bodhicaryavatara"
+MAPPING_PATH = TEXTS_DIR / TEXT_ID / "verse_commentary_mapping.txt"
+JSON_PATH = TEXTS_DIR / TEXT_ID / "verse_hierarchy_map.json"
 
 
 def verse_sort_key(v):
@@ -52,6 +55,8 @@ def main():
 
     def walk(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             p = n.get("path", "")
             if p:
                 path_to_node[p] = n
@@ -153,6 +158,8 @@ def main():
     # Rebuild section verses from verse_to_section (verses may have been moved)
     def clear_verses(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             n["verses"] = []
             clear_verses(n.get("children", []))
 
@@ -166,6 +173,8 @@ def main():
     # Sort verses in each node
     def sort_nodes(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             if "verses" in n:
                 n["verses"] = sorted(n["verses"], key=verse_sort_key)
             sort_nodes(n.get("children", []))
@@ -176,13 +185,16 @@ def main():
     def collect_all(node):
         v = set(node.get("verses", []))
         for c in node.get("children", []):
-            v.update(collect_all(c))
+            if isinstance(c, dict):
+                v.update(collect_all(c))
         return v
 
     section_to_first = {}
 
     def build_first(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             p = n.get("path", "")
             if p:
                 all_v = list(collect_all(n))
@@ -195,7 +207,7 @@ def main():
     data["sectionToFirstVerse"] = section_to_first
     data["verseToPath"] = new_verse_to_path
 
-    JSON_PATH.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_hierarchy_json(JSON_PATH, apply_lookup_tables(data, TEXT_ID))
     print("Enforced consecutiveness. Verses in verseToPath:", len(new_verse_to_path))
 
 
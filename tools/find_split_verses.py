@@ -15,9 +15,11 @@ So the verse is quoted as ab (2 lines) then later cd (2 lines) in a different su
 import re
 from pathlib import Path
 
+from line_index import LineIndex
+
 ROOT = Path(__file__).resolve().parent.parent
-MAPPING = ROOT / "texts" / "verse_commentary_mapping.txt"
-BCV_ROOT = ROOT / "texts" / "bcv-root"
+MAPPING = ROOT / "texts" / "bodhicaryavatara" / "verse_commentary_mapping.txt"
+BCV_ROOT = ROOT / "texts" / "bodhicaryavatara" / "bcv-root"
 
 
 def is_verse_tag(s):
@@ -175,25 +177,22 @@ def main(validate_with_root=True):
     return seen
 
 
-def already_split(lines, c, v):
-    """Check if verse c.v already has ab/cd tags."""
-    ab_tag = f"[{c}.{v}ab]"
-    cd_tag = f"[{c}.{v}cd]"
-    for line in lines:
-        if ab_tag in line or cd_tag in line:
-            return True
-    return False
+def already_split(index, c, v):
+    """Check if verse c.v already has ab/cd tags (regex over the mapped file, no decoding)."""
+    tag = re.compile(rb"\[" + re.escape(f"{c}.{v}".encode()) + rb"(?:ab|cd)\]")
+    return index.search(tag) is not None
 
 
 def apply_splits(splits_dict):
     """Replace [C.V] with [C.Vab] and insert [C.Vcd] before cd subsection for each verse."""
-    lines = MAPPING.read_text(encoding="utf-8").split("\n")
     # Filter out already-split
-    to_apply = {
-        (c, v): (tag_ln, sub_ln)
-        for (c, v), (tag_ln, sub_ln) in splits_dict.items()
-        if not already_split(lines, c, v)
-    }
+    with LineIndex(MAPPING) as index:
+        to_apply = {
+            (c, v): (tag_ln, sub_ln)
+            for (c, v), (tag_ln, sub_ln) in splits_dict.items()
+            if not already_split(index, c, v)
+        }
+    lines = MAPPING.read_text(encoding="utf-8").split("\n")
     # Build insert and replace maps (0-based indices)
     insert_before = {}  # line_idx -> list of tags to insert
     replace_at = {}     # line_idx -> new tag
@@ -1,23 +1,24 @@
 #!/usr/bin/env python3
 """Fix >>> markers in verse_commentary_mapping.txt so they indicate ONLY root text.
 Uses root_text.txt (or bcv-root) as canonical text and, when available,
-bcv_parsed.json for verse-aware add-marker matching."""
+bcv_parsed.json for verse-aware marking: every line quoted after a verse
+anchor is decided by tools/verse_alignment.py, one aligned pass per chapter."""
 
 import json
 import re
 import argparse
-from difflib import SequenceMatcher
+import subprocess
 from pathlib import Path
 
+from verse_alignment import ChapterAligner, anchor_of, chapter_spans
+
 ROOT = Path(__file__).resolve().parent.parent
-ROOT_TEXT = ROOT / "texts" / "root_text.txt"
-BCV_ROOT = ROOT / "texts" / "bcv-root"
-PARSED = ROOT / "texts" / "bcv_parsed.json"
-MAPPING = ROOT / "texts" / "verse_commentary_mapping.txt"
-
-VERSE_NUM_RE = re.compile(r"^\s*(\d+)\.(\d+)\s*$")
-VERSE_TAG_RE = re.compile(r"^\[\d+\.\d+")
-SPLIT_TAG_RE = re.compile(r"^\[(\d+)\.(\d+)(ab|cd)\]\s*$")
+TEXT_DIR = ROOT / "texts" / "bodhicaryavatara"
+ROOT_TEXT = TEXT_DIR / "root_text.txt"
+BCV_ROOT = TEXT_DIR / "bcv-root"
+PARSED = TEXT_DIR / "bcv_parsed.json"
+MAPPING = TEXT_DIR / "verse_commentary_mapping.txt"
+
 SECTION_HDR_RE = re.compile(r"^\d+(\.\d+)*\.\s+")
 TOKEN_RE = re.compile(r"[A-Za-z0-9āīūṛṅñṭḍṇśṣ]+")
 
@@ -155,16 +156,10 @@ def _root_match_kind(
     return None
 
 
-def load_parsed_verse_map(path: Path) -> dict[str, list[str]]:
-    """Load canonical verse line-splits from bcv_parsed.json if available."""
-    if not path.exists():
-        return {}
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-    refs = data.get("refs")
-    verses = data.get("verses")
+def verse_map_from_parsed(data) -> dict[str, list[str]]:
+    """ref -> canonical lines from decoded bcv_parsed.json content."""
+    refs = data.get("refs") if isinstance(data, dict) else None
+    verses = data.get("verses") if isinstance(data, dict) else None
     if not isinstance(refs, list) or not isinstance(verses, list) or len(refs) != len(verses):
         return {}
     out: dict[str, list[str]] = {}
@@ -177,186 +172,97 @@ def load_parsed_verse_map(path: Path) -> dict[str, list[str]]:
     return out
 
 
-def is_boundary_line(stripped: str) -> bool:
-    """True if stripped line marks boundary between verse text and other content."""
-    return bool(
-        VERSE_TAG_RE.match(stripped)
-        or VERSE_NUM_RE.match(stripped)
-        or SECTION_HDR_RE.match(stripped)
-        or stripped.startswith("[ Image:")
-    )
-
-
-def line_matches_canonical(candidate: str, canonical: str) -> bool:
-    """Tolerant match for a mapping line (or merged lines) against canonical verse line."""
-    if candidate.strip().endswith(":") and not canonical.strip().endswith(":"):
-        return False
+def load_parsed_verse_map(path: Path) -> dict[str, list[str]]:
+    """Load canonical verse line-splits from bcv_parsed.json if available."""
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return verse_map_from_parsed(data)
 
-    a = normalize_loose(candidate)
-    b = normalize_loose(canonical)
-    if not a or not b:
-        return False
-    if a == b:
-        return True
 
-    ta = tokenize(a)
-    tb = tokenize(b)
-    if not ta or not tb:
-        return False
-    if ta == tb:
-        return True
-
-    if (
-        len(ta) >= 2
-        and _tokens_contiguous_subseq(ta, tb)
-        and len(tb) <= len(ta) + 6
-    ) or (
-        len(tb) >= 2
-        and _tokens_contiguous_subseq(tb, ta)
-        and len(ta) <= len(tb) + 6
-    ):
-        return True
-
-    sim = SequenceMatcher(None, a, b).ratio()
-    if sim >= 0.86:
-        return True
-    if len(ta) >= 3 and len(tb) >= 3 and ta[:3] == tb[:3] and sim >= 0.72:
-        return True
-
-    overlap = len(set(ta) & set(tb)) / max(1, min(len(set(ta)), len(set(tb))))
-    return overlap >= 0.82 and abs(len(ta) - len(tb)) <= 4
-
-
-def add_missing_markers_by_split_tags(lines: list[str], verse_map: dict[str, list[str]]) -> int:
-    """Add >>> markers in [C.Vab]/[C.Vcd] split sections without C.V number line."""
-    added = 0
-    for i, line in enumerate(lines):
-        m = SPLIT_TAG_RE.match(line.strip())
-        if not m:
-            continue
-        ref = f"{int(m.group(1))}.{int(m.group(2))}"
-        part = m.group(3)
-        canonical = verse_map.get(ref)
-        if not canonical:
+def apply_alignment(
+    lines: list[str],
+    decisions,
+    root_lines: set[str],
+    root_loose: set[str],
+    token_index: dict[str, list[list[str]]],
+) -> tuple[set[int], list[tuple[int, str, str]]]:
+    """Apply aligned >>> decisions in place; returns (decided line indexes, [(index, before, after)]).
+
+    A marked line the alignment rejects keeps its marker when it is still root
+    text elsewhere (e.g. a verse quoted under a neighbouring verse's anchor).
+    """
+    decided: set[int] = set()
+    changes: list[tuple[int, str, str]] = []
+    for d in decisions:
+        if d.line in decided:
             continue
+        decided.add(d.line)
+        line = lines[d.line]
+        if d.is_root and not has_marker(line):
+            lines[d.line] = ">>> " + line
+        elif not d.is_root and has_marker(line):
+            norm = normalize(strip_marker(line))
+            if _root_match_kind(norm, root_lines, root_loose, token_index) is None:
+                lines[d.line] = strip_marker(line)
+        if lines[d.line] != line:
+            changes.append((d.line, line, lines[d.line]))
+    return decided, changes
+
+
+def mark_by_alignment(
+    lines: list[str],
+    verse_map: dict[str, list[str]],
+    root_lines: set[str],
+    root_loose: set[str],
+    token_index: dict[str, list[list[str]]],
+) -> tuple[set[int], int, int]:
+    """Decide >>> for every line quoted after a verse anchor, one aligned pass per chapter.
 
-        if part == "ab":
-            targets = canonical[:2]
-        else:
-            targets = canonical[2:] if len(canonical) > 2 else canonical[-2:]
-        if not targets:
-            continue
+    Returns (decided line indexes, added, removed).
+    """
+    aligner = ChapterAligner(verse_map)
+    spans = chapter_spans(lines) or [(0, 0, len(lines))]
+    decisions = [d for _chapter, start, stop in spans for d in aligner.align(lines, start, stop)]
+    decided, changes = apply_alignment(lines, decisions, root_lines, root_loose, token_index)
+    added = sum(1 for _i, _before, after in changes if has_marker(after))
+    return decided, added, len(changes) - added
 
-        j = i + 1
-        t_idx = 0
-        scanned = 0
-        max_scanned = len(targets) * 6 + 8
-        while t_idx < len(targets) and j < len(lines) and scanned <= max_scanned:
-            stripped = lines[j].strip()
-            if not stripped:
-                j += 1
-                continue
-            if VERSE_TAG_RE.match(stripped) or VERSE_NUM_RE.match(stripped):
-                break
-            if SECTION_HDR_RE.match(stripped) or stripped.startswith("[ Image:"):
-                j += 1
-                continue
-
-            scanned += 1
-            raw = strip_marker(lines[j]).strip()
-            if len(raw) > 120:
-                j += 1
-                continue
-            if line_matches_canonical(raw, targets[t_idx]):
-                if not has_marker(lines[j]):
-                    lines[j] = ">>> " + lines[j]
-                    added += 1
-                t_idx += 1
-                j += 1
-                continue
-
-            # Two-line merge fallback for split/merged line variants.
-            if j + 1 < len(lines) and not raw.endswith(":"):
-                next_stripped = lines[j + 1].strip()
-                if next_stripped and not (
-                    VERSE_TAG_RE.match(next_stripped)
-                    or VERSE_NUM_RE.match(next_stripped)
-                    or SECTION_HDR_RE.match(next_stripped)
-                    or next_stripped.startswith("[ Image:")
-                ):
-                    merged = f"{raw} {strip_marker(lines[j + 1]).strip()}".strip()
-                    if line_matches_canonical(merged, targets[t_idx]):
-                        for idx in (j, j + 1):
-                            if not has_marker(lines[idx]):
-                                lines[idx] = ">>> " + lines[idx]
-                                added += 1
-                        t_idx += 1
-                        j += 2
-                        continue
-            j += 1
-    return added
 
+def changed_refs(old_map: dict[str, list[str]], new_map: dict[str, list[str]]) -> list[str]:
+    """Refs whose canonical lines differ between two verse maps (added and removed refs included)."""
+    return [ref for ref in dict.fromkeys([*new_map, *old_map]) if old_map.get(ref) != new_map.get(ref)]
 
-def add_missing_markers_by_verse(lines: list[str], verse_map: dict[str, list[str]]) -> int:
-    """Add >>> markers by aligning each C.V block with canonical verse lines."""
-    added = 0
-    for i, line in enumerate(lines):
-        m = VERSE_NUM_RE.match(line.strip())
-        if not m:
-            continue
-        ref = f"{int(m.group(1))}.{int(m.group(2))}"
-        canonical = verse_map.get(ref)
-        if not canonical:
-            continue
 
-        j = i + 1
-        cidx = 0
-        matched_any = False
-        scanned = 0
-        max_scanned = len(canonical) * 3 + 2
-
-        while cidx < len(canonical) and j < len(lines) and scanned <= max_scanned:
-            while j < len(lines) and not lines[j].strip():
-                j += 1
-            if j >= len(lines):
-                break
-
-            stripped = lines[j].strip()
-            if is_boundary_line(stripped):
-                break
-
-            scanned += 1
-            raw = strip_marker(lines[j]).strip()
-            if len(raw) > 120:
-                break
-            canon_line = canonical[cidx]
-            to_mark = None
-
-            if line_matches_canonical(raw, canon_line):
-                to_mark = [j]
-            elif j + 1 < len(lines) and not raw.endswith(":"):
-                next_stripped = lines[j + 1].strip()
-                if next_stripped and not is_boundary_line(next_stripped):
-                    merged = f"{raw} {strip_marker(lines[j + 1]).strip()}".strip()
-                    if line_matches_canonical(merged, canon_line):
-                        to_mark = [j, j + 1]
-
-            if to_mark is None:
-                if matched_any:
-                    break
-                break
-
-            for idx in to_mark:
-                if lines[idx].strip() and not has_marker(lines[idx]):
-                    lines[idx] = ">>> " + lines[idx]
-                    added += 1
-
-            matched_any = True
-            cidx += 1
-            j = to_mark[-1] + 1
-
-    added += add_missing_markers_by_split_tags(lines, verse_map)
-    return added
+def remark_changed_verses(
+    lines: list[str],
+    refs: list[str],
+    verse_map: dict[str, list[str]],
+    root_lines: set[str],
+    root_loose: set[str],
+    token_index: dict[str, list[list[str]]],
+) -> list[tuple[int, str, str]]:
+    """Re-align only the anchors of `refs` and apply the result; returns the changed lines."""
+    wanted = set(refs)
+    anchors = [
+        i for i, line in enumerate(lines)
+        if (a := anchor_of(strip_marker(line.strip()))) and a[0] in wanted
+    ]
+    decisions = ChapterAligner(verse_map).align_anchors(lines, anchors)
+    _decided, changes = apply_alignment(lines, decisions, root_lines, root_loose, token_index)
+    return changes
+
+
+def load_parsed_verse_map_at(rev: str, path: Path = PARSED) -> dict[str, list[str]]:
+    """load_parsed_verse_map for the parsed JSON as committed at git revision `rev`."""
+    rel = path.resolve().relative_to(ROOT).as_posix()
+    content = subprocess.run(
+        ["git", "show", f"{rev}:{rel}"], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return verse_map_from_parsed(json.loads(content))
 
 
 def add_missing_markers_fallback(lines: list[str], root_lines: set[str]) -> int:
@@ -389,14 +295,18 @@ def fix_mapping(
     had_trailing_newline = content.endswith("\n")
     lines = content.splitlines()
 
-    total_marked = 0
+    total_marked = sum(1 for line in lines if has_marker(line))
     removed = 0
     fuzzy_kept = 0
 
+    decided: set[int] = set()
+    added = 0
+    if verse_map:
+        decided, added, removed = mark_by_alignment(lines, verse_map, root_lines, root_loose, token_index)
+
     for i, line in enumerate(lines):
-        if not has_marker(line):
+        if i in decided or not has_marker(line):
             continue
-        total_marked += 1
         norm = normalize(strip_marker(line))
         kind = _root_match_kind(norm, root_lines, root_loose, token_index)
         if kind is None:
@@ -405,9 +315,7 @@ def fix_mapping(
         elif kind != "exact":
             fuzzy_kept += 1
 
-    if verse_map:
-        added = add_missing_markers_by_verse(lines, verse_map)
-    else:
+    if not verse_map:
         added = add_missing_markers_fallback(lines, root_lines)
 
     out = "\n".join(lines)
@@ -418,6 +326,27 @@ def fix_mapping(
     return total_marked, removed, fuzzy_kept, added
 
 
+def fix_mapping_incremental(
+    root_lines: set[str],
+    root_loose: set[str],
+    token_index: dict[str, list[list[str]]],
+    verse_map: dict[str, list[str]],
+    refs: list[str],
+    mapping_path: Path,
+    write_changes: bool = True,
+) -> list[tuple[int, str, str]]:
+    """Re-mark just the windows after the anchors of `refs`; returns [(line index, before, after)]."""
+    content = mapping_path.read_text(encoding="utf-8")
+    lines = content.splitlines()
+    changes = remark_changed_verses(lines, refs, verse_map, root_lines, root_loose, token_index)
+    if changes and write_changes:
+        out = "\n".join(lines)
+        if content.endswith("\n"):
+            out += "\n"
+        mapping_path.write_text(out, encoding="utf-8")
+    return changes
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fix >>> markers in verse commentary mapping.")
     parser.add_argument(
@@ -425,6 +354,12 @@ def main():
         action="store_true",
         help="Compute and print proposed marker changes without writing the mapping file.",
     )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV_OR_JSON",
+        help="Incremental mode: re-mark only verses whose text differs from this git revision "
+             "(or older parsed JSON file) of bcv_parsed.json, and list every line changed.",
+    )
     args = parser.parse_args()
 
     src = get_root_source()
@@ -436,6 +371,29 @@ def main():
         print(f"Verse map loaded from {PARSED}: {len(verse_map)} refs")
     else:
         print("Verse map unavailable; using fallback add-marker mode.")
+
+    if args.changed_since:
+        if not verse_map:
+            raise SystemExit("--changed-since needs bcv_parsed.json")
+        old_path = Path(args.changed_since)
+        if old_path.is_file():
+            old_map = load_parsed_verse_map(old_path)
+        else:
+            old_map = load_parsed_verse_map_at(args.changed_since)
+        refs = changed_refs(old_map, verse_map)
+        print(f"Changed verses since {args.changed_since}: {', '.join(refs) if refs else 'none'}")
+        changes = fix_mapping_incremental(
+            root_lines, root_loose, token_index, verse_map, refs, MAPPING,
+            write_changes=not args.dry_run,
+        )
+        for index, before, after in changes:
+            print(f"  line {index + 1}: {before!r} -> {after!r}")
+        print(f">>> lines changed: {len(changes)}")
+        if args.dry_run or not changes:
+            print(f"No changes written to {MAPPING}")
+        else:
+            print(f"Wrote {MAPPING}")
+        return
     total, removed, fuzzy_kept, added = fix_mapping(
         root_lines,
         root_loose,
@@ -0,0 +1,82 @@
+"""Streaming, atomic writer for verse_hierarchy_map.json.
+
+Produces byte-for-byte the same output as
+json.dump(data, f, indent=2, ensure_ascii=False), but encodes one section /
+verseToPath entry / sectionToFirstVerse entry at a time instead of building
+the whole document in memory. Output goes to a temp file in the same
+directory and is renamed over the target only once it is complete, so a crash
+mid-write leaves the shipped asset untouched.
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+INDENT = "  "
+
+_encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _write_value(f, value, level):
+    """Encode [value] as if it sat [level] indents deep in an indent=2 dump."""
+    pad = "\n" + INDENT * level
+    # JSON strings escape newlines, so every "\n" in the encoder output is layout.
+    for chunk in _encoder.iterencode(value):
+        f.write(chunk.replace("\n", pad))
+
+
+def _write_container(f, value, level):
+    """Write a list/dict one member at a time; members are encoded independently."""
+    inner = INDENT * (level + 1)
+    if isinstance(value, dict):
+        open_, close = "{", "}"
+        members = value.items()
+    else:
+        open_, close = "[", "]"
+        members = ((None, v) for v in value)
+    f.write(open_)
+    first = True
+    for key, member in members:
+        f.write("\n" + inner if first else ",\n" + inner)
+        first = False
+        if key is not None:
+            f.write(json.dumps(key, ensure_ascii=False) + ": ")
+        _write_value(f, member, level + 1)
+    f.write("\n" + INDENT * level + close)
+
+
+def dump_hierarchy(data, f):
+    """Stream [data] (the hierarchy map dict) into text file [f]."""
+    if not isinstance(data, dict) or not data:
+        _write_value(f, data, 0)
+        return
+    f.write("{")
+    first = True
+    for key, value in data.items():
+        f.write("\n" + INDENT if first else ",\n" + INDENT)
+        first = False
+        f.write(json.dumps(key, ensure_ascii=False) + ": ")
+        if isinstance(value, (list, dict)) and value:
+            _write_container(f, value, 1)
+        else:
+            _write_value(f, value, 1)
+    f.write("\n}")
+
+
+def write_hierarchy_json(path, data):
+    """Atomically replace [path] with the indent=2 JSON encoding of [data]."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            dump_hierarchy(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
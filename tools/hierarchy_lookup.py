@@ -0,0 +1,186 @@
+"""Lookup tables precomputed into verse_hierarchy_map.json for VerseHierarchyService.
+
+Everything here mirrors what lib/services/verse_hierarchy_service.dart would
+otherwise derive from the sections tree at runtime (regex scans over
+verseToPath, tree walks, sorting), so the app only does map lookups:
+
+    verseToSegments       base ref -> its segment refs ("9.27" -> ["9.27ab", "9.27cd"])
+    sectionToOwnRefs      path -> refs listed on that section, in tree order
+    sectionToTreeRefs     path -> refs on the section and every section under it
+    sectionToVerseRange   path -> [first, last] displayable ref of the section's
+                          range ([] when none is displayable, [ref] for one)
+    navigableSections     reader arrow-key order: {path, title, depth, firstVerse}
+
+The tables are rebuilt from `sections` and `verseToPath` as a whole; the Dart
+side falls back to computing them when a key is missing.
+"""
+import functools
+import re
+
+from text_assets import iter_nodes, path_sort_key
+
+LOOKUP_KEYS = (
+    "verseToSegments",
+    "sectionToOwnRefs",
+    "sectionToTreeRefs",
+    "sectionToVerseRange",
+    "navigableSections",
+)
+
+BASE_REF_RE = re.compile(r"^(\d+)\.(\d+)")
+SEGMENT_REF_RE = re.compile(r"^(\d+\.\d+)[a-z]+$", re.IGNORECASE)
+SEGMENT_SUFFIX_RE = re.compile(r"[a-d]+$")
+BASE_VERSE_RE = re.compile(r"^\d+\.\d+")
+
+# Mirrors _hiddenBaseRefsByText in lib/utils/verse_ref_formatter.dart.
+HIDDEN_BASE_REFS = {
+    "friendlyletter": {"1.124"},
+}
+
+
+def compare_refs_full(a, b):
+    """VerseHierarchyService._compareVerseRefsFull: chapter, verse, then the full string."""
+    am, bm = BASE_REF_RE.match(a), BASE_REF_RE.match(b)
+    if am and bm:
+        ka = (int(am.group(1)), int(am.group(2)))
+        kb = (int(bm.group(1)), int(bm.group(2)))
+        if ka != kb:
+            return -1 if ka < kb else 1
+    return (a > b) - (a < b)
+
+
+ref_key = functools.cmp_to_key(compare_refs_full)
+
+
+def is_displayable(text_id, ref):
+    """verse_ref_formatter.isVerseRefDisplayable."""
+    ref = ref.strip()
+    if not ref:
+        return False
+    m = BASE_REF_RE.match(ref)
+    if not m:
+        return True
+    if m.group(1) == "0":
+        return False
+    return f"{m.group(1)}.{m.group(2)}" not in HIDDEN_BASE_REFS.get(text_id, ())
+
+
+def normalize_for_first_ref(refs):
+    """Drop a base ref when one of its segments is also present (keep 4.27cd, drop 4.27)."""
+    refs = set(refs)
+    bases = set()
+    for ref in refs:
+        m = SEGMENT_SUFFIX_RE.search(ref) and BASE_VERSE_RE.match(ref)
+        if m:
+            bases.add(m.group(0))
+    return {r for r in refs if SEGMENT_SUFFIX_RE.search(r) or r not in bases}
+
+
+def _own_refs(sections):
+    own = {}
+    for node, _ in iter_nodes(sections):
+        path = str(node.get("path") or "")
+        for ref in node.get("verses") or []:
+            ref = str(ref or "")
+            if path and ref:
+                own.setdefault(path, {})[ref] = None
+    return {path: list(refs) for path, refs in own.items()}
+
+
+def _chain_refs(verse_to_path, own):
+    """The Dart sectionToRefsIndex: sections on a ref's breadcrumb, plus own refs."""
+    out = {}
+    for ref, chain in verse_to_path.items():
+        for item in chain if isinstance(chain, list) else ():
+            if isinstance(item, dict):
+                section = str(item.get("section") or item.get("path") or "")
+                if section:
+                    out.setdefault(section, set()).add(ref)
+    for path, refs in own.items():
+        out.setdefault(path, set()).update(refs)
+    return out
+
+
+def _tree_refs(own):
+    """Own refs of each path plus those of every path it prefixes."""
+    out = {}
+    for path, refs in own.items():
+        parts = path.split(".")
+        for i in range(len(parts), 0, -1):
+            out.setdefault(".".join(parts[:i]), set()).update(refs)
+    return out
+
+
+def _navigable_sections(sections, own, chain):
+    found = []
+
+    def visit(node, depth):
+        if not isinstance(node, dict):
+            return set()
+        path = str(node.get("path") or "")
+        title = str(node.get("title") or "")
+        children = node.get("children")
+        child_refs = set()
+        if isinstance(children, list):
+            for child in children:
+                child_refs |= visit(child, depth + 1)
+        section_refs = chain.get(path, set())
+        own_refs = set(own.get(path, ()))
+        if isinstance(children, list) and children:
+            navigable = own_refs - child_refs
+        else:
+            navigable = own_refs or section_refs
+        if path and title and navigable:
+            first = min(normalize_for_first_ref(navigable), key=ref_key)
+            found.append({"path": path, "title": title, "depth": depth, "firstVerse": first})
+        return section_refs | child_refs
+
+    for top in sections:
+        visit(top, 0)
+    return sorted(found, key=lambda e: ref_key(e["firstVerse"]))
+
+
+def build_lookup_tables(data, text_id):
+    """The LOOKUP_KEYS tables for one hierarchy map dict."""
+    sections = data.get("sections") or []
+    verse_to_path = data.get("verseToPath") or {}
+    own = _own_refs(sections)
+    chain = _chain_refs(verse_to_path, own)
+    tree = _tree_refs(own)
+
+    segments = {}
+    for ref in set(verse_to_path) | {r for refs in own.values() for r in refs}:
+        m = SEGMENT_REF_RE.match(ref)
+        if m:
+            segments.setdefault(m.group(1), []).append(ref)
+
+    ranges = {}
+    for node, _ in iter_nodes(sections):
+        path = str(node.get("path") or "")
+        if not path or not node.get("title") or path in ranges:
+            continue
+        refs = own.get(path) or tree.get(path) or chain.get(path)
+        if not refs:
+            continue
+        shown = [r for r in sorted(refs, key=ref_key) if is_displayable(text_id, r)]
+        ranges[path] = shown[:1] + shown[-1:] if len(shown) > 1 else shown
+
+    by_path = lambda kv: path_sort_key(kv[0])  # noqa: E731
+    return {
+        "verseToSegments": {
+            base: sorted(refs, key=ref_key)
+            for base, refs in sorted(segments.items(), key=lambda kv: ref_key(kv[0]))
+        },
+        "sectionToOwnRefs": own,
+        "sectionToTreeRefs": {p: sorted(r, key=ref_key) for p, r in sorted(tree.items(), key=by_path)},
+        "sectionToVerseRange": dict(sorted(ranges.items(), key=by_path)),
+        "navigableSections": _navigable_sections(sections, own, chain),
+    }
+
+
+def apply_lookup_tables(data, text_id):
+    """Replace the LOOKUP_KEYS tables in [data] in place; returns [data]."""
+    for key in LOOKUP_KEYS:
+        data.pop(key, None)
+    data.update(build_lookup_tables(data, text_id))
+    return data
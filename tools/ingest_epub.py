@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Draft a text's assets straight from its EPUB, without unpacking it.
+
+The OPF spine is read from the zip and every XHTML item is streamed through an
+incremental HTML parser in CHUNK-sized pieces, so only the open paragraph,
+the current stanza and the outline headings are held at a time; nothing
+proportional to the book's size is buffered. One pass over the spine yields:
+
+    <id>_parsed.json              verses, captions, refs, chapters
+    verse_commentary_mapping.txt  [refs] / Section (path): title / first commentary paragraph
+    verse_hierarchy_map.json      outline skeleton with verses, verseToPath, sectionToFirstVerse
+                                  and the app lookup tables
+
+Root verses are the stanzas whose first line is a bare verse number ("12");
+plain prose just before the first of them and just after the last becomes the
+"0.n" title/homage and colophon entries. A spine item that quotes those
+verses in bold (a bold number line, then bold continuation stanzas) is
+commentary: its numbered headings ("2. The main practice") form the outline.
+Headings only carry their ordinal among siblings, so nesting is inferred:
+"1." opens a child of the previous heading, "n." continues the deepest open
+level whose last child was n-1. The "<ol>" a heading announces its parts
+with, and "[End of 'n. Title']" notes, settle the ambiguous cases. A verse
+quoted across several sections gets line-letter parts (1.11abc, 1.11de).
+
+The results are drafts to review, so they are written to exports/epub/<id>/
+unless --out says otherwise, and existing files are only replaced with
+--force.
+
+    python3 tools/ingest_epub.py texts/lampofthepath/Full-Illumination-of-the-Path-to-Enlightenment-Generic.epub
+    python3 tools/ingest_epub.py book.epub --text-id mytext --out texts/mytext --force
+"""
+import argparse
+import io
+import json
+import posixpath
+import re
+import sys
+import unicodedata
+import xml.etree.ElementTree as ET
+import zipfile
+from html.parser import HTMLParser
+from pathlib import Path
+
+from hierarchy_json import write_hierarchy_json
+from hierarchy_lookup import apply_lookup_tables
+from text_assets import ROOT, iter_nodes, parsed_json_path
+
+CHUNK = 64 * 1024
+MAX_PROSE = 8  # paragraphs kept around the root verses as title/homage/colophon candidates
+PART_LETTERS = "abcdefghijklmnop"
+
+VERSE_NUMBER_RE = re.compile(r"^(\d+)$")
+NUMBERED_HEADING_RE = re.compile(r"^(\d+)\.\s+(.+)$")
+END_NOTE_RE = re.compile(r"^\[End of\s+[‘'\"“]?(\d+)\.\s+(.+?)[’'\"”]?\]$", re.IGNORECASE)
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BLOCK_TAGS = HEADING_TAGS | {"p", "li", "title"}
+SKIP_TAGS = {"sup", "script", "style"}
+OPF_NS = {"opf": "http://www.idpf.org/2007/opf"}
+CONTAINER_NS = {"c": "urn:oasis:names:tc:opendocument:xmlns:container"}
+
+
+def spine_items(epub):
+    """Zip member names of the OPF spine's XHTML items, in reading order."""
+    container = ET.fromstring(epub.read("META-INF/container.xml"))
+    rootfile = container.find(".//c:rootfile", CONTAINER_NS).get("full-path")
+    opf = ET.fromstring(epub.read(rootfile))
+    base = posixpath.dirname(rootfile)
+    manifest = {
+        item.get("id"): item
+        for item in opf.iterfind("opf:manifest/opf:item", OPF_NS)
+    }
+    items = []
+    for ref in opf.iterfind("opf:spine/opf:itemref", OPF_NS):
+        item = manifest.get(ref.get("idref"))
+        if item is not None and item.get("media-type") == "application/xhtml+xml":
+            items.append(posixpath.normpath(posixpath.join(base, item.get("href"))))
+    return items
+
+
+def clean(text):
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def fold(text):
+    return clean(text).replace("’", "'").replace("‘", "'").casefold()
+
+
+class XhtmlEvents(HTMLParser):
+    """Incremental XHTML parser that reports finished blocks to [ingest].
+
+    Calls ingest.block(tag, text, all_bold, quote) for every p/li/heading
+    (quote is "verse", "prose" or None for the enclosing blockquote),
+    ingest.stanza_end() / ingest.quote_end() when a stanza or blockquote
+    closes, and ingest.list_start() / ingest.list_end() around <ol>.
+    """
+
+    def __init__(self, ingest):
+        super().__init__(convert_charrefs=True)
+        self.ingest = ingest
+        self.stack = []
+        self.block = None  # [tag, text parts, non-bold letters/digits, bold letters/digits]
+        self.bold = 0
+        self.skip = 0
+
+    def _quote_kind(self):
+        for tag, classes in reversed(self.stack):
+            if tag == "blockquote":
+                return "verse" if "verse" in classes else "prose"
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        classes = set((dict(attrs).get("class") or "").split())
+        self.stack.append((tag, classes))
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in ("b", "strong"):
+            self.bold += 1
+        elif tag == "br" and self.block is not None:
+            self.block[1].append(" ")
+        elif tag == "ol":
+            self.ingest.list_start()
+        elif tag in BLOCK_TAGS and self.block is None:
+            self.block = [tag, [], 0, 0]
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, classes = self.stack.pop()
+            self._close(open_tag, classes)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag, classes):
+        if tag in SKIP_TAGS:
+            self.skip -= 1
+        elif tag in ("b", "strong"):
+            self.bold -= 1
+        elif tag == "ol":
+            self.ingest.list_end()
+        elif self.block is not None and tag == self.block[0]:
+            _, parts, plain, bold = self.block
+            self.block = None
+            text = clean("".join(parts))
+            if text:
+                self.ingest.block(tag, text, bold > 0 and plain == 0, self._quote_kind())
+        elif "stanza" in classes:
+            self.ingest.stanza_end()
+        elif tag == "blockquote":
+            self.ingest.quote_end()
+
+    def handle_data(self, data):
+        if self.block is None or self.skip:
+            return
+        self.block[1].append(data)
+        # Counting only letters and digits lets "<b>words</b>," still read as all bold.
+        visible = sum(ch.isalnum() for ch in data)
+        if self.bold:
+            self.block[3] += visible
+        else:
+            self.block[2] += visible
+
+
+class Section:
+    __slots__ = ("title", "ordinal", "children", "expected", "quotes", "commentary", "path")
+
+    def __init__(self, title, ordinal=0):
+        self.title = title
+        self.ordinal = ordinal
+        self.children = []
+        self.expected = None  # parts announced by the heading's <ol>, if any
+        self.quotes = []      # ("verse", (chapter, number), first line, line count) | ("prose", text)
+        self.commentary = None
+        self.path = ""
+
+
+class OutlineBuilder:
+    """Nests one spine item's numbered headings; see the module docstring."""
+
+    def __init__(self):
+        self.root = Section("")
+        self.stack = [self.root]
+        self.list_depth = 0
+        self.list_items = None
+
+    @property
+    def current(self):
+        return self.stack[-1]
+
+    def heading(self, ordinal, title):
+        node = Section(title, ordinal)
+        if ordinal == 1:
+            parent_at = len(self.stack) - 1
+        else:
+            parent_at = self._parent_for(ordinal)
+        del self.stack[parent_at + 1:]
+        self.stack[parent_at].children.append(node)
+        self.stack.append(node)
+
+    def _parent_for(self, ordinal):
+        levels = range(len(self.stack) - 2, -1, -1)
+        for k in levels:
+            parent, last = self.stack[k], self.stack[k + 1]
+            if last.ordinal == ordinal - 1 and (parent.expected is None or parent.expected >= ordinal):
+                return k
+        for k in levels:
+            if self.stack[k + 1].ordinal == ordinal - 1:
+                return k
+        for k in levels:
+            if self.stack[k + 1].ordinal < ordinal:
+                return k
+        return 0
+
+    def end_note(self, ordinal, title):
+        for k in range(len(self.stack) - 1, 0, -1):
+            node = self.stack[k]
+            if node.ordinal == ordinal and fold(node.title) == fold(title):
+                del self.stack[k + 1:]
+                return
+
+    def list_start(self):
+        self.list_depth += 1
+        node = self.current
+        if self.list_depth == 1 and not node.children and node.expected is None:
+            self.list_items = 0
+
+    def list_item(self):
+        if self.list_depth == 1 and self.list_items is not None:
+            self.list_items += 1
+
+    def list_end(self):
+        self.list_depth = max(0, self.list_depth - 1)
+        if self.list_depth == 0 and self.list_items is not None:
+            self.current.expected = self.list_items or None
+            self.list_items = None
+
+
+class EpubIngest:
+    """Consumes XhtmlEvents for every spine item and assembles the drafts."""
+
+    def __init__(self):
+        self.verses, self.refs, self.captions = [], [], []
+        self.chapters = []
+        self.prose_refs = 0
+        self.sections = []
+        self.warnings = []
+        self.quote_chapter, self.quote_last = 1, 0
+        self.quote_verse, self.quote_cursor = None, 0
+
+    # -- per item ---------------------------------------------------------
+
+    def begin_item(self, name):
+        self.item = name
+        self.doc_title = None
+        self.last_heading = None
+        self.stanza = []
+        self.prose = []           # paragraphs since the item start (before verses) or since the last verse
+        self.item_verses = 0
+        self.last_number = None
+        self.outline = OutlineBuilder()
+        self.quoted = False
+
+    def end_item(self):
+        self.stanza_end()
+        if self.item_verses:
+            self._add_prose(self.prose, "Colophon")
+            self._close_chapter()
+        if self.quoted:
+            self.sections.extend(self.outline.root.children)
+            if self.outline.root.quotes:
+                self.warnings.append(f"{self.item}: {len(self.outline.root.quotes)} quotes before the first heading")
+
+    # -- parser callbacks ---------------------------------------------------
+
+    def block(self, tag, text, all_bold, quote):
+        if tag == "title":
+            self.doc_title = text
+        elif tag in HEADING_TAGS:
+            self.last_heading = text
+            m = NUMBERED_HEADING_RE.match(text)
+            if m:
+                self.outline.heading(int(m.group(1)), m.group(2).strip())
+        elif tag == "li":
+            self.outline.list_item()
+        elif quote == "verse":
+            self.stanza.append((text, all_bold))
+        elif quote == "prose":
+            if all_bold:
+                self.outline.current.quotes.append(("prose", text))
+                self.quoted = True
+        else:
+            m = END_NOTE_RE.match(text)
+            if m:
+                self.outline.end_note(int(m.group(1)), m.group(2))
+                return
+            self.prose.append(text)
+            del self.prose[:-MAX_PROSE]
+            section = self.outline.current
+            if section.quotes and section.commentary is None:
+                section.commentary = text
+
+    def list_start(self):
+        self.outline.list_start()
+
+    def list_end(self):
+        self.outline.list_end()
+
+    def quote_end(self):
+        self.stanza_end()
+
+    def stanza_end(self):
+        lines, self.stanza = self.stanza, []
+        # A verse number can also start a verse in the middle of a stanza.
+        groups = []
+        for text, bold in lines:
+            if VERSE_NUMBER_RE.match(text) or not groups:
+                groups.append([])
+            groups[-1].append((text, bold))
+        for group in groups:
+            self._stanza_group(group)
+
+    def _stanza_group(self, lines):
+        m = VERSE_NUMBER_RE.match(lines[0][0])
+        bold = all(b for _, b in lines)
+        if m and (bold or self.quoted):
+            self._quote(int(m.group(1)), len(lines) - 1)
+        elif m:
+            self._root_verse(int(m.group(1)), [t for t, _ in lines[1:]])
+        elif bold and self.quote_verse is not None:
+            self._quote(None, len(lines))
+        elif self.item_verses and not self.prose:
+            # An unnumbered stanza right after a root verse continues it.
+            self.verses[-1] += "\n" + "\n".join(t for t, _ in lines)
+
+    # -- root verses ------------------------------------------------------
+
+    def _root_verse(self, number, lines):
+        if not self.item_verses:
+            if not self.refs:
+                self._add_prose(self.prose, None)
+            self._open_chapter()
+        elif number <= self.last_number:
+            self._close_chapter()
+            self._open_chapter()
+        elif self.prose:
+            self.warnings.append(f"{self.item}: prose between root verses before {number} dropped")
+        self.prose = []
+        chapter = len(self.chapters)
+        self.verses.append("\n".join(lines))
+        self.refs.append(f"{chapter}.{number}")
+        self.captions.append(f"Chapter {chapter}, Verse {number}")
+        self.item_verses += 1
+        self.last_number = number
+
+    def _add_prose(self, paragraphs, caption):
+        """Adds paragraphs as 0.n entries; caption None means opening matter (title, then homage)."""
+        for i, text in enumerate(paragraphs):
+            self.prose_refs += 1
+            self.verses.append(text)
+            self.refs.append(f"0.{self.prose_refs}")
+            self.captions.append(caption or ("Homage" if i else "Title"))
+        paragraphs.clear()
+
+    def _open_chapter(self):
+        title = self.last_heading or self.doc_title or self.item
+        if title.isupper() and self.doc_title and fold(self.doc_title) == fold(title):
+            title = self.doc_title
+        start = 0 if not self.chapters else len(self.verses)
+        self.chapters.append({"number": len(self.chapters) + 1, "title": title,
+                              "startVerseIndex": start, "endVerseIndex": start})
+
+    def _close_chapter(self):
+        if self.chapters:
+            self.chapters[-1]["endVerseIndex"] = len(self.verses)
+
+    # -- commentary quotes ----------------------------------------------------
+
+    def _quote(self, number, count):
+        if number is not None:
+            if number == 1 and self.quote_last > 1:
+                self.quote_chapter += 1
+            self.quote_last = number
+            self.quote_verse, self.quote_cursor = (self.quote_chapter, number), 0
+        self.outline.current.quotes.append(("verse", self.quote_verse, self.quote_cursor, count))
+        self.quote_cursor += count
+        self.quoted = True
+
+    # -- output -----------------------------------------------------------
+
+    def parsed(self):
+        return {"verses": self.verses, "captions": self.captions, "refs": self.refs, "chapters": self.chapters}
+
+    def resolve(self):
+        """Assign paths and turn every section's quotes into verse refs."""
+        line_counts = {ref: len(v.split("\n")) for ref, v in zip(self.refs, self.verses)}
+        prose = [(ref, fold(v)) for ref, v in zip(self.refs, self.verses) if ref.startswith("0.")]
+
+        def visit(nodes, prefix):
+            for i, node in enumerate(nodes, 1):
+                node.path = f"{prefix}{i}"
+                node.quotes = self._section_refs(node, line_counts, prose)
+                visit(node.children, node.path + ".")
+
+        visit(self.sections, "")
+
+    def _section_refs(self, node, line_counts, prose):
+        spans = {}
+        for quote in node.quotes:
+            if quote[0] == "prose":
+                text = fold(quote[1])
+                ref = next((r for r, v in prose if text in v or v in text), None)
+                if ref is None:
+                    self.warnings.append(f"section {node.path}: bold quote matches no title/colophon entry")
+                elif ref not in spans:
+                    spans[ref] = None
+                continue
+            _, (chapter, number), first, count = quote
+            ref = f"{chapter}.{number}"
+            lo, hi = spans.get(ref) or (first, first + count)
+            spans[ref] = (min(lo, first), max(hi, first + count))
+        refs = []
+        for ref, span in spans.items():
+            total = line_counts.get(ref)
+            if total is None and span is not None:
+                self.warnings.append(f"section {node.path}: quotes {ref}, which is not a root verse")
+            if span is None or total is None or (span[0] == 0 and span[1] >= total):
+                refs.append(ref)
+            else:
+                refs.append(ref + PART_LETTERS[span[0]:min(span[1], total)])
+        return refs
+
+    def hierarchy(self):
+        verse_to_path, first_verse = {}, {}
+
+        def node_json(node, chain):
+            chain = chain + [{"section": node.path, "title": node.title}]
+            for ref in node.quotes:
+                for key in dict.fromkeys((ref, re.sub(r"[a-z]+$", "", ref))):
+                    verse_to_path.setdefault(key, chain)
+            out = {"title": node.title, "path": node.path, "verses": list(node.quotes),
+                   "children": [node_json(c, chain) for c in node.children]}
+            firsts = node.quotes[:1] or [first_verse[c.path] for c in node.children if c.path in first_verse][:1]
+            if firsts:
+                first_verse[node.path] = firsts[0]
+            return out
+
+        sections = [node_json(n, []) for n in self.sections]
+        first_verse = {n["path"]: first_verse[n["path"]] for n, _ in iter_nodes(sections) if n["path"] in first_verse}
+        order = {}
+        for ref in self.refs:
+            order[ref] = len(order)
+        verse_to_path = dict(sorted(
+            verse_to_path.items(),
+            key=lambda kv: (order.get(re.sub(r"[a-z]+$", "", kv[0]), len(order)), kv[0]),
+        ))
+        return {"sections": sections, "verseToPath": verse_to_path, "sectionToFirstVerse": first_verse}
+
+    def quote_count(self):
+        stack = list(self.sections)
+        total = 0
+        while stack:
+            node = stack.pop()
+            total += len(node.quotes)
+            stack.extend(node.children)
+        return total
+
+    def mapping_lines(self, title):
+        yield f"{title}: Verse-to-Section Mapping"
+
+        def walk(nodes):
+            for node in nodes:
+                if node.quotes:
+                    yield ""
+                    yield " ".join(f"[{ref}]" for ref in node.quotes)
+                    yield f"Section ({node.path}): {node.title}"
+                    if node.commentary:
+                        yield node.commentary
+                yield from walk(node.children)
+
+        yield from walk(self.sections)
+
+
+def ingest(epub_path):
+    """Stream every spine item of [epub_path] through one EpubIngest."""
+    result = EpubIngest()
+    with zipfile.ZipFile(epub_path) as epub:
+        for name in spine_items(epub):
+            result.begin_item(name)
+            parser = XhtmlEvents(result)
+            with epub.open(name) as raw:
+                reader = io.TextIOWrapper(raw, encoding="utf-8")
+                while chunk := reader.read(CHUNK):
+                    parser.feed(chunk)
+            parser.close()
+            result.end_item()
+    result.resolve()
+    return result
+
+
+def write_outputs(result, out_dir, text_id, title, force):
+    targets = {
+        "parsed": out_dir / f"{text_id}_parsed.json",
+        "mapping": out_dir / "verse_commentary_mapping.txt",
+        "hierarchy": out_dir / "verse_hierarchy_map.json",
+    }
+    existing = [p for p in targets.values() if p.exists()]
+    if existing and not force:
+        sys.exit("refusing to overwrite " + ", ".join(str(p) for p in existing) + " (use --force)")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with targets["parsed"].open("w", encoding="utf-8") as f:
+        json.dump(result.parsed(), f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    with targets["mapping"].open("w", encoding="utf-8") as f:
+        for line in result.mapping_lines(title):
+            f.write(line + "\n")
+    write_hierarchy_json(targets["hierarchy"], apply_lookup_tables(result.hierarchy(), text_id))
+    return targets
+
+
+def compare_with_shipped(result, text_dir):
+    """One line comparing the drafted verses with the text's shipped *_parsed.json."""
+    shipped = parsed_json_path(text_dir)
+    if not shipped:
+        return None
+    data = json.loads(shipped.read_text(encoding="utf-8"))
+    have = {ref: fold(v) for ref, v in zip(data.get("refs") or [], data.get("verses") or [])}
+    same = sum(1 for ref, v in zip(result.refs, result.verses) if have.get(ref) == fold(v))
+    return f"{same}/{len(have)} verses identical to {shipped.relative_to(ROOT)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draft parsed/mapping/hierarchy assets from an EPUB.")
+    parser.add_argument("epub", type=Path)
+    parser.add_argument("--text-id", help="asset id (default: the EPUB's directory name)")
+    parser.add_argument("--title", help="mapping header title (default: the first chapter title)")
+    parser.add_argument("--out", type=Path, help="output directory (default: exports/epub/<text-id>)")
+    parser.add_argument("--force", action="store_true", help="overwrite existing output files")
+    args = parser.parse_args()
+
+    epub_path = args.epub.resolve()
+    text_id = args.text_id or epub_path.parent.name
+    result = ingest(epub_path)
+    if not result.refs:
+        sys.exit(f"{args.epub}: no numbered root-verse stanzas found")
+
+    title = args.title or result.chapters[0]["title"]
+    out_dir = (args.out or ROOT / "exports" / "epub" / text_id).resolve()
+    targets = write_outputs(result, out_dir, text_id, title, args.force)
+
+    print(f"{len(result.refs)} verses in {len(result.chapters)} chapters, "
+          f"{result.quote_count()} verse refs in {len(result.sections)} top-level commentary sections")
+    comparison = compare_with_shipped(result, epub_path.parent)
+    if comparison:
+        print(comparison)
+    for warning in result.warnings:
+        print(f"  warning: {warning}")
+    for path in targets.values():
+        print(f"wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
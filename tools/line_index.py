@@ -0,0 +1,150 @@
+"""Memory-mapped line-offset index for large text sources.
+
+Builds the byte offset of every line once, caches it under .cache/line_index/
+keyed by the file's sha256, and then serves any line range (or chapter /
+section span) by slicing the mmap and decoding only those bytes.
+
+    with LineIndex(ROOT / "texts" / "bodhicaryavatara" / "commentary.txt") as idx:
+        start, stop = idx.chapter_span(10)
+        lines = idx.lines(start, stop)
+
+Line numbers are 0-based and follow readlines() semantics: a trailing newline
+does not add an empty last line, and returned lines have no line ending.
+"""
+import hashlib
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / ".cache" / "line_index"
+
+
+def _ref_marker_re(chapter):
+    """A verse-number line ("10.4") or a ref tag ("[10.4]", "[10.4ab]", "... [10.4]") of [chapter]."""
+    return re.compile(
+        rb"^[ \t]*" + str(chapter).encode() + rb"\.\d+[a-z]*[ \t\r]*$"
+        rb"|\[" + str(chapter).encode() + rb"\.\d+",
+        re.MULTILINE,
+    )
+
+
+class LineIndex:
+    def __init__(self, path, cache_dir=CACHE_DIR):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        # mmap cannot map an empty file; an empty bytes object behaves the same for slicing.
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+        self.sha256 = hashlib.sha256(self._mm).hexdigest()
+        self.offsets = self._load_offsets(cache_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def _load_offsets(self, cache_dir):
+        cache_path = Path(cache_dir) / f"{self.sha256}.idx" if cache_dir else None
+        if cache_path is not None and cache_path.exists():
+            offsets = array("Q")
+            offsets.frombytes(cache_path.read_bytes())
+            return offsets
+        offsets = self._build_offsets()
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(offsets.tobytes())
+        return offsets
+
+    def _build_offsets(self):
+        """Start offset of every line, plus a final sentinel at EOF."""
+        offsets = array("Q", [0])
+        find = self._mm.find
+        pos = find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = find(b"\n", pos + 1)
+        if offsets[-1] != self.size:
+            offsets.append(self.size)
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def byte_range(self, start, stop):
+        """Byte offsets [begin, end) covering lines [start, stop)."""
+        n = len(self)
+        start = max(0, min(start, n))
+        stop = max(start, min(stop, n))
+        return self.offsets[start], self.offsets[stop]
+
+    def raw(self, start, stop):
+        begin, end = self.byte_range(start, stop)
+        return self._mm[begin:end]
+
+    def lines(self, start, stop):
+        """Decoded lines [start, stop), without line endings."""
+        data = self.raw(start, stop).decode("utf-8")
+        if not data:
+            return []
+        out = data.split("\n")
+        if data.endswith("\n"):
+            out.pop()
+        return [ln[:-1] if ln.endswith("\r") else ln for ln in out]
+
+    def line(self, i):
+        found = self.lines(i, i + 1)
+        if not found:
+            raise IndexError(i)
+        return found[0]
+
+    def line_at(self, offset):
+        """Line number containing byte [offset]."""
+        return bisect_right(self.offsets, offset) - 1
+
+    def search(self, pattern, start=0, stop=None):
+        """First line in [start, stop) where bytes regex [pattern] matches, or None."""
+        if isinstance(pattern, (bytes, str)):
+            pattern = re.compile(pattern if isinstance(pattern, bytes) else pattern.encode(), re.MULTILINE)
+        begin, end = self.byte_range(start, len(self) if stop is None else stop)
+        m = pattern.search(self._mm, begin, end)
+        return None if m is None else self.line_at(m.start())
+
+    def search_last(self, pattern, start=0, stop=None):
+        """Last line in [start, stop) where [pattern] matches, or None."""
+        if isinstance(pattern, (bytes, str)):
+            pattern = re.compile(pattern if isinstance(pattern, bytes) else pattern.encode(), re.MULTILINE)
+        begin, end = self.byte_range(start, len(self) if stop is None else stop)
+        last = None
+        for last in pattern.finditer(self._mm, begin, end):
+            pass
+        return None if last is None else self.line_at(last.start())
+
+    def chapter_span(self, chapter):
+        """Lines [start, stop) from the first ref of [chapter] up to the first ref of the next one."""
+        start = self.search(_ref_marker_re(chapter))
+        if start is None:
+            return None
+        stop = self.search(_ref_marker_re(chapter + 1), start + 1)
+        return start, len(self) if stop is None else stop
+
+    def section_span(self, ref):
+        """Lines [start, stop) of the mapping section whose tag line carries [ref] (e.g. "[7.46ab]").
+
+        The span runs up to the next section tag line.
+        """
+        tag = re.compile(rb"^(?:\[[^\n]*)?\[" + re.escape(ref.encode()) + rb"\]", re.MULTILINE)
+        start = self.search(tag)
+        if start is None:
+            return None
+        stop = self.search(rb"^\[\d+\.\d+", start + 1)
+        return start, len(self) if stop is None else stop
@@ -2,11 +2,14 @@
 """Map unmapped verses to the preceding verse's section (maintains consecutiveness)."""
 import json
 import re
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parent.parent
-MAPPING_PATH = ROOT / "texts" / "verse_commentary_mapping.txt"
-JSON_PATH = ROOT / "texts" / "verse_hierarchy_map.json"
+from hierarchy_json import write_hierarchy_json
+from hierarchy_lookup import apply_lookup_tables
+from text_assets import TEXTS_DIR
+
+TEXT_ID = "bodhicaryavatara"
+MAPPING_PATH = TEXTS_DIR / TEXT_ID / "verse_commentary_mapping.txt"
+JSON_PATH = TEXTS_DIR / TEXT_ID / "verse_hierarchy_map.json"
 
 
 def verse_sort_key(v):
@@ -48,6 +51,8 @@ def main():
 
     def walk(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             p = n.get("path", "")
             if p:
                 path_to_node[p] = n
@@ -98,6 +103,8 @@ def main():
 
     def sort_verses(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             if "verses" in n and n["verses"]:
                 n["verses"] = sorted(n["verses"], key=verse_sort_key)
             sort_verses(n.get("children", []))
@@ -107,13 +114,16 @@ def main():
     def collect_all(node):
         v = set(node.get("verses", []))
         for c in node.get("children", []):
-            v.update(collect_all(c))
+            if isinstance(c, dict):
+                v.update(collect_all(c))
         return v
 
     section_to_first = {}
 
     def build_first(nodes):
         for n in nodes:
+            if not isinstance(n, dict):
+                continue
             p = n.get("path", "")
             if p:
                 all_v = list(collect_all(n))
@@ -125,7 +135,7 @@ def main():
     build_first(data["sections"])
     data["sectionToFirstVerse"] = section_to_first
 
-    JSON_PATH.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_hierarchy_json(JSON_PATH, apply_lookup_tables(data, TEXT_ID))
     print(f"Mapped {len(additions)} previously unmapped verses. Total: {len(verse_to_path)}")
 
 
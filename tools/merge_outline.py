@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Merge a text's overviews_pages_eos.txt outline into its verse_hierarchy_map.json.
+
+The outline is the indented commentary outline ("1. The purposes and
+relation" / "    1. The purpose of each section" ...). One stack pass turns
+it into pre-order (path, title) entries; a path is the parent's path plus the
+ordinal as written, matching how the sections tree numbers nodes.
+
+The sections tree is not rebuilt from it. Instead both pre-order title
+sequences are aligned (difflib) and only the differences become edits:
+
+    rename    same place in the outline, new title
+    move      same title, new path (renumbered or re-parented); the node's
+              verses and subtree move with it
+    insert    outline heading the tree does not have (no verses yet)
+
+Sections only the tree has are left where they are and listed, since they
+usually carry verse assignments that were refined after the outline was
+typed up. Only moved, renamed and inserted subtrees (and their ancestors)
+have their verseToPath and sectionToFirstVerse entries refreshed, so an
+outline edit costs time in proportion to the edit; the app's lookup tables
+(tools/hierarchy_lookup.py) are then rebuilt whole.
+
+With --since REV the edits are taken from the outline's own diff against
+REV (git) and replayed onto the tree; an edit whose section no longer
+matches the tree is reported and skipped. Without it the outline is
+reconciled against the tree as a whole.
+
+    python3 tools/merge_outline.py --check                 # list pending edits, exit 1 if any
+    python3 tools/merge_outline.py --text bodhicaryavatara --since HEAD~1
+"""
+import argparse
+import difflib
+import json
+import re
+import subprocess
+import sys
+import unicodedata
+
+from hierarchy_json import write_hierarchy_json
+from hierarchy_lookup import apply_lookup_tables
+from text_assets import ROOT, TEXTS_DIR, iter_nodes, path_sort_key, read_at_revision
+
+OUTLINE_NAME = "overviews_pages_eos.txt"
+HIERARCHY_NAME = "verse_hierarchy_map.json"
+OUTLINE_RE = re.compile(r"^(\s*)(\d+)\.\s+(.*\S)\s*$")
+
+
+class OutlineEntry:
+    __slots__ = ("path", "title", "line")
+
+    def __init__(self, path, title, line=None):
+        self.path = path
+        self.title = title
+        self.line = line  # 1-based outline line, None for tree entries
+
+
+class Edit:
+    __slots__ = ("kind", "old_path", "new_path", "title", "old_title")
+
+    def __init__(self, kind, old_path, new_path, title, old_title=None):
+        self.kind = kind
+        self.old_path = old_path
+        self.new_path = new_path
+        self.title = title
+        self.old_title = old_title
+
+    def describe(self):
+        if self.kind == "insert":
+            return f"insert {self.new_path} {self.title!r}"
+        if self.kind == "move":
+            return f"move {self.old_path} -> {self.new_path} {self.title!r}"
+        where = self.new_path if self.old_path == self.new_path else f"{self.old_path} -> {self.new_path}"
+        return f"rename {where} {self.old_title!r} -> {self.title!r}"
+
+
+def fold(title):
+    title = unicodedata.normalize("NFC", title).replace("’", "'").replace("‘", "'")
+    return " ".join(title.split()).casefold()
+
+
+def parent_path(path):
+    return path.rpartition(".")[0]
+
+
+def parse_outline(text):
+    """(pre-order entries, duplicate entries) for an indented outline."""
+    entries, duplicates, seen = [], [], set()
+    stack = [(-1, "")]
+    for i, line in enumerate(text.split("\n"), 1):
+        m = OUTLINE_RE.match(line)
+        if not m:
+            continue
+        indent = len(m.group(1).expandtabs(4))
+        while stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+        ordinal = str(int(m.group(2)))
+        path = f"{parent}.{ordinal}" if parent else ordinal
+        stack.append((indent, path))
+        entry = OutlineEntry(path, m.group(3), i)
+        if path in seen:
+            duplicates.append(entry)
+        else:
+            seen.add(path)
+            entries.append(entry)
+    return entries, duplicates
+
+
+def tree_entries(sections):
+    return [OutlineEntry(node["path"], node.get("title") or "") for node, _ in iter_nodes(sections)]
+
+
+def plan_edits(old, new):
+    """(edits, entries only old has) turning pre-order entries old into new."""
+    matcher = difflib.SequenceMatcher(None, [fold(e.title) for e in old], [fold(e.title) for e in new],
+                                      autojunk=False)
+    edits, dropped = [], []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            for a, b in zip(old[i1:i2], new[j1:j2]):
+                if a.path != b.path:
+                    edits.append(Edit("move", a.path, b.path, b.title))
+                elif a.title != b.title:
+                    edits.append(Edit("rename", a.path, b.path, b.title, a.title))
+            continue
+        paired = min(i2 - i1, j2 - j1) if op == "replace" else 0
+        for a, b in zip(old[i1:i1 + paired], new[j1:j1 + paired]):
+            edits.append(Edit("rename", a.path, b.path, b.title, a.title))
+        dropped.extend(old[i1 + paired:i2])
+        edits.extend(Edit("insert", None, b.path, b.title) for b in new[j1 + paired:j2])
+
+    # A section whose siblings were reordered shows up as dropped on one side
+    # and inserted on the other; pair those up by parent and title instead.
+    by_title = {}
+    for entry in dropped:
+        by_title.setdefault((parent_path(entry.path), fold(entry.title)), []).append(entry)
+    paired_edits = []
+    for edit in edits:
+        key = (parent_path(edit.new_path), fold(edit.title))
+        candidates = by_title.get(key) if edit.kind == "insert" else None
+        if not candidates:
+            paired_edits.append(edit)
+            continue
+        entry = next((e for e in candidates if e.path == edit.new_path), candidates[0])
+        candidates.remove(entry)
+        dropped.remove(entry)
+        if entry.path != edit.new_path:
+            paired_edits.append(Edit("move", entry.path, edit.new_path, edit.title))
+        elif entry.title != edit.title:
+            paired_edits.append(Edit("rename", entry.path, edit.new_path, edit.title, entry.title))
+    return paired_edits, dropped
+
+
+class HierarchyMerge:
+    """Applies Edits to a verse_hierarchy_map.json dict in place."""
+
+    def __init__(self, data):
+        self.data = data
+        self.sections = data.setdefault("sections", [])
+        self.conflicts = []
+
+    def lineage(self, path):
+        """Nodes from a root down to the section at [path], or [] if there is none.
+
+        Descends through whichever child's path prefixes [path], so a tree that
+        skips a level (4.6.2.1.2 -> 4.6.2.1.2.3.2) is still walked correctly.
+        """
+        out, siblings = [], self.sections
+        while True:
+            node = next((c for c in siblings if isinstance(c, dict) and (
+                c.get("path") == path or path.startswith((c.get("path") or "") + "."))), None)
+            if node is None:
+                return []
+            out.append(node)
+            if node["path"] == path:
+                return out
+            siblings = node.get("children") or []
+
+    def node_at(self, path):
+        """(node, parent node or None) for [path]."""
+        nodes = self.lineage(path)
+        if not nodes:
+            return None, None
+        return nodes[-1], nodes[-2] if len(nodes) > 1 else None
+
+    def children_of(self, parent):
+        return self.sections if parent is None else parent.setdefault("children", [])
+
+    def apply(self, edits):
+        """Applies [edits]; returns the edits actually made."""
+        resolved = []
+        for edit in edits:
+            if edit.kind == "insert":
+                resolved.append((edit, None, None))
+                continue
+            node, parent = self.node_at(edit.old_path)
+            if node is None or fold(node.get("title") or "") != fold(edit.old_title or edit.title):
+                self.conflicts.append(f"{edit.describe()}: the tree has no such section at {edit.old_path}")
+                continue
+            resolved.append((edit, node, parent))
+
+        touched, removed = [], set()
+        for edit, node, _ in resolved:
+            if edit.kind == "rename":
+                node["title"] = edit.title
+        for edit, node, parent in resolved:
+            if node is not None and edit.old_path != edit.new_path:
+                self.children_of(parent).remove(node)
+                removed.update(n["path"] for n, _ in iter_nodes([node]))
+
+        applied = []
+        for edit, node, parent in sorted(resolved, key=lambda r: path_sort_key(r[0].new_path)):
+            if node is not None and edit.old_path == edit.new_path:
+                touched.append((node, edit.old_path))
+                applied.append(edit)
+                continue
+            if node is None:
+                node = {"title": edit.title, "path": edit.new_path, "verses": [], "children": []}
+            if self._attach(node, edit.new_path):
+                applied.append(edit)
+            elif edit.old_path is not None:
+                # Put it back where it was rather than lose its verses.
+                self._attach(node, edit.old_path, force=True, home=parent)
+                removed.difference_update(n["path"] for n, _ in iter_nodes([node]))
+            touched.append((node, edit.old_path))
+        self.refresh_indexes([n for n, _ in touched], removed)
+        return applied
+
+    def _attach(self, node, path, force=False, home=None):
+        parent_p = parent_path(path)
+        parent = home
+        if parent_p and home is None:
+            parent, _ = self.node_at(parent_p)
+            if parent is None:
+                self.conflicts.append(f"{path}: parent section {parent_p} is missing")
+                return False
+        siblings = self.children_of(parent)
+        if any(c.get("path") == path for c in siblings) and not force:
+            self.conflicts.append(f"{path}: the tree already has a different section there")
+            return False
+        old = node["path"]
+        for n, _ in iter_nodes([node]):
+            n["path"] = path + n["path"][len(old):]
+        key = path_sort_key(path)
+        at = next((i for i, c in enumerate(siblings) if path_sort_key(c.get("path") or "") > key), len(siblings))
+        siblings.insert(at, node)
+        return True
+
+    def chain_to(self, path):
+        """[{section, title}] from the root down to the section at [path]."""
+        return [{"section": n["path"], "title": n.get("title") or ""} for n in self.lineage(path)] if path else []
+
+    def refresh_indexes(self, roots, removed):
+        """Update verseToPath / sectionToFirstVerse for the subtrees at [roots] only."""
+        verse_to_path = self.data.setdefault("verseToPath", {})
+        first_verse = self.data.setdefault("sectionToFirstVerse", {})
+        for path in removed:
+            first_verse.pop(path, None)
+
+        affected = set()
+        for root in roots:
+            base = self.chain_to(parent_path(root["path"]))
+            for node, chain in iter_nodes([root]):
+                affected.add(node["path"])
+                if not node.get("verses"):
+                    continue
+                crumbs = base + [{"section": n["path"], "title": n.get("title") or ""} for n in chain]
+                for verse in node["verses"]:
+                    # Like script/rebuild_verse_indices.py: the last section holding a verse wins.
+                    current = verse_to_path.get(verse)
+                    held = current[-1]["section"] if current else None
+                    if held is None or held in removed or held in affected \
+                            or path_sort_key(node["path"]) >= path_sort_key(held):
+                        verse_to_path[verse] = crumbs
+            path = root["path"]
+            while (path := parent_path(path)):
+                affected.add(path)
+        for path in removed:
+            while (path := parent_path(path)):
+                affected.add(path)
+
+        for path in sorted(affected, key=path_sort_key):
+            node, _ = self.node_at(path)
+            if node is None:
+                continue
+            verse = next((v for n, _ in iter_nodes([node]) for v in n.get("verses") or []), None)
+            if verse is None:
+                ancestor = path
+                while (ancestor := parent_path(ancestor)) and ancestor not in first_verse:
+                    pass
+                verse = first_verse.get(ancestor)
+            if verse is None:
+                first_verse.pop(path, None)
+            else:
+                first_verse[path] = verse
+        self.data["sectionToFirstVerse"] = dict(sorted(first_verse.items(), key=lambda kv: path_sort_key(kv[0])))
+
+
+def merge_text(text_dir, since, check):
+    """Prints one text's edits; returns 1 when --check finds pending edits or conflicts."""
+    outline_path = text_dir / OUTLINE_NAME
+    hierarchy_path = text_dir / HIERARCHY_NAME
+    new, duplicates = parse_outline(outline_path.read_text(encoding="utf-8"))
+    data = json.loads(hierarchy_path.read_text(encoding="utf-8"))
+    if since:
+        try:
+            old, _ = parse_outline(read_at_revision(since, outline_path))
+        except subprocess.CalledProcessError as e:
+            sys.exit(f"git show {since}:{outline_path.relative_to(ROOT)} failed: {e.stderr.strip()}")
+    else:
+        old = tree_entries(data.get("sections") or [])
+    edits, dropped = plan_edits(old, new)
+
+    print(f"{text_dir.name}: {len(new)} outline sections, {len(edits)} edits")
+    for entry in duplicates:
+        print(f"  warning: {OUTLINE_NAME}:{entry.line}: duplicate path {entry.path} {entry.title!r} ignored")
+    for entry in dropped:
+        where = "outline at " + since if since else "tree"
+        print(f"  kept {entry.path} {entry.title!r} (only in the {where})")
+
+    if check:
+        for edit in edits:
+            print(f"  {edit.describe()}")
+        return 1 if edits else 0
+
+    merge = HierarchyMerge(data)
+    applied = merge.apply(edits)
+    for edit in applied:
+        print(f"  {edit.describe()}")
+    for conflict in merge.conflicts:
+        print(f"  skipped: {conflict}")
+    if applied:
+        apply_lookup_tables(data, text_dir.name)
+        write_hierarchy_json(hierarchy_path, data)
+        print(f"  wrote {hierarchy_path.relative_to(ROOT)}")
+    return 1 if merge.conflicts else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply overviews_pages_eos.txt outline edits to verse_hierarchy_map.json.")
+    parser.add_argument("--text", action="append", help="text id (repeatable; default: every text with an outline)")
+    parser.add_argument("--since", metavar="REV", help="replay only the outline's changes since this git revision")
+    parser.add_argument("--check", action="store_true", help="list pending edits without writing; exit 1 if any")
+    args = parser.parse_args()
+
+    if args.text:
+        text_dirs = [TEXTS_DIR / t for t in args.text]
+    else:
+        text_dirs = sorted(p.parent for p in TEXTS_DIR.glob(f"*/{OUTLINE_NAME}"))
+    status = 0
+    for text_dir in text_dirs:
+        if not (text_dir / OUTLINE_NAME).exists() or not (text_dir / HIERARCHY_NAME).exists():
+            print(f"{text_dir.name}: needs both {OUTLINE_NAME} and {HIERARCHY_NAME}", file=sys.stderr)
+            status = 1
+            continue
+        status |= merge_text(text_dir, args.since, args.check)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
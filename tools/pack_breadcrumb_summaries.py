@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Pack texts/<text>/breadcrumb_summaries.json into a blob plus an offset index.
+
+breadcrumb_summaries.json (path -> paragraph) stays the authored source. The
+app bundles instead:
+
+    breadcrumb_summaries.bin         every summary, UTF-8, concatenated in
+                                     hierarchy path order, no separators
+    breadcrumb_summaries_index.json  {"version": 1, "blob": "breadcrumb_summaries.bin",
+                                      "size": <blob bytes>, "sha256": <blob digest>,
+                                      "paths": [...], "offsets": [...], "lengths": [...]}
+
+paths are sorted numerically and offsets/lengths are byte positions in the
+blob, so a breadcrumb chain (a path and its ancestors) is a handful of slices
+decoded on their own; the other summaries are never decoded.
+
+Summary keys are validated against verse_hierarchy_map.json: keys the outline
+does not have are errors, and outline paths without a summary are reported
+(errors only with --require-all). A text with errors is not written (exit 1).
+
+    python3 tools/pack_breadcrumb_summaries.py
+    python3 tools/pack_breadcrumb_summaries.py --check   # exit 1 if a packed asset is stale
+"""
+import argparse
+import hashlib
+import json
+import sys
+
+from text_assets import TEXTS_DIR, iter_nodes, path_sort_key
+
+SOURCE_NAME = "breadcrumb_summaries.json"
+BLOB_NAME = "breadcrumb_summaries.bin"
+INDEX_NAME = "breadcrumb_summaries_index.json"
+
+
+def pack(text_dir, require_all=False):
+    """Returns (blob bytes, index, errors, missing outline paths) for one text."""
+    summaries = json.loads((text_dir / SOURCE_NAME).read_text(encoding="utf-8"))
+    hierarchy = json.loads((text_dir / "verse_hierarchy_map.json").read_text(encoding="utf-8"))
+    outline = [n.get("path") for n, _ in iter_nodes(hierarchy.get("sections") or []) if n.get("path")]
+    known = set(outline)
+
+    errors = []
+    if not isinstance(summaries, dict):
+        return b"", None, [f"{SOURCE_NAME} is not a path -> summary object"], []
+    for path, summary in summaries.items():
+        if path not in known:
+            errors.append(f"{path}: summary for a path not in verse_hierarchy_map.json")
+        elif not isinstance(summary, str):
+            errors.append(f"{path}: summary is {type(summary).__name__}, expected a string")
+    missing = [p for p in outline if not str(summaries.get(p) or "").strip()]
+    if require_all:
+        errors.extend(f"{p}: no summary" for p in missing)
+
+    blob = bytearray()
+    paths, offsets, lengths = [], [], []
+    for path in sorted((p for p in summaries if p in known), key=path_sort_key):
+        encoded = str(summaries[path] or "").strip().encode("utf-8")
+        if not encoded:
+            continue
+        paths.append(path)
+        offsets.append(len(blob))
+        lengths.append(len(encoded))
+        blob += encoded
+
+    index = {
+        "version": 1,
+        "blob": BLOB_NAME,
+        "size": len(blob),
+        "sha256": hashlib.sha256(blob).hexdigest(),
+        "paths": paths,
+        "offsets": offsets,
+        "lengths": lengths,
+    }
+    return bytes(blob), index, errors, missing
+
+
+def encode_index(index):
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack breadcrumb summaries into a blob + offset index per text.")
+    parser.add_argument("--text", action="append", help="limit to this text directory name (repeatable)")
+    parser.add_argument("--check", action="store_true", help="verify the packed assets are current; no write")
+    parser.add_argument("--require-all", action="store_true", help="fail when an outline path has no summary")
+    args = parser.parse_args()
+
+    failed = False
+    for source in sorted(TEXTS_DIR.glob(f"*/{SOURCE_NAME}")):
+        text_dir = source.parent
+        if args.text and text_dir.name not in args.text:
+            continue
+        blob, index, errors, missing = pack(text_dir, args.require_all)
+        for e in errors:
+            print(f"{text_dir.name}: error: {e}")
+        if missing and not args.require_all:
+            shown = ", ".join(missing[:10]) + (" ..." if len(missing) > 10 else "")
+            print(f"{text_dir.name}: {len(missing)} outline paths without a summary: {shown}")
+        if errors:
+            failed = True
+            continue
+
+        blob_path, index_path = text_dir / BLOB_NAME, text_dir / INDEX_NAME
+        if args.check:
+            current = (
+                blob_path.exists() and index_path.exists()
+                and blob_path.read_bytes() == blob
+                and index_path.read_text(encoding="utf-8") == encode_index(index)
+            )
+            if not current:
+                print(f"{text_dir.name}: packed summaries are stale; re-run tools/pack_breadcrumb_summaries.py")
+                failed = True
+            else:
+                print(f"{text_dir.name}: OK ({len(index['paths'])} summaries, {index['size']} bytes)")
+            continue
+
+        blob_path.write_bytes(blob)
+        index_path.write_text(encode_index(index), encoding="utf-8")
+        print(f"{text_dir.name}: packed {len(index['paths'])} summaries into {BLOB_NAME} "
+              f"({index['size']} bytes) + {INDEX_NAME} ({index_path.stat().st_size} bytes)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Structural queries over a text's verse_hierarchy_map.json.
+
+The sections tree is walked once to build the indexes; every filter is then
+answered from them. Nodes are numbered in path order and each index is an
+int bitset over those numbers, so filters combine with "&":
+
+    path-prefix trie   path component -> child trie, plus the number range of
+                       every path under it (path order keeps a prefix contiguous)
+    depth              number of path components -> bitset
+    has-verses / has-children bitsets
+    title tokens       folded word -> bitset (sorted word list for ~prefix lookups)
+    verses             ref -> bitset, with "9.4" also covering "9.4ab", "9.4cd"
+
+    python3 tools/query_hierarchy.py --under 4 --has-verses --has-children --children
+    python3 tools/query_hierarchy.py --text bodhicaryavatara --under 4.3 --title ~patien --leaf
+    python3 tools/query_hierarchy.py --verse 6.22 --json
+    python3 tools/query_hierarchy.py --depth 2..3 --no-verses --count
+"""
+import argparse
+import bisect
+import json
+import re
+import sys
+import unicodedata
+
+from text_assets import TEXTS_DIR, iter_nodes, path_sort_key
+
+HIERARCHY_NAME = "verse_hierarchy_map.json"
+WORD_RE = re.compile(r"[a-z0-9]+")
+VERSE_PART_RE = re.compile(r"^(\d+\.\d+)[a-z]+$")
+MAX_DEPTH = 64
+
+
+def title_tokens(title):
+    """Lowercase ASCII words with diacritics folded (Śāntideva -> santideva)."""
+    folded = unicodedata.normalize("NFKD", title)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return WORD_RE.findall(folded)
+
+
+def members(mask):
+    """Set bit positions of [mask], lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class _TrieNode:
+    __slots__ = ("children", "lo", "hi")
+
+    def __init__(self):
+        self.children = {}
+        self.lo = None
+        self.hi = None
+
+
+class HierarchyIndex:
+    """Bitset indexes over one verse_hierarchy_map.json sections tree."""
+
+    def __init__(self, data):
+        entries = []
+        for node, _ in iter_nodes(data.get("sections") or []):
+            path = node.get("path") or ""
+            if path:
+                entries.append((path, node))
+        entries.sort(key=lambda e: path_sort_key(e[0]))
+        self.nodes = [node for _, node in entries]
+        self.paths = [path for path, _ in entries]
+        self.number = {path: i for i, path in enumerate(self.paths)}
+        self.all = (1 << len(self.nodes)) - 1
+
+        self.trie = _TrieNode()
+        self.depth = {}
+        self.has_verses = 0
+        self.has_children = 0
+        self.tokens = {}
+        self.verses = {}
+        for i, (path, node) in enumerate(entries):
+            bit = 1 << i
+            trie = self.trie
+            for part in path.split("."):
+                trie = trie.children.setdefault(part, _TrieNode())
+                trie.lo = i if trie.lo is None else trie.lo
+                trie.hi = i + 1
+            depth = path.count(".") + 1
+            self.depth[depth] = self.depth.get(depth, 0) | bit
+            if node.get("verses"):
+                self.has_verses |= bit
+            if node.get("children"):
+                self.has_children |= bit
+            for token in set(title_tokens(node.get("title") or "")):
+                self.tokens[token] = self.tokens.get(token, 0) | bit
+            for ref in node.get("verses") or []:
+                self.verses[ref] = self.verses.get(ref, 0) | bit
+                m = VERSE_PART_RE.match(ref)
+                if m:
+                    self.verses[m.group(1)] = self.verses.get(m.group(1), 0) | bit
+        self.token_list = sorted(self.tokens)
+
+    @classmethod
+    def for_text(cls, text_id):
+        path = TEXTS_DIR / text_id / HIERARCHY_NAME
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def under(self, prefix, include_self=False):
+        """Paths strictly below [prefix] (and [prefix] itself with include_self)."""
+        trie = self.trie
+        for part in prefix.strip(".").split("."):
+            trie = trie.children.get(part)
+            if trie is None:
+                return 0
+        mask = ((1 << trie.hi) - 1) ^ ((1 << trie.lo) - 1)
+        at = self.number.get(prefix.strip("."))
+        if at is not None and not include_self:
+            mask &= ~(1 << at)
+        return mask
+
+    def at_depth(self, lo, hi):
+        mask = 0
+        for depth in range(lo, hi + 1):
+            mask |= self.depth.get(depth, 0)
+        return mask
+
+    def title(self, word):
+        """Titles containing [word]; "~word" matches any title word starting with it."""
+        if word.startswith("~"):
+            wanted = title_tokens(word[1:])
+            mask = self.all
+            for prefix in wanted:
+                hit = 0
+                i = bisect.bisect_left(self.token_list, prefix)
+                while i < len(self.token_list) and self.token_list[i].startswith(prefix):
+                    hit |= self.tokens[self.token_list[i]]
+                    i += 1
+                mask &= hit
+            return mask if wanted else 0
+        mask = self.all
+        for token in title_tokens(word):
+            mask &= self.tokens.get(token, 0)
+        return mask
+
+    def holding(self, ref):
+        return self.verses.get(ref, 0)
+
+    def select(self, mask):
+        return [self.nodes[i] for i in members(mask)]
+
+
+def child_title(child):
+    if isinstance(child, dict):
+        return f"{child.get('path', '')}  {child.get('title') or ''}"
+    return str(child)
+
+
+def parse_depth(value):
+    lo, sep, hi = value.partition("..")
+    try:
+        lo = int(lo) if lo else 1
+        hi = int(hi) if hi else (MAX_DEPTH if sep else lo)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"depth must be N, N..M, N.. or ..M, not {value!r}")
+    return lo, hi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a text's hierarchy sections tree from prebuilt indexes.")
+    parser.add_argument("--text", default="bodhicaryavatara", help="text id (default: bodhicaryavatara)")
+    parser.add_argument("--under", metavar="PATH", help="only sections below PATH")
+    parser.add_argument("--include-self", action="store_true", help="with --under, also the section at PATH")
+    parser.add_argument("--depth", type=parse_depth, help="path depth: N, N..M, N.. or ..M")
+    verses = parser.add_mutually_exclusive_group()
+    verses.add_argument("--has-verses", action="store_true")
+    verses.add_argument("--no-verses", action="store_true")
+    children = parser.add_mutually_exclusive_group()
+    children.add_argument("--has-children", action="store_true")
+    children.add_argument("--leaf", action="store_true")
+    parser.add_argument("--title", action="append", default=[], metavar="WORDS",
+                        help="title contains these words; ~word matches a word prefix (repeatable)")
+    parser.add_argument("--verse", action="append", default=[], metavar="REF",
+                        help="sections holding REF; 9.4 also matches 9.4ab/9.4cd (repeatable, any of)")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--count", action="store_true", help="print only the number of matches")
+    output.add_argument("--json", action="store_true", help="print matches as JSON")
+    parser.add_argument("--children", action="store_true", help="also list each match's child titles")
+    args = parser.parse_args()
+
+    path = TEXTS_DIR / args.text / HIERARCHY_NAME
+    if not path.exists():
+        sys.exit(f"{path} not found")
+    index = HierarchyIndex.for_text(args.text)
+
+    mask = index.all
+    if args.under:
+        mask &= index.under(args.under, args.include_self)
+    if args.depth:
+        mask &= index.at_depth(*args.depth)
+    if args.has_verses:
+        mask &= index.has_verses
+    elif args.no_verses:
+        mask &= ~index.has_verses
+    if args.has_children:
+        mask &= index.has_children
+    elif args.leaf:
+        mask &= ~index.has_children
+    for words in args.title:
+        mask &= index.title(words)
+    if args.verse:
+        held = 0
+        for ref in args.verse:
+            held |= index.holding(ref)
+        mask &= held
+
+    matches = index.select(mask)
+    if args.count:
+        print(len(matches))
+        return 0
+    if args.json:
+        print(json.dumps([
+            {
+                "path": n["path"],
+                "title": n.get("title") or "",
+                "verses": n.get("verses") or [],
+                **({"children": [child_title(c) for c in n.get("children") or []]} if args.children else {}),
+            }
+            for n in matches
+        ], ensure_ascii=False, indent=2))
+        return 0
+    for n in matches:
+        verses = " ".join(n.get("verses") or [])
+        kids = len(n.get("children") or [])
+        print(f"{n['path']}  {n.get('title') or ''}" + (f"  [{verses}]" if verses else "")
+              + (f"  ({kids} children)" if kids else ""))
+        if args.children:
+            for c in n.get("children") or []:
+                print(f"    - {child_title(c)}")
+    print(f"{len(matches)} section(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Parser for the texts/<text>/root_text_quiz*.txt question banks.
+
+Follows FileQuizService._parseQuestions: a question starts at "Qn. prompt",
+options are "a) ...", the key is "ANSWER: x" and refs come from
+"VERSE REF(S): ...". Lines after "VERSE TEXT:" up to the next question or
+heading are kept as the question's quoted verse text. Headings are either
+"CHAPTER n: ..." lines or the caption above a "=====" rule; a question's
+chapter is the number of the last CHAPTER heading (None if the bank has none)
+and its heading is the last caption, with any "(Q1-Q27)" range dropped.
+
+    for q in parse_quiz(path):
+        q.number, q.chapter, q.heading, q.prompt, q.options, q.answer, q.refs
+"""
+import re
+from pathlib import Path
+
+from text_assets import ROOT, extract_verse_refs, pubspec_text_assets
+
+QUESTION_RE = re.compile(r"^Q(\d+)\.\s*(.*)$")
+OPTION_RE = re.compile(r"^([a-d])\)\s*(.*)$")
+ANSWER_RE = re.compile(r"^ANSWER:\s*([a-d])\s*$", re.IGNORECASE)
+VERSE_REFS_RE = re.compile(r"^VERSE REF\(S\):\s*(.*)$", re.IGNORECASE)
+VERSE_TEXT_RE = re.compile(r"^VERSE TEXT:\s*(.*)$", re.IGNORECASE)
+CHAPTER_RE = re.compile(r"^CHAPTER\s+(\d+)\b", re.IGNORECASE)
+RULE_RE = re.compile(r"^={3,}\s*$")
+QUESTION_RANGE_RE = re.compile(r"\s*\(Q\d+\s*-\s*Q\d+\)\s*$", re.IGNORECASE)
+
+
+class QuizQuestion:
+    __slots__ = ("path", "line", "end_line", "number", "chapter", "heading",
+                 "prompt", "options", "answer", "refs", "verse_text", "verse_text_line")
+
+    def __init__(self, path, line, number, chapter, heading, prompt):
+        self.path = path
+        self.line = line            # 1-based line of "Qn."
+        self.end_line = line        # 1-based last line belonging to the question
+        self.number = number
+        self.chapter = chapter
+        self.heading = heading
+        self.prompt = prompt
+        self.options = {}
+        self.answer = None
+        self.refs = []
+        self.verse_text = []        # lines quoted under "VERSE TEXT:"
+        self.verse_text_line = None  # 1-based line of "VERSE TEXT:"
+
+    @property
+    def text_id(self):
+        return Path(self.path).parent.name
+
+    def location(self):
+        try:
+            shown = Path(self.path).relative_to(ROOT)
+        except ValueError:
+            shown = self.path
+        return f"{shown}:{self.line}"
+
+
+def quiz_files():
+    """Quiz banks bundled with the app (pubspec.yaml assets), as absolute paths."""
+    return [ROOT / p for p in pubspec_text_assets() if re.search(r"/root_text_quiz[^/]*\.txt$", p)]
+
+
+def _parse_refs(value):
+    """"1.5", "1.5-1.10", "1.109, 1.110", "1.124 (colophon)" -> expanded refs."""
+    refs = []
+    for part in value.split(","):
+        part = re.sub(r"\(.*?\)", "", part).strip()
+        refs.extend(extract_verse_refs(part, bare=True) or re.findall(r"\d+\.\d+[a-d]*", part))
+    return refs
+
+
+def _is_caption(line):
+    return bool(line) and not line.startswith("(") and "QUESTIONS" not in line.upper()
+
+
+def parse_quiz(path):
+    """Every well-formed question in the bank, in file order."""
+    lines = Path(path).read_text(encoding="utf-8").split("\n")
+    questions = []
+    chapter, heading = None, None
+    current = None
+    in_verse_text = False
+
+    def close(end):
+        if current is not None:
+            current.end_line = end
+            while current.verse_text and not current.verse_text[-1].strip():
+                current.verse_text.pop()
+            if current.answer in current.options:
+                questions.append(current)
+
+    for i, raw in enumerate(lines):
+        line = raw.rstrip()
+        stripped = line.strip()
+        next_is_rule = i + 1 < len(lines) and RULE_RE.match(lines[i + 1].strip())
+
+        if next_is_rule or (stripped.startswith("(") and stripped.endswith(")")):
+            # Set titles and trailing notes are never part of a quoted verse.
+            in_verse_text = False
+        m = CHAPTER_RE.match(stripped)
+        if m or (next_is_rule and _is_caption(stripped)):
+            if m:
+                chapter = int(m.group(1))
+            heading = QUESTION_RANGE_RE.sub("", stripped)
+            in_verse_text = False
+            continue
+        if RULE_RE.match(stripped):
+            in_verse_text = False
+            continue
+
+        m = QUESTION_RE.match(stripped)
+        if m:
+            close(i)
+            current = QuizQuestion(str(path), i + 1, int(m.group(1)), chapter, heading, m.group(2).strip())
+            in_verse_text = False
+            continue
+        if current is None:
+            continue
+
+        if in_verse_text:
+            current.verse_text.append(line)
+            continue
+        if next_is_rule or stripped.startswith("("):
+            continue
+        m = OPTION_RE.match(stripped)
+        if m and m.group(2).strip():
+            current.options[m.group(1).lower()] = m.group(2).strip()
+            continue
+        m = ANSWER_RE.match(stripped)
+        if m:
+            current.answer = m.group(1).lower()
+            continue
+        m = VERSE_REFS_RE.match(stripped)
+        if m:
+            current.refs = _parse_refs(m.group(1))
+            continue
+        m = VERSE_TEXT_RE.match(stripped)
+        if m:
+            current.verse_text_line = i + 1
+            in_verse_text = True
+            if m.group(1).strip():
+                current.verse_text.append(m.group(1))
+    close(len(lines))
+    return questions
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate questions across the quiz banks (MinHash + LSH).
+
+Each question becomes a set of word shingles (content words by default,
+stopwords dropped, diacritics folded) over its prompt and its correct answer;
+answer shingles are tagged so an answer never matches a prompt. Distractors
+are left out by default because rewritten banks reword them freely.
+MinHash signatures for every question are computed in one NumPy batch,
+signatures are split into LSH bands, and only questions that share a band
+bucket are compared, so the work grows with the number of likely matches
+rather than with every pair. Candidates are confirmed on the exact Jaccard
+similarity of their shingle sets, joined into clusters, and reported per
+text and chapter (or heading, for banks without CHAPTER lines).
+
+    python3 tools/quiz_near_duplicates.py                       # banks in pubspec.yaml
+    python3 tools/quiz_near_duplicates.py --threshold 0.4 --across-texts
+    python3 tools/quiz_near_duplicates.py --shingle-size 2 --all-options --json > dupes.json
+
+Requires numpy.
+"""
+import argparse
+import json
+import re
+import sys
+import unicodedata
+import zlib
+from collections import defaultdict
+
+from quiz_bank import parse_quiz, quiz_files
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+SIGNATURE_CHUNK = 256  # questions per batch when hashing, bounds the (shingles x perms) matrix
+STOPWORDS = frozenset(
+    "a an the of to in on and or for is are was were be by with as at from that this which what who whom"
+    " how why does do did according commentary text its it his their".split()
+)
+
+
+def normalize_words(text):
+    """Lowercase ASCII words with diacritics folded (Śāntideva -> santideva)."""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return WORD_RE.findall(folded)
+
+
+def word_shingles(words, k=1):
+    words = [w for w in words if w not in STOPWORDS]
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def question_shingles(q, k=1, all_options=False):
+    shingles = {"q:" + s for s in word_shingles(normalize_words(q.prompt), k)}
+    options = q.options.values() if all_options else [q.options[q.answer]]
+    for option in options:
+        shingles.update("a:" + s for s in word_shingles(normalize_words(option), k))
+    return shingles
+
+
+def minhash_signatures(shingle_sets, num_perm=128, seed=1):
+    """(len(shingle_sets), num_perm) uint32 MinHash matrix.
+
+    Shingles are hashed to 32 bits with crc32, then permuted with the
+    multiply-shift family h(x) = ((a*x + b) mod 2^64) >> 32 (a odd), which
+    NumPy's wrapping uint64 arithmetic computes directly.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    out = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+    for start in range(0, len(shingle_sets), SIGNATURE_CHUNK):
+        chunk = shingle_sets[start:start + SIGNATURE_CHUNK]
+        sizes = np.array([len(s) for s in chunk], dtype=np.int64)
+        filled = np.flatnonzero(sizes)
+        if not len(filled):
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for shingles in chunk for s in shingles),
+            dtype=np.uint64, count=int(sizes.sum()),
+        )
+        permuted = ((hashes[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)).astype(np.uint32)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        out[start + filled] = np.minimum.reduceat(permuted, starts[filled], axis=0)
+    return out
+
+
+def lsh_candidates(signatures, bands, allowed=None):
+    """Index pairs (i < j) whose signatures agree on at least one whole band."""
+    rows = signatures.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i, row in enumerate(block):
+            buckets[row.tobytes()].append(i)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    i, j = members[x], members[y]
+                    if allowed is None or allowed(i, j):
+                        pairs.add((i, j))
+    return pairs
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def clusters_from_pairs(n, pairs):
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups = defaultdict(list)
+    for i in {x for pair in pairs for x in pair}:
+        groups[find(i)].append(i)
+    return [sorted(g) for g in groups.values()]
+
+
+def chapter_label(q):
+    if q.chapter is not None:
+        return f"chapter {q.chapter}"
+    return q.heading or "(no heading)"
+
+
+def find_duplicates(questions, threshold, num_perm, bands, k=1, all_options=False, across_texts=False):
+    shingle_sets = [question_shingles(q, k, all_options) for q in questions]
+    signatures = minhash_signatures(shingle_sets, num_perm)
+    allowed = None if across_texts else (lambda i, j: questions[i].text_id == questions[j].text_id)
+    candidates = lsh_candidates(signatures, bands, allowed)
+
+    confirmed = {}
+    for i, j in candidates:
+        if not shingle_sets[i] or not shingle_sets[j]:
+            continue
+        score = jaccard(shingle_sets[i], shingle_sets[j])
+        if score >= threshold:
+            confirmed[(i, j)] = score
+
+    clusters = []
+    for members in clusters_from_pairs(len(questions), confirmed):
+        scores = [s for (i, j), s in confirmed.items() if i in members and j in members]
+        first = questions[members[0]]
+        clusters.append({
+            "text_id": first.text_id,
+            "chapter": chapter_label(first),
+            "cross_chapter": len({chapter_label(questions[m]) for m in members}) > 1,
+            "cross_file": len({questions[m].path for m in members}) > 1,
+            "max_similarity": round(max(scores), 3),
+            "min_similarity": round(min(scores), 3),
+            "questions": [
+                {
+                    "location": questions[m].location(),
+                    "number": questions[m].number,
+                    "chapter": chapter_label(questions[m]),
+                    "prompt": questions[m].prompt,
+                }
+                for m in members
+            ],
+        })
+    clusters.sort(key=lambda c: (c["text_id"], c["chapter"], -c["max_similarity"]))
+    return clusters, len(candidates), len(confirmed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report near-duplicate quiz questions per text and chapter.")
+    parser.add_argument("files", nargs="*", help="quiz files (default: the banks listed in pubspec.yaml)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="minimum shingle Jaccard similarity (default 0.5)")
+    parser.add_argument("--num-perm", type=int, default=128, help="MinHash permutations (default 128)")
+    parser.add_argument("--bands", type=int, default=32,
+                        help="LSH bands; must divide --num-perm (default 32, i.e. 4 rows per band)")
+    parser.add_argument("--shingle-size", type=int, default=1, help="words per shingle (default 1)")
+    parser.add_argument("--all-options", action="store_true", help="shingle the distractors as well as the answer")
+    parser.add_argument("--across-texts", action="store_true", help="also compare questions of different texts")
+    parser.add_argument("--json", action="store_true", help="print clusters as JSON")
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("quiz_near_duplicates.py needs numpy: pip install numpy")
+    if args.num_perm % args.bands:
+        sys.exit("--bands must divide --num-perm")
+
+    files = args.files or quiz_files()
+    questions = [q for f in files for q in parse_quiz(f)]
+    clusters, candidates, confirmed = find_duplicates(
+        questions, args.threshold, args.num_perm, args.bands, args.shingle_size, args.all_options, args.across_texts
+    )
+
+    if args.json:
+        print(json.dumps(clusters, ensure_ascii=False, indent=2))
+        return 0
+
+    rows = args.num_perm // args.bands
+    print(f"{len(questions)} questions in {len(files)} files; {candidates} LSH candidate pairs "
+          f"({args.bands} bands x {rows} rows, ~{(1 / args.bands) ** (1 / rows):.2f} similarity knee), "
+          f"{confirmed} pairs >= {args.threshold}, {len(clusters)} clusters")
+    by_chapter = defaultdict(list)
+    for c in clusters:
+        by_chapter[(c["text_id"], c["chapter"])].append(c)
+    for (text_id, chapter), group in by_chapter.items():
+        print(f"\n{text_id} / {chapter}: {len(group)} clusters")
+        for c in group:
+            flags = ", ".join(f for f, on in (("cross-file", c["cross_file"]), ("cross-chapter", c["cross_chapter"])) if on)
+            print(f"  similarity {c['min_similarity']:.2f}-{c['max_similarity']:.2f}" + (f" ({flags})" if flags else ""))
+            for q in c["questions"]:
+                prompt = q["prompt"] if len(q["prompt"]) <= 90 else q["prompt"][:87] + "..."
+                print(f"    {q['location']}  Q{q['number']}  {prompt}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
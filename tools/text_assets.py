@@ -0,0 +1,103 @@
+"""Shared paths and helpers for the per-text assets under texts/."""
+import re
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TEXTS_DIR = ROOT / "texts"
+PUBSPEC = ROOT / "pubspec.yaml"
+
+PUBSPEC_ASSET_RE = re.compile(r"^\s+-\s+(texts/\S+)\s*$")
+
+
+def pubspec_text_assets():
+    """Return the texts/ asset paths listed under flutter.assets in pubspec.yaml."""
+    out = []
+    for line in PUBSPEC.read_text(encoding="utf-8").splitlines():
+        m = PUBSPEC_ASSET_RE.match(line)
+        if m:
+            out.append(m.group(1))
+    return out
+
+
+def text_dirs():
+    """Every text directory under texts/ that carries a verse_hierarchy_map.json."""
+    return sorted(
+        p for p in TEXTS_DIR.iterdir()
+        if p.is_dir() and (p / "verse_hierarchy_map.json").exists()
+    )
+
+
+def parsed_json_path(text_dir):
+    """The text's *_parsed.json (bcv_parsed.json, koa_parsed.json, ...), or None."""
+    found = sorted(Path(text_dir).glob("*_parsed.json"))
+    return found[0] if found else None
+
+
+def read_at_revision(rev, path):
+    """Text of [path] as committed at git revision [rev]; raises CalledProcessError if absent."""
+    rel = Path(path).resolve().relative_to(ROOT).as_posix()
+    return subprocess.run(
+        ["git", "show", f"{rev}:{rel}"], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def verse_sort_key(v):
+    m = re.match(r"^(\d+)\.(\d+)([a-d]*)$", v)
+    if not m:
+        return (0, 0, 0)
+    c, vn = int(m.group(1)), int(m.group(2))
+    suf = {"": 0, "ab": 1, "cd": 2}.get(m.group(3), 0)
+    return (c, vn, suf)
+
+
+def path_sort_key(path):
+    """Numeric order for section paths ("2.10" after "2.9")."""
+    return tuple(int(p) if p.isdigit() else 0 for p in path.split("."))
+
+
+VERSE_REF_TAG_RE = re.compile(r"\[(\d+\.\d+)([a-d]*)(?:-(\d+\.\d+)[a-d]*)?\]")
+BARE_VERSE_REF_RE = re.compile(r"^(\d+\.\d+)([a-d]*)(?:-(\d+\.\d+)[a-d]*)?$", re.IGNORECASE)
+
+
+def _expand_ref_match(m, refs):
+    start, suffix, end = m.group(1), m.group(2) or "", m.group(3)
+    if end:
+        c1, v1 = map(int, start.split("."))
+        c2, v2 = map(int, end.split("."))
+        for c in range(c1, c2 + 1):
+            vs = v1 if c == c1 else 1
+            ve = v2 if c == c2 else 999
+            for v in range(vs, ve + 1):
+                refs.append(f"{c}.{v}")
+    else:
+        refs.append(start + suffix)
+
+
+def extract_verse_refs(line, bare=False):
+    """Verse refs tagged on a mapping line ([1.5], [1.5ab], [1.5-1.10]).
+
+    With bare=True a line that is only a ref ("10.4", "9.121ab-9.121cd") counts too.
+    """
+    refs = []
+    for m in VERSE_REF_TAG_RE.finditer(line):
+        _expand_ref_match(m, refs)
+    if bare:
+        m = BARE_VERSE_REF_RE.match(line.strip())
+        if m:
+            _expand_ref_match(m, refs)
+    return refs
+
+
+def iter_nodes(sections, chain=()):
+    """Pre-order walk of a hierarchy `sections` list, yielding (node, chain).
+
+    chain is the tuple of nodes from the root down to and including node.
+    """
+    stack = [(n, chain) for n in reversed(sections) if isinstance(n, dict)]
+    while stack:
+        node, parent_chain = stack.pop()
+        node_chain = parent_chain + (node,)
+        yield node, node_chain
+        children = node.get("children") or []
+        stack.extend((c, node_chain) for c in reversed(children) if isinstance(c, dict))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Offline analytics over the columnar export written by tools/export_usage_events.py.
+
+Recomputes the dashboard metrics with vectorized Arrow group-bys instead of
+querying the production table, and over the full exported history rather than
+the 4 weeks the database retains:
+
+    dwell        surface_dwell per text and mode (as analytics_mode_dwell_daily_v1, summed over the range)
+    sections     top read sections over a trailing window (as analytics_top_read_sections_30d_v1)
+    actors       unique anon users, authenticated users and sessions
+    countries    events by country, missing codes as "Unknown"
+
+    python3 tools/usage_offline_analytics.py --since 2026-01-01 dwell sections
+    python3 tools/usage_offline_analytics.py --json all > report.json
+
+Requires pyarrow.
+"""
+import argparse
+import json
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = pc = ds = None
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DATA = ROOT / "exports" / "usage_events"
+
+# Same clamps as the reporting views: drop sub-second dwell, cap at 2 hours.
+MIN_DWELL_MS = 1000
+MAX_DWELL_MS = 7_200_000
+
+REPORTS = {}
+
+
+def report(name):
+    def register(fn):
+        REPORTS[name] = fn
+        return fn
+    return register
+
+
+def open_dataset(path):
+    fmt = "ipc" if any(Path(path).glob("day=*/part-*.arrow")) else "parquet"
+    partitioning = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+    return ds.dataset(str(path), format=fmt, partitioning=partitioning)
+
+
+def load(dataset, columns, since=None, until=None, extra_filter=None):
+    """Project [columns] for days in [since, until], pruning partitions by the day key."""
+    flt = None
+    if since:
+        flt = ds.field("day") >= since.isoformat()
+    if until:
+        cond = ds.field("day") <= until.isoformat()
+        flt = cond if flt is None else flt & cond
+    if extra_filter is not None:
+        flt = extra_filter if flt is None else flt & extra_filter
+    return dataset.to_table(columns=columns, filter=flt)
+
+
+def dwell_seconds(table):
+    capped = pc.min_element_wise(table["duration_ms"], pa.scalar(MAX_DWELL_MS, pa.int32()))
+    return pc.divide(pc.cast(capped, pa.float64()), 1000.0)
+
+
+def with_actor(table):
+    return table.append_column("actor_id", pc.coalesce(table["user_id"], table["anon_id"]))
+
+
+def dwell_filter(event_name):
+    return (
+        (ds.field("event_name") == event_name)
+        & ds.field("duration_ms").is_valid()
+        & (ds.field("duration_ms") >= MIN_DWELL_MS)
+        & ds.field("text_id").is_valid()
+    )
+
+
+def _renamed(table, names):
+    """Rename aggregate output columns ("duration_sec_sum", ...) by name, not position."""
+    return table.rename_columns([names.get(n, n) for n in table.column_names])
+
+
+def _rows(table):
+    return table.to_pylist()
+
+
+def _round(rows, *keys):
+    for row in rows:
+        for key in keys:
+            if row.get(key) is not None:
+                row[key] = round(row[key], 2)
+    return rows
+
+
+@report("dwell")
+def dwell_by_text_and_mode(dataset, args):
+    t = load(
+        dataset,
+        ["text_id", "mode", "session_id", "user_id", "anon_id", "duration_ms"],
+        args.since, args.until,
+        dwell_filter("surface_dwell") & ds.field("mode").is_valid(),
+    )
+    t = with_actor(t).append_column("duration_sec", dwell_seconds(t))
+    out = t.group_by(["text_id", "mode"]).aggregate([
+        ("duration_sec", "sum"),
+        ("duration_sec", "count"),
+        ("duration_sec", "mean"),
+        ("duration_sec", "approximate_median"),
+        ("actor_id", "count_distinct"),
+        ("session_id", "count_distinct"),
+    ])
+    out = _renamed(out, {
+        "duration_sec_sum": "total_dwell_seconds",
+        "duration_sec_count": "dwell_event_count",
+        "duration_sec_mean": "avg_dwell_seconds",
+        "duration_sec_approximate_median": "median_event_dwell_seconds",
+        "actor_id_count_distinct": "unique_actor_count",
+        "session_id_count_distinct": "unique_session_count",
+    }).sort_by([("text_id", "ascending"), ("total_dwell_seconds", "descending")])
+    return _round(_rows(out), "total_dwell_seconds", "avg_dwell_seconds", "median_event_dwell_seconds")
+
+
+@report("sections")
+def top_read_sections(dataset, args):
+    until = args.until or args.as_of
+    since = until - timedelta(days=args.window_days - 1)
+    if args.since and args.since > since:
+        since = args.since
+    t = load(
+        dataset,
+        ["text_id", "mode", "section_path", "session_id", "user_id", "anon_id", "duration_ms"],
+        since, until,
+        dwell_filter("read_section_dwell") & ds.field("section_path").is_valid(),
+    )
+    t = with_actor(t).append_column("duration_sec", dwell_seconds(t))
+    agg = t.group_by(["text_id", "mode", "section_path"]).aggregate([
+        ("duration_sec", "sum"),
+        ("duration_sec", "count"),
+        ("actor_id", "count_distinct"),
+    ])
+    agg = _renamed(agg, {
+        "duration_sec_sum": "total_dwell_seconds",
+        "duration_sec_count": "dwell_event_count",
+        "actor_id_count_distinct": "unique_actor_count",
+    }).sort_by([("text_id", "ascending"), ("total_dwell_seconds", "descending")])
+
+    # Dense rank within each text over the (small) aggregated table.
+    out = []
+    text, rank, last_total = None, 0, None
+    for row in _rows(agg):
+        if row["text_id"] != text:
+            text, rank, last_total = row["text_id"], 0, None
+        if row["total_dwell_seconds"] != last_total:
+            rank += 1
+            last_total = row["total_dwell_seconds"]
+        if rank <= args.top:
+            row["dwell_rank_within_text"] = rank
+            out.append(row)
+    return {"since": since.isoformat(), "until": until.isoformat(), "sections": _round(out, "total_dwell_seconds")}
+
+
+@report("actors")
+def unique_actors(dataset, args):
+    t = load(dataset, ["session_id", "user_id", "anon_id"], args.since, args.until)
+    anon = pc.filter(t["anon_id"], pc.and_(pc.is_null(t["user_id"]), pc.is_valid(t["anon_id"])))
+    users = pc.drop_null(t["user_id"])
+    return {
+        "total_events": t.num_rows,
+        "unique_sessions": pc.count_distinct(t["session_id"]).as_py(),
+        "unique_anon_users": pc.count_distinct(anon).as_py(),
+        "unique_authenticated_users": pc.count_distinct(users).as_py(),
+    }
+
+
+@report("countries")
+def events_by_country(dataset, args):
+    t = load(dataset, ["country_code"], args.since, args.until)
+    trimmed = pc.utf8_trim_whitespace(t["country_code"])
+    code = pc.if_else(pc.fill_null(pc.equal(trimmed, ""), True), "Unknown", trimmed)
+    counts = pa.table({"country_code": code}).group_by("country_code").aggregate([
+        ("country_code", "count"),
+    ])
+    counts = _renamed(counts, {"country_code_count": "count"}).sort_by([("count", "descending")])
+    return _rows(counts)[:args.top_countries]
+
+
+def parse_day(value):
+    return date.fromisoformat(value)
+
+
+def print_table(name, result):
+    rows = result["sections"] if isinstance(result, dict) and "sections" in result else result
+    print(f"== {name} ==")
+    if isinstance(rows, dict):
+        for key, value in rows.items():
+            print(f"  {key}: {value}")
+        return
+    if isinstance(result, dict) and "since" in result:
+        print(f"  window {result['since']} .. {result['until']}")
+    if not rows:
+        print("  (no rows)")
+        return
+    headers = list(rows[0])
+    widths = [max(len(h), *(len(str(r.get(h))) for r in rows)) for h in headers]
+    print("  " + "  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for r in rows:
+        print("  " + "  ".join(str(r.get(h)).ljust(w) for h, w in zip(headers, widths)))
+
+
+def main():
+    if pa is None:
+        sys.exit("usage_offline_analytics.py needs pyarrow: pip install pyarrow")
+    parser = argparse.ArgumentParser(description="Dashboard metrics over exported usage-event files.")
+    parser.add_argument("reports", nargs="*", metavar="report",
+                        help=f"{', '.join(sorted(REPORTS))} or all (default: all)")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA, help="export directory (default exports/usage_events)")
+    parser.add_argument("--since", type=parse_day, help="first UTC day to include (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_day, help="last UTC day to include (YYYY-MM-DD)")
+    parser.add_argument("--as-of", type=parse_day, default=datetime.now(timezone.utc).date(),
+                        help="end of the trailing sections window when --until is not given (default today)")
+    parser.add_argument("--window-days", type=int, default=30, help="trailing window for 'sections' (default 30)")
+    parser.add_argument("--top", type=int, default=10, help="sections per text (default 10)")
+    parser.add_argument("--top-countries", type=int, default=31)
+    parser.add_argument("--json", action="store_true", help="print one JSON document instead of tables")
+    args = parser.parse_args()
+    unknown = [r for r in args.reports if r != "all" and r not in REPORTS]
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)} (choose from {', '.join(sorted(REPORTS))}, all)")
+
+    if not args.data.exists():
+        sys.exit(f"No export at {args.data}; run tools/export_usage_events.py first")
+    dataset = open_dataset(args.data)
+    names = sorted(REPORTS) if not args.reports or "all" in args.reports else args.reports
+    results = {name: REPORTS[name](dataset, args) for name in names}
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False, default=str))
+    else:
+        for name, result in results.items():
+            print_table(name, result)
+
+
+if __name__ == "__main__":
+    main()
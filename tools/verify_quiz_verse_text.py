@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Check the VERSE TEXT blocks quoted in the quiz banks against the parsed verses.
+
+Every bundled root_text_quiz*.txt is parsed (tools/quiz_bank.py) and each
+quoted block is split at its "[1.1]" markers (an unmarked block belongs to the
+question's single VERSE REF). Each text's *_parsed.json is indexed once into
+ref -> normalized-text digest, so a quote that matches is settled by one
+digest comparison. Only digest misses go on to the slower checks:
+
+    reordered   same lines, different order
+    partial     the quote is a contiguous part of the verse (e.g. lines ab)
+    abridged    the quote elides with "...", and every kept fragment appears
+                in the verse in order
+    drift       similar, difflib ratio >= --min-ratio
+    mismatch    below --min-ratio
+    unknown-ref the ref is not in the parsed verses
+
+Normalization folds curly quotes, dashes and soft hyphens, Unicode forms,
+case and whitespace, so typographic differences never count as drift.
+
+    python3 tools/verify_quiz_verse_text.py                 # all banks, exit 1 on any finding
+    python3 tools/verify_quiz_verse_text.py --diff          # show line diffs for drift/mismatch
+    python3 tools/verify_quiz_verse_text.py --allow reordered --allow partial
+"""
+import argparse
+import difflib
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from quiz_bank import parse_quiz, quiz_files
+from text_assets import parsed_json_path
+
+MARKER_RE = re.compile(r"^\s*\[(\d+\.\d+[a-z]*)\]\s*")
+PUNCT_MAP = str.maketrans({
+    "‘": "'", "’": "'", "ʼ": "'", "“": '"', "”": '"',
+    "–": "-", "—": "-", "…": "...", " ": " ",
+    "­": "-",
+})
+HYPHEN_RUN_RE = re.compile(r"\s*-+\s*")
+FINDINGS = ("reordered", "partial", "abridged", "drift", "mismatch", "unknown-ref")
+ELLIPSIS_RE = re.compile(r"\.{3,}")
+
+
+def normalize_line(line):
+    line = unicodedata.normalize("NFC", line).translate(PUNCT_MAP)
+    line = HYPHEN_RUN_RE.sub("-", line)
+    return " ".join(line.split()).casefold()
+
+
+def normalize_lines(text_or_lines):
+    lines = text_or_lines.split("\n") if isinstance(text_or_lines, str) else text_or_lines
+    return [n for n in (normalize_line(line) for line in lines) if n]
+
+
+def digest(lines):
+    return hashlib.blake2b("\n".join(lines).encode("utf-8"), digest_size=16).digest()
+
+
+class CanonicalVerses:
+    """ref -> (digest, normalized lines) for one text's *_parsed.json."""
+
+    def __init__(self, parsed_path):
+        data = json.loads(parsed_path.read_text(encoding="utf-8"))
+        self.path = parsed_path
+        self.raw = {}
+        self.lines = {}
+        self.digests = {}
+        for ref, verse in zip(data.get("refs") or [], data.get("verses") or []):
+            lines = normalize_lines(verse)
+            self.raw[ref] = verse
+            self.lines[ref] = lines
+            self.digests[ref] = digest(lines)
+
+
+def split_block(q):
+    """[(ref, quoted lines)] for one question's VERSE TEXT block."""
+    blocks, ref, lines = [], None, []
+    for line in q.verse_text:
+        m = MARKER_RE.match(line)
+        if m:
+            if ref is not None or lines:
+                blocks.append((ref, lines))
+            ref, lines = m.group(1), [line[m.end():]]
+        else:
+            lines.append(line)
+    if ref is not None or lines:
+        blocks.append((ref, lines))
+    if blocks and blocks[0][0] is None:
+        only = q.refs[0] if len(q.refs) == 1 else None
+        blocks[0] = (only, blocks[0][1])
+    return blocks
+
+
+def is_abridged(quoted, expected):
+    text = " ".join(quoted)
+    if not ELLIPSIS_RE.search(text):
+        return False
+    haystack = " ".join(expected)
+    position = 0
+    for fragment in ELLIPSIS_RE.split(text):
+        fragment = fragment.strip(" '\"")
+        if not fragment:
+            continue
+        found = haystack.find(fragment, position)
+        if found < 0:
+            return False
+        position = found + len(fragment)
+    return True
+
+
+def classify(quoted, canon, ref, min_ratio):
+    """(status, ratio); status is 'ok' or one of FINDINGS."""
+    if ref not in canon.digests:
+        return "unknown-ref", 0.0
+    if digest(quoted) == canon.digests[ref]:
+        return "ok", 1.0
+    expected = canon.lines[ref]
+    if Counter(quoted) == Counter(expected):
+        return "reordered", 1.0
+    n = len(quoted)
+    if n and any(expected[i:i + n] == quoted for i in range(len(expected) - n + 1)):
+        return "partial", 1.0
+    if is_abridged(quoted, expected):
+        return "abridged", 1.0
+    matcher = difflib.SequenceMatcher(None, "\n".join(expected), "\n".join(quoted), autojunk=False)
+    if matcher.real_quick_ratio() < min_ratio or matcher.quick_ratio() < min_ratio:
+        return "mismatch", matcher.quick_ratio()
+    ratio = matcher.ratio()
+    return ("drift" if ratio >= min_ratio else "mismatch"), ratio
+
+
+def verify(files, min_ratio):
+    """Yields (question, ref, status, ratio, quoted lines, canonical) for every quoted verse."""
+    canon_by_text = {}
+    for path in files:
+        for q in parse_quiz(path):
+            if not q.verse_text:
+                continue
+            text_dir = path.parent
+            if text_dir.name not in canon_by_text:
+                parsed = parsed_json_path(text_dir)
+                canon_by_text[text_dir.name] = CanonicalVerses(parsed) if parsed else None
+            canon = canon_by_text[text_dir.name]
+            if canon is None:
+                continue
+            for ref, lines in split_block(q):
+                quoted = normalize_lines(lines)
+                if not quoted:
+                    continue
+                status, ratio = classify(quoted, canon, ref, min_ratio)
+                yield q, ref, status, ratio, lines, canon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify quiz VERSE TEXT blocks against the parsed canonical verses.")
+    parser.add_argument("files", nargs="*", help="quiz files (default: the banks listed in pubspec.yaml)")
+    parser.add_argument("--min-ratio", type=float, default=0.9,
+                        help="difflib similarity separating drift from mismatch (default 0.9)")
+    parser.add_argument("--allow", action="append", choices=FINDINGS, default=[],
+                        help="report but do not fail on this finding (repeatable)")
+    parser.add_argument("--diff", action="store_true", help="print a line diff for drift and mismatch")
+    args = parser.parse_args()
+
+    files = [Path(p).resolve() for p in args.files] or quiz_files()
+    totals = Counter()
+    findings = defaultdict(list)
+    for q, ref, status, ratio, lines, canon in verify(files, args.min_ratio):
+        totals[status] += 1
+        if status != "ok":
+            findings[status].append((q, ref, ratio, lines, canon))
+
+    checked = sum(totals.values())
+    print(f"{checked} quoted verses in {len(files)} files: {totals['ok']} match"
+          + "".join(f", {totals[s]} {s}" for s in FINDINGS if totals[s]))
+    for status in FINDINGS:
+        for q, ref, ratio, lines, canon in findings[status]:
+            detail = f" (similarity {ratio:.2f})" if status in ("drift", "mismatch") else ""
+            print(f"  {status}: {q.location()} Q{q.number} [{ref}]{detail}")
+            if args.diff and status in ("drift", "mismatch") and ref in canon.raw:
+                expected = [" ".join(x.split()) for x in canon.raw[ref].split("\n") if x.strip()]
+                quoted = [" ".join(x.split()) for x in lines if x.strip()]
+                for line in difflib.unified_diff(expected, quoted, canon.path.name, "quiz", lineterm="", n=0):
+                    if not line.startswith("@@"):
+                        print(f"      {line}")
+
+    failing = [s for s in FINDINGS if totals[s] and s not in args.allow]
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
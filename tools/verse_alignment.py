@@ -0,0 +1,185 @@
+"""Anchored token alignment of a commentary mapping against the root verses.
+
+A mapping chapter quotes each root verse after an anchor line: a verse-number
+line ("1.4", or with line letters "4.26ab", "4.26c"), or a split tag
+("[1.4ab]", "[1.4cd]") for one half. Rather than testing mapping lines one at a time against canonical
+lines, each chapter is tokenized once and, for every anchor, the tokens that
+follow it are aligned against the anchored verse's tokens with Hirschberg's
+linear-space LCS. A mapping line is root text when most of its tokens align,
+so a canonical line split over two mapping lines, or two canonical lines
+merged into one, come out of the same alignment instead of special cases.
+
+The text searched after an anchor stops at the next anchor, a section header
+or an image line, and at about twice the verse's token count (whole lines):
+verse text is never longer than that, and the bound keeps each alignment
+O(verse tokens x window), so a chapter costs time linear in its length.
+
+    aligner = ChapterAligner(verse_map)              # ref -> canonical lines
+    for decision in aligner.align(lines, start, stop):
+        decision.line, decision.ref, decision.coverage, decision.is_root
+"""
+import re
+
+VERSE_NUM_RE = re.compile(r"^\s*(?:>>>\s*)?(\d+)\.(\d+)(?:[a-d]+)?\s*$")
+SPLIT_TAG_RE = re.compile(r"^\s*\[(\d+)\.(\d+)(ab|cd)\]\s*$")
+SECTION_HDR_RE = re.compile(r"^\d+(\.\d+)*\.\s+")
+CHAPTER_RE = re.compile(r"^(?:>>>\s*)?Chapter\s+(\d+)\b")
+TOKEN_RE = re.compile(r"[a-z0-9āīūṛṅñṭḍṇśṣ]+")
+
+WINDOW_FACTOR = 2
+WINDOW_SLACK = 8
+MIN_COVERAGE = 0.6
+
+
+def strip_marker(line):
+    if line.startswith(">>>"):
+        return line[3:].lstrip()
+    return line
+
+
+def tokens(line):
+    s = strip_marker(line).replace("’", "'").replace("‘", "'").lower()
+    s = re.sub(r"\s*\[\d+(?:\.\d+)?\]\s*$", "", s)
+    return TOKEN_RE.findall(s)
+
+
+def anchor_of(stripped):
+    """(ref, part) for a verse-number line or split tag, else None; part is None, 'ab' or 'cd'.
+
+    The letters on a bare verse-number line ("4.28cd", "7.62a") are aligned
+    against the whole verse: they do not reliably name canonical lines (4.28cd
+    precedes all of 4.28, 7.62a the fifth and sixth lines of a six-line verse),
+    and the LCS finds whichever lines are quoted.
+    """
+    m = VERSE_NUM_RE.match(stripped)
+    if m:
+        return f"{int(m.group(1))}.{int(m.group(2))}", None
+    m = SPLIT_TAG_RE.match(stripped)
+    if m:
+        return f"{int(m.group(1))}.{int(m.group(2))}", m.group(3)
+    return None
+
+
+def is_stop_line(stripped):
+    return bool(
+        anchor_of(stripped)
+        or stripped.startswith("[")
+        or SECTION_HDR_RE.match(stripped)
+        or CHAPTER_RE.match(stripped)
+    )
+
+
+def _lcs_last_row(a, b):
+    """LCS lengths of a against every prefix of b, in O(len(b)) space."""
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        curr = [0]
+        for j, y in enumerate(b):
+            curr.append(prev[j] + 1 if x == y else max(prev[j + 1], curr[j]))
+        prev = curr
+    return prev
+
+
+def hirschberg(a, b, a_off=0, b_off=0, out=None):
+    """Matched index pairs (i, j) of one longest common subsequence of a and b.
+
+    Ties go to the earliest positions in b, so with a = the verse and b = the
+    text after its anchor, the verse aligns with its first quotation rather
+    than with words the commentary repeats further on.
+    """
+    if out is None:
+        out = []
+    if not a or not b:
+        return out
+    if len(a) == 1:
+        for j, y in enumerate(b):
+            if y == a[0]:
+                out.append((a_off, b_off + j))
+                break
+        return out
+    mid = len(a) // 2
+    left = _lcs_last_row(a[:mid], b)
+    right = _lcs_last_row(a[mid:][::-1], b[::-1])
+    split = max(range(len(b) + 1), key=lambda j: left[j] + right[len(b) - j])
+    hirschberg(a[:mid], b[:split], a_off, b_off, out)
+    hirschberg(a[mid:], b[split:], a_off + mid, b_off + split, out)
+    return out
+
+
+class LineDecision:
+    __slots__ = ("line", "ref", "coverage", "is_root")
+
+    def __init__(self, line, ref, coverage, is_root):
+        self.line = line
+        self.ref = ref
+        self.coverage = coverage
+        self.is_root = is_root
+
+
+class ChapterAligner:
+    def __init__(self, verse_map, min_coverage=MIN_COVERAGE):
+        self.verse_map = verse_map
+        self.min_coverage = min_coverage
+
+    def canonical_lines(self, ref, part):
+        lines = self.verse_map.get(ref) or []
+        if part == "ab":
+            return lines[:2]
+        if part == "cd":
+            return lines[2:] if len(lines) > 2 else lines[-2:]
+        return lines
+
+    def align(self, lines, start=0, stop=None):
+        """LineDecisions for every non-blank line quoted after an anchor in lines[start:stop]."""
+        stop = len(lines) if stop is None else stop
+        anchors = [i for i in range(start, stop) if anchor_of(strip_marker(lines[i].strip()))]
+        return self.align_anchors(lines, anchors, stop)
+
+    def align_anchors(self, lines, anchor_lines, stop=None):
+        """LineDecisions for the windows after just the given anchor line indexes."""
+        stop = len(lines) if stop is None else stop
+        cache = {}
+        decisions = []
+        for i in anchor_lines:
+            ref, part = anchor_of(strip_marker(lines[i].strip()))
+            canon = [t for line in self.canonical_lines(ref, part) for t in tokens(line)]
+            if canon:
+                decisions.extend(self._align_anchor(lines, cache, i + 1, stop, ref, canon))
+        return decisions
+
+    def _line_tokens(self, lines, cache, j):
+        if j not in cache:
+            cache[j] = tokens(lines[j]) if lines[j].strip() else []
+        return cache[j]
+
+    def _align_anchor(self, lines, cache, first, stop, ref, canon):
+        budget = len(canon) * WINDOW_FACTOR + WINDOW_SLACK
+        window, owners = [], []
+        j = first
+        while j < stop and len(window) < budget:
+            stripped = lines[j].strip()
+            if stripped and is_stop_line(strip_marker(stripped)):
+                break
+            for t in self._line_tokens(lines, cache, j):
+                window.append(t)
+                owners.append(j)
+            j += 1
+
+        matched = {}
+        for _ci, wi in hirschberg(canon, window):
+            matched[owners[wi]] = matched.get(owners[wi], 0) + 1
+
+        decisions = []
+        for k in range(first, j):
+            count = len(self._line_tokens(lines, cache, k))
+            if not count:
+                continue
+            coverage = matched.get(k, 0) / count
+            decisions.append(LineDecision(k, ref, coverage, coverage >= self.min_coverage))
+        return decisions
+
+
+def chapter_spans(lines):
+    """[(chapter number, start, stop)] for the "Chapter N:" headings of a mapping."""
+    heads = [(int(m.group(1)), i) for i, line in enumerate(lines) if (m := CHAPTER_RE.match(line.strip()))]
+    return [(num, i, heads[k + 1][1] if k + 1 < len(heads) else len(lines)) for k, (num, i) in enumerate(heads)]